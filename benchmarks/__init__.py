@@ -0,0 +1,18 @@
+"""
+micro benchmarks for the geometry kernels of extremitypathfinder
+
+run with::
+
+    python -m benchmarks --output results.json --baseline baseline.json
+
+the results are being stored as JSON. when a baseline is given, the timings are being compared
+and the process exits with an error code when a kernel got slower than the allowed threshold.
+
+query latency distributions of a prepared environment can be measured with::
+
+    python -m benchmarks.load_test environment.pickle --random-queries 1000 --concurrency 4
+
+the scaling of the preparation (fitted complexity exponents) with::
+
+    python -m benchmarks.prepare_scaling --output scaling.json --compare scaling_old.json
+"""
@@ -0,0 +1,108 @@
+"""
+command line runner of the micro benchmarks
+
+usage::
+
+    python -m benchmarks [--sizes 10 100 1000] [--only find_visible lies_behind]
+                         [--output results.json] [--baseline baseline.json] [--threshold 0.2]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from timeit import Timer
+
+import numpy as np
+
+from benchmarks.kernels import BENCHMARKS
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_THRESHOLD = 0.2  # relative slow down considered a regression
+NR_REPETITIONS = 5
+
+
+def result_key(name, size):
+    return '{}[{}]'.format(name, size)
+
+
+def time_callable(fct):
+    """ :return: the best time per call in seconds """
+    timer = Timer(fct)
+    # determine the amount of calls per repetition to measure long enough (>= 0.2s)
+    nr_calls, _ = timer.autorange()
+    # the minimum is the least noisy estimate (all other timings are being slowed down by other processes)
+    return min(timer.repeat(repeat=NR_REPETITIONS, number=nr_calls)) / nr_calls
+
+
+def run_benchmarks(sizes, names=None, verbose=True):
+    results = {}
+    for name, (benchmark_fct, max_size) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            if size > max_size:
+                continue
+            runtime = time_callable(benchmark_fct(size))
+            results[result_key(name, size)] = runtime
+            if verbose:
+                print('{:<40} {:>12.3f} ms'.format(result_key(name, size), runtime * 1e3))
+    return results
+
+
+def compare(results, baseline_results, threshold):
+    """ :return: a list of (key, current time, baseline time, ratio) of all benchmarks slower than the threshold """
+    regressions = []
+    print('\ncomparison to baseline (ratio = current / baseline):')
+    for key, runtime in results.items():
+        baseline_runtime = baseline_results.get(key)
+        if baseline_runtime is None:
+            continue
+        ratio = runtime / baseline_runtime
+        regressed = ratio > 1.0 + threshold
+        print('{:<40} {:>8.3f} {}'.format(key, ratio, 'REGRESSION' if regressed else ''))
+        if regressed:
+            regressions.append((key, runtime, baseline_runtime, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='input sizes to benchmark')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS.keys()), help='run only these benchmarks')
+    parser.add_argument('--output', help='path of the JSON file to store the results in')
+    parser.add_argument('--baseline', help='path of a JSON result file to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative slow down considered a regression (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only)
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+            },
+            # seconds per call
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('\nresults stored in:', args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_results = json.load(f)['results']
+        regressions = compare(results, baseline_results, args.threshold)
+        if regressions:
+            print('\n{} benchmark(s) slower than the allowed threshold of {:.0%}'.format(len(regressions),
+                                                                                         args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
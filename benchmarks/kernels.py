@@ -0,0 +1,120 @@
+"""
+benchmark definitions for the geometry kernels
+
+every benchmark is a function taking the input size and returning a (setup-free) callable to be timed.
+all input data is being created beforehand, so only the kernel itself is being measured.
+"""
+import numpy as np
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.helper_classes import AngleRepresentation, DirectedHeuristicGraph, Vertex
+from extremitypathfinder.helper_fcts import find_visible, find_within_range, inside_polygon, lies_behind
+
+SEED = 42
+
+
+def star_polygon(nr_vertices, seed=SEED):
+    # a random star shaped polygon (counter clockwise numbering) around the origin. about half of its vertices
+    # are extremities
+    rng = np.random.RandomState(seed)
+    angles = np.linspace(0.0, 2 * np.pi, nr_vertices, endpoint=False)
+    radii = np.where(np.arange(nr_vertices) % 2 == 0, 10.0, 5.0) + rng.uniform(-1.0, 1.0, nr_vertices)
+    return np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))
+
+
+def star_environment(nr_vertices):
+    environment = PolygonEnvironment()
+    environment.store(star_polygon(nr_vertices), [])
+    return environment
+
+
+def bench_angle_representation(size):
+    vectors = np.random.RandomState(SEED).uniform(-1.0, 1.0, (size, 2))
+
+    def run():
+        for v in vectors:
+            AngleRepresentation(v)
+
+    return run
+
+
+def bench_lies_behind(size):
+    rng = np.random.RandomState(SEED)
+    # edges in front of the origin and vertices within their angle range
+    p1s = np.column_stack((rng.uniform(1.0, 2.0, size), rng.uniform(-2.0, -1.0, size)))
+    p2s = np.column_stack((rng.uniform(1.0, 2.0, size), rng.uniform(1.0, 2.0, size)))
+    vs = np.column_stack((rng.uniform(0.5, 4.0, size), rng.uniform(-0.5, 0.5, size)))
+
+    def run():
+        for p1, p2, v in zip(p1s, p2s, vs):
+            lies_behind(p1, p2, v)
+
+    return run
+
+
+def bench_inside_polygon(size):
+    coords = star_polygon(size)
+    query_points = np.random.RandomState(SEED).uniform(-12.0, 12.0, (10, 2))
+
+    def run():
+        for x, y in query_points:
+            inside_polygon(x, y, coords, border_value=True)
+
+    return run
+
+
+def bench_find_within_range(size):
+    environment = star_environment(size)
+    environment.translate(Vertex((0.0, 0.0)))
+    vertices = set(environment.all_vertices)
+    for v in vertices:
+        v.get_angle_representation()  # evaluate beforehand
+
+    def run():
+        find_within_range(0.5, 2.5, 2.0, vertices, angle_range_less_180=True, equal_repr_allowed=False)
+
+    return run
+
+
+def bench_find_visible(size):
+    environment = star_environment(size)
+    query_vertex = Vertex((0.0, 0.0))
+    extremities = set(environment.all_extremities)
+    edges = set(environment.all_edges)
+
+    def run():
+        environment.translate(query_vertex)
+        # find_visible() manipulates the given sets
+        find_visible(extremities.copy(), edges.copy())
+
+    return run
+
+
+def bench_modified_a_star(size):
+    # a square grid graph with connections to the 8 neighbouring nodes
+    side_length = max(int(np.sqrt(size)), 2)
+    nodes = [[Vertex((x, y)) for y in range(side_length)] for x in range(side_length)]
+    graph = DirectedHeuristicGraph()
+    for x in range(side_length):
+        for y in range(side_length):
+            for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                x2, y2 = x + dx, y + dy
+                if 0 <= x2 < side_length and 0 <= y2 < side_length:
+                    graph.add_undirected_edge(nodes[x][y], nodes[x2][y2], np.sqrt(dx ** 2 + dy ** 2))
+    start, goal = nodes[0][0], nodes[-1][-1]
+
+    def run():
+        graph.modified_a_star(start, goal)
+
+    return run
+
+
+# name: (benchmark function, maximal input size)
+BENCHMARKS = {
+    'AngleRepresentation': (bench_angle_representation, 100000),
+    'lies_behind': (bench_lies_behind, 100000),
+    'inside_polygon': (bench_inside_polygon, 10000),
+    'find_within_range': (bench_find_within_range, 100000),
+    'find_visible': (bench_find_visible, 10000),
+    'modified_a_star': (bench_modified_a_star, 100000),
+}
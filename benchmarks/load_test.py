@@ -0,0 +1,180 @@
+"""
+query latency load test
+
+drives ``find_shortest_path()`` of a prepared environment with a workload of queries
+and reports the throughput, the latency distribution (percentiles) and the peak memory usage (RSS).
+
+usage::
+
+    python -m benchmarks.load_test environment.pickle --queries queries.ndjson --concurrency 4
+
+the query workload file contains one query per line, either as NDJSON::
+
+    {"start": [x1, y1], "goal": [x2, y2]}
+
+or as CSV with the columns ``start_x,start_y,goal_x,goal_y`` (optional header line).
+alternatively random queries within the map can be generated with ``--random-queries N``.
+
+NOTE: the queries of one environment must not run in parallel threads (the environment holds a query state).
+concurrency is hence being achieved with worker processes, each loading the environment once.
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from extremitypathfinder.extremitypathfinder import load_pickle
+from extremitypathfinder.loaders import iter_queries
+
+PERCENTILES = [50, 90, 99]
+DEFAULT_CHUNK_SIZE = 16
+
+# the environment of a worker process
+_environment = None
+_verify = True
+# the amount of warmup queries run in the process (after loading the environment)
+_nr_warmup_queries = 0
+
+
+def load_environment(path):
+    # other (binary) storage formats can be dispatched here based on the file extension
+    return load_pickle(path)
+
+
+def read_queries(path):
+    """ :return: a list of ((start_x, start_y), (goal_x, goal_y)) tuples """
+    return list(iter_queries(path))
+
+
+def random_queries(environment, nr_queries, seed=0):
+    """ :return: a list of random queries with start and goal lying within the map """
+    rng = np.random.RandomState(seed)
+    coords = environment.boundary_polygon.coordinates
+    lower, upper = coords.min(axis=0), coords.max(axis=0)
+    points = []
+    while len(points) < 2 * nr_queries:
+        point = tuple(rng.uniform(lower, upper).tolist())
+        if environment.within_map(point):
+            points.append(point)
+    return list(zip(points[::2], points[1::2]))
+
+
+def peak_rss_bytes():
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        # Linux: kilobytes
+        peak_rss *= 1024
+    return peak_rss
+
+
+def init_worker(environment_path, verify, warmup_queries=()):
+    """ loads the environment and runs the warmup queries (not being measured) in the process serving the queries """
+    global _environment, _verify, _nr_warmup_queries
+    _environment = load_environment(environment_path)
+    _verify = verify
+    for start, goal in warmup_queries:
+        _environment.find_shortest_path(start, goal, verify=verify)
+    _nr_warmup_queries = len(warmup_queries)
+
+
+def run_queries(queries):
+    """
+    :return: the latencies of all queries in seconds, the peak memory usage of the process
+        and the amount of warmup queries run in the process
+    """
+    latencies = []
+    for start, goal in queries:
+        t_start = time.perf_counter()
+        _environment.find_shortest_path(start, goal, verify=_verify)
+        latencies.append(time.perf_counter() - t_start)
+    return latencies, peak_rss_bytes(), _nr_warmup_queries
+
+
+def run_load_test(environment_path, queries, concurrency=1, chunk_size=DEFAULT_CHUNK_SIZE, verify=True,
+                  warmup_queries=()):
+    """
+    :param warmup_queries: queries being run by every worker process after loading the environment (not measured)
+    :return: a dictionary with the measured metrics
+    """
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+    warmup_queries = list(warmup_queries)
+    if concurrency == 1:
+        init_worker(environment_path, verify, warmup_queries)
+        t_start = time.perf_counter()
+        results = [run_queries(chunk) for chunk in chunks]
+        wall_time = time.perf_counter() - t_start
+    else:
+        initargs = (environment_path, verify, warmup_queries)
+        with Pool(concurrency, initializer=init_worker, initargs=initargs) as pool:
+            # all workers have to load the environment (and warm up) first
+            pool.map(time.sleep, [0.0] * concurrency)
+            t_start = time.perf_counter()
+            results = pool.map(run_queries, chunks, chunksize=1)
+            wall_time = time.perf_counter() - t_start
+
+    latencies = np.array([latency for chunk_latencies, _, _ in results for latency in chunk_latencies])
+    report = {
+        'nr_queries': len(latencies),
+        'concurrency': concurrency,
+        # minimum over all processes serving the queries
+        'warmup_queries': min(nr_warmup_queries for _, _, nr_warmup_queries in results),
+        'wall_time': wall_time,
+        'throughput': len(latencies) / wall_time,  # queries per second
+        'latency_mean': float(latencies.mean()),
+        'latency_max': float(latencies.max()),
+        # maximum over all processes
+        'peak_rss_bytes': max([rss for _, rss, _ in results] + [peak_rss_bytes()]),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        report['latency_p{}'.format(percentile)] = float(value)
+    return report
+
+
+def print_report(report):
+    print('\nqueries:     {}'.format(report['nr_queries']))
+    print('concurrency: {}'.format(report['concurrency']))
+    print('warmup:      {} queries per process'.format(report['warmup_queries']))
+    print('throughput:  {:.1f} queries/s'.format(report['throughput']))
+    for key in ['latency_mean'] + ['latency_p{}'.format(p) for p in PERCENTILES] + ['latency_max']:
+        print('{:<12} {:.3f} ms'.format(key[len('latency_'):] + ':', report[key] * 1e3))
+    print('peak RSS:    {:.1f} MB'.format(report['peak_rss_bytes'] / 2 ** 20))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load_test', description=__doc__.split('\n')[1])
+    parser.add_argument('environment', help='path of the prepared (pickled) environment')
+    workload = parser.add_mutually_exclusive_group(required=True)
+    workload.add_argument('--queries', help='path of the query workload file (.ndjson or .csv)')
+    workload.add_argument('--random-queries', type=int, help='amount of random queries to generate')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating random queries')
+    parser.add_argument('--concurrency', type=int, default=1, help='amount of worker processes')
+    parser.add_argument('--warmup', type=int, default=0,
+                        help='amount of queries every worker process runs before measuring')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='amount of queries sent to a worker at once')
+    parser.add_argument('--no-verify', action='store_true', help='skip checking if the points lie within the map')
+    parser.add_argument('--output', help='path of the JSON file to store the report in')
+    args = parser.parse_args(argv)
+
+    if args.queries:
+        queries = read_queries(args.queries)
+    else:
+        queries = random_queries(load_environment(args.environment), args.random_queries, args.seed)
+
+    verify = not args.no_verify
+    report = run_load_test(args.environment, queries, args.concurrency, args.chunk_size, verify,
+                           warmup_queries=queries[:args.warmup])
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('report stored in:', args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+end to end scaling benchmark of ``store()`` + ``prepare()``
+
+runs the preparation on generated maps of doubling size, records the runtime, the peak memory usage,
+the amount of graph nodes and edges and fits the empirical complexity exponent k (runtime ~ n^k).
+the JSON reports of different library versions can be compared to detect algorithmic regressions.
+
+usage::
+
+    python -m benchmarks.prepare_scaling --output scaling.json [--compare scaling_old.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.map_generation import count_vertices, random_polygon_environment, warehouse_environment
+
+MAP_GENERATORS = {
+    'random_polygons': random_polygon_environment,
+    'warehouse': warehouse_environment,
+}
+DEFAULT_MIN_SIZE = 50
+DEFAULT_NR_SIZES = 5
+# an increase of the fitted exponent by more than this is considered a regression
+DEFAULT_EXPONENT_TOLERANCE = 0.3
+
+
+def prepare_environment(boundary, holes):
+    environment = PolygonEnvironment()
+    environment.store(boundary, holes)
+    environment.prepare()
+    return environment
+
+
+def measure(boundary, holes, measure_memory=True):
+    """ :return: a dictionary with the measured values """
+    t_start = time.perf_counter()
+    environment = prepare_environment(boundary, holes)
+    runtime = time.perf_counter() - t_start
+
+    graph = environment.graph
+    measurement = {
+        'nr_vertices': count_vertices(boundary, holes),
+        'nr_extremities': len(list(environment.all_extremities)),
+        'time': runtime,
+        'nr_nodes': len(graph.all_nodes),
+        'nr_edges': sum(len(neighbours) for neighbours in graph.neighbours.values()) // 2,  # undirected
+    }
+    if measure_memory:
+        # separate run: tracing the memory allocations slows down the computations
+        del environment
+        tracemalloc.start()
+        environment = prepare_environment(boundary, holes)
+        measurement['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return measurement
+
+
+def fit_exponent(sizes, values):
+    """ least squares fit of log(value) = k * log(size) + c
+
+    :return: the exponent k
+    :raises ValueError: when there are less than two sizes
+    """
+    if len(sizes) < 2:
+        raise ValueError('fitting the exponent requires at least two sizes, got {}'.format(len(sizes)))
+    slope, _ = np.polyfit(np.log(sizes), np.log(values), 1)
+    return float(slope)
+
+
+def run_scaling_benchmark(map_type, sizes, seed=0, measure_memory=True, verbose=True):
+    generator = MAP_GENERATORS[map_type]
+    measurements = []
+    for size in sizes:
+        measurement = measure(*generator(size, seed), measure_memory=measure_memory)
+        measurements.append(measurement)
+        if verbose:
+            print('{:<16} {:>8} vertices {:>6} nodes {:>8} edges {:>10.3f} s {:>10}'.format(
+                map_type, measurement['nr_vertices'], measurement['nr_nodes'], measurement['nr_edges'],
+                measurement['time'],
+                '{:.1f} MB'.format(measurement['peak_memory'] / 2 ** 20) if measure_memory else ''))
+
+    nr_vertices = [m['nr_vertices'] for m in measurements]
+    exponents = {
+        'time': fit_exponent(nr_vertices, [m['time'] for m in measurements]),
+        'nr_edges': fit_exponent(nr_vertices, [max(m['nr_edges'], 1) for m in measurements]),
+    }
+    if measure_memory:
+        exponents['peak_memory'] = fit_exponent(nr_vertices, [m['peak_memory'] for m in measurements])
+    if verbose:
+        print('{:<16} fitted exponents (value ~ n^k): {}'.format(
+            map_type, ', '.join('{}: {:.2f}'.format(key, value) for key, value in exponents.items())))
+    return {'measurements': measurements, 'exponents': exponents}
+
+
+def compare(report, other_report, tolerance):
+    """ :return: a list of (map type, quantity, exponent, other exponent) of all increased exponents """
+    regressions = []
+    print('\ncomparison of the fitted exponents (current vs. other):')
+    for map_type, results in report['results'].items():
+        other_results = other_report['results'].get(map_type)
+        if other_results is None:
+            continue
+        for quantity, exponent in results['exponents'].items():
+            other_exponent = other_results['exponents'].get(quantity)
+            if other_exponent is None:
+                continue
+            regressed = exponent > other_exponent + tolerance
+            print('{:<16} {:<12} {:>6.2f} {:>6.2f} {}'.format(map_type, quantity, exponent, other_exponent,
+                                                              'REGRESSION' if regressed else ''))
+            if regressed:
+                regressions.append((map_type, quantity, exponent, other_exponent))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.prepare_scaling',
+                                     description=__doc__.split('\n')[1])
+    parser.add_argument('--maps', nargs='+', choices=list(MAP_GENERATORS.keys()), default=list(MAP_GENERATORS.keys()))
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE, help='amount of vertices of the first map')
+    parser.add_argument('--nr-sizes', type=int, default=DEFAULT_NR_SIZES,
+                        help='amount of map sizes (doubling the size, at least 2)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='do not measure the peak memory usage')
+    parser.add_argument('--output', help='path of the JSON file to store the report in')
+    parser.add_argument('--compare', help='path of another JSON report to compare the exponents with')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_EXPONENT_TOLERANCE,
+                        help='allowed increase of the fitted exponents (default: %(default)s)')
+    args = parser.parse_args(argv)
+    if args.nr_sizes < 2:
+        parser.error('--nr-sizes must be at least 2 (fitting the exponents requires two sizes)')
+
+    sizes = [args.min_size * 2 ** i for i in range(args.nr_sizes)]
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': {map_type: run_scaling_benchmark(map_type, sizes, args.seed, not args.no_memory)
+                    for map_type in args.maps},
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('\nreport stored in:', args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            other_report = json.load(f)
+        if compare(report, other_report, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
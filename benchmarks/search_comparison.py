@@ -0,0 +1,94 @@
+"""
+comparison of the graph search modes of ``find_shortest_path()``
+
+runs the same random queries on generated maps with every search mode
+and reports the mean amount of expanded nodes and the mean latency of the search (and of the whole query).
+
+usage::
+
+    python -m benchmarks.search_comparison [--maps maze warehouse] [--queries 100] [--output search.json]
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from benchmarks.load_test import random_queries
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.map_generation import (
+    maze_grid_world, random_grid_world, random_polygon_environment, warehouse_environment,
+)
+
+# map type -> function storing a generated map in the environment
+MAPS = {
+    'maze': lambda env, seed: env.store_grid_world(*maze_grid_world(12, 12, seed), simplify=False),
+    'grid': lambda env, seed: env.store_grid_world(*random_grid_world(40, 40, 0.3, seed), simplify=False),
+    'warehouse': lambda env, seed: env.store(*warehouse_environment(400, seed)),
+    'random_polygons': lambda env, seed: env.store(*random_polygon_environment(400, seed)),
+}
+# search mode -> keyword arguments of prepare() and of find_shortest_path()
+SEARCH_MODES = {
+    'unidirectional': ({}, {}),
+    'bidirectional': ({}, {'bidirectional': True}),
+    'landmarks': ({'landmarks': 16}, {}),
+}
+DEFAULT_NR_QUERIES = 100
+
+
+def run_queries(environment, queries, search_kwargs):
+    """ :return: the mean amount of expanded nodes, the mean search time and the mean query time in seconds """
+    nodes_expanded, search_times, query_times = [], [], []
+    for start, goal in queries:
+        *_, statistics = environment.find_shortest_path(start, goal, return_statistics=True, **search_kwargs)
+        nodes_expanded.append(statistics.nodes_expanded)
+        # the query might terminate before the search (e.g. directly visible goal)
+        search_times.append(statistics.timings.get('search', 0.0))
+        query_times.append(statistics.timings['total'])
+    return float(np.mean(nodes_expanded)), float(np.mean(search_times)), float(np.mean(query_times))
+
+
+def run_comparison(map_types, nr_queries, seed=0, verbose=True):
+    results = {}
+    if verbose:
+        print('{:<16} {:<16} {:>10} {:>12} {:>12}'.format('map', 'mode', 'expanded', 'search', 'query'))
+    for map_type in map_types:
+        queries = None
+        results[map_type] = {}
+        for mode, (prepare_kwargs, search_kwargs) in SEARCH_MODES.items():
+            environment = PolygonEnvironment()
+            MAPS[map_type](environment, seed)
+            environment.prepare(**prepare_kwargs)
+            if queries is None:
+                queries = random_queries(environment, nr_queries, seed)
+            nodes_expanded, search_time, query_time = run_queries(environment, queries, search_kwargs)
+            results[map_type][mode] = {
+                'nodes_expanded': nodes_expanded,
+                'search_time': search_time,
+                'query_time': query_time,
+            }
+            if verbose:
+                print('{:<16} {:<16} {:>10.1f} {:>9.3f} ms {:>9.3f} ms'.format(
+                    map_type, mode, nodes_expanded, search_time * 1e3, query_time * 1e3))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.search_comparison',
+                                     description=__doc__.split('\n')[1])
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS.keys()), default=list(MAPS.keys()))
+    parser.add_argument('--queries', type=int, default=DEFAULT_NR_QUERIES, help='amount of random queries per map')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='path of the JSON file to store the results in')
+    args = parser.parse_args(argv)
+
+    results = run_comparison(args.maps, args.queries, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('\nresults stored in:', args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
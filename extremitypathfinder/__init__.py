@@ -1,3 +1,29 @@
-from .extremitypathfinder import PolygonEnvironment
+# NOTE: the package import is kept minimal (PEP 562): the class and the submodules are only being imported on access.
+#   e.g. matplotlib (plotting) and scipy (csgraph) must never be imported unless being used
+import importlib
 
 __all__ = ('PolygonEnvironment',)
+
+# attribute name -> module defining it
+_LAZY_ATTRIBUTES = {
+    'PolygonEnvironment': 'extremitypathfinder.extremitypathfinder',
+}
+_LAZY_SUBMODULES = ('command_line', 'csgraph', 'extremitypathfinder', 'helper_classes', 'helper_fcts',
+                    'hierarchical', 'loaders', 'map_generation', 'memory', 'oracle', 'plotting', 'tiled',
+                    'triangulation')
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    # cache: __getattr__ is only being called once per attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
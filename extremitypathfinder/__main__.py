@@ -0,0 +1,12 @@
+"""
+usage::
+
+    python -m extremitypathfinder {prepare,query} ...
+
+refer to ``command_line.py``
+"""
+import sys
+
+from extremitypathfinder.command_line import main
+
+sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+command line interface
+
+prepare an environment once and store it::
+
+    extremitypathfinder prepare map.json --output environment.pickle [--triangulate]
+
+the map is either a JSON file::
+
+    {"boundary": [[x1, y1], [x2, y2], ...], "holes": [[[x1, y1], ...], ...]}
+
+or a NDJSON file with one polygon per line (a single boundary polygon)::
+
+    {"boundary": [[x1, y1], [x2, y2], ...]}
+    {"hole": [[x1, y1], [x2, y2], ...]}
+
+or a GeoJSON file (``.geojson``) containing a single polygon (see ``loaders.from_geojson()``).
+
+process a file of queries with multiple worker processes (each loading the prepared environment once)::
+
+    extremitypathfinder query environment.pickle queries.ndjson --output results.ndjson --processes 4
+
+the query file contains one query per line, either as NDJSON::
+
+    {"start": [x1, y1], "goal": [x2, y2]}
+
+or as CSV with the columns ``start_x,start_y,goal_x,goal_y`` (optional header line).
+the results are being written as NDJSON in the order of the queries (``null``: not reachable)::
+
+    {"start": [x1, y1], "goal": [x2, y2], "path": [[x1, y1], ...], "length": 12.3}
+
+queries with points outside of the map result in ``{"start": ..., "goal": ..., "error": "..."}``.
+
+keep one or more prepared environments loaded and answer queries over HTTP on localhost::
+
+    extremitypathfinder serve warehouse=warehouse.pickle office=office.pickle --port 8000 --processes 4
+
+``POST /query`` with a single query or a batch of queries (``environment`` optional with a single environment)::
+
+    {"environment": "warehouse", "start": [x1, y1], "goal": [x2, y2]}
+    {"environment": "warehouse", "queries": [{"start": [x1, y1], "goal": [x2, y2]}, ...]}
+
+results in a single result (see above) or ``{"results": [...]}``. ``GET /environments`` lists the loaded environments.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+
+from extremitypathfinder.extremitypathfinder import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_PICKLE_NAME, PolygonEnvironment, load_pickle,
+)
+from extremitypathfinder.loaders import from_geojson, iter_queries
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# the environments of a worker process (name -> environment)
+_environments = {}
+_verify = True
+# the name of the environment when only a single one is being loaded
+DEFAULT_ENVIRONMENT_NAME = 'default'
+
+
+def read_map(path):
+    """ :return: the boundary coordinates and the list of hole coordinates stored in a JSON, NDJSON or GeoJSON file """
+    with open(path) as f:
+        if path.endswith('.geojson'):
+            return from_geojson(json.load(f))
+        if path.endswith('.ndjson'):
+            boundary_coordinates = None
+            list_of_holes = []
+            for line in f:
+                if not line.strip():
+                    continue
+                polygon = json.loads(line)
+                if 'boundary' in polygon:
+                    if boundary_coordinates is not None:
+                        raise ValueError('the map must contain exactly one boundary polygon')
+                    boundary_coordinates = polygon['boundary']
+                else:
+                    list_of_holes.append(polygon['hole'])
+            if boundary_coordinates is None:
+                raise ValueError('the map must contain exactly one boundary polygon')
+            return boundary_coordinates, list_of_holes
+
+        polygons = json.load(f)
+        return polygons['boundary'], polygons.get('holes', [])
+
+
+def iter_chunks(iterable, chunk_size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def init_worker(environment_paths, verify):
+    """
+    :param environment_paths: the name and path of every prepared environment to load
+    :param verify: whether it should be checked if the query points lie within the map
+    """
+    global _environments, _verify
+    # the standard output might be the result stream
+    with redirect_stdout(sys.stderr):
+        _environments = {name: load_pickle(path) for name, path in environment_paths.items()}
+    _verify = verify
+
+
+def process_queries(queries, environment_name=DEFAULT_ENVIRONMENT_NAME):
+    """ :return: the result of every query as JSON string """
+    environment = _environments[environment_name]
+    try:
+        results = list(environment.iter_shortest_paths(queries, chunk_size=len(queries), verify=_verify))
+    except ValueError:
+        # some points lie outside of the map. process the queries independently
+        results = []
+        for start, goal in queries:
+            try:
+                results.append(environment.find_shortest_path(start, goal, verify=_verify))
+            except ValueError as e:
+                results.append(e)
+
+    lines = []
+    for (start, goal), result in zip(queries, results):
+        output = {'start': list(map(float, start)), 'goal': list(map(float, goal))}
+        if isinstance(result, ValueError):
+            output['error'] = str(result)
+        else:
+            path, length = result
+            output['path'] = [list(map(float, coordinates)) for coordinates in path]
+            output['length'] = None if length is None else float(length)
+        lines.append(json.dumps(output))
+    return lines
+
+
+def run_queries(environment_path, queries, output_file, nr_processes=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                verify=True):
+    """ processes the queries in chunks and writes the results in the order of the queries
+
+    at most two chunks per process are being processed at the same time (constant memory)
+
+    :return: the amount of processed queries
+    """
+    nr_queries = 0
+    chunks = iter_chunks(queries, chunk_size)
+    environment_paths = {DEFAULT_ENVIRONMENT_NAME: environment_path}
+    if nr_processes == 1:
+        init_worker(environment_paths, verify)
+        for chunk in chunks:
+            output_file.write(''.join(line + '\n' for line in process_queries(chunk)))
+            nr_queries += len(chunk)
+        return nr_queries
+
+    with Pool(nr_processes, initializer=init_worker, initargs=(environment_paths, verify)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.apply_async(process_queries, (chunk,))))
+            if len(pending) >= 2 * nr_processes:
+                nr_results, result = pending.popleft()
+                output_file.write(''.join(line + '\n' for line in result.get()))
+                nr_queries += nr_results
+        while pending:
+            nr_results, result = pending.popleft()
+            output_file.write(''.join(line + '\n' for line in result.get()))
+            nr_queries += nr_results
+    return nr_queries
+
+
+def parse_query(query):
+    """ :return: the start and goal coordinates of a query dictionary """
+    start, goal = tuple(map(float, query['start'])), tuple(map(float, query['goal']))
+    if len(start) != 2 or len(goal) != 2:
+        raise ValueError('the coordinates must consist of two values')
+    return start, goal
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, json.dumps({'error': message}))
+
+    def do_GET(self):
+        if self.path != '/environments':
+            self.send_error_json(404, 'unknown path: {}'.format(self.path))
+            return
+        self.send_json(200, json.dumps({'environments': self.server.environment_names}))
+
+    def do_POST(self):
+        if self.path != '/query':
+            self.send_error_json(404, 'unknown path: {}'.format(self.path))
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            environment_name = request.get('environment')
+            if environment_name is None and len(self.server.environment_names) == 1:
+                environment_name = self.server.environment_names[0]
+            if environment_name not in self.server.environment_names:
+                raise ValueError('unknown environment: {}'.format(environment_name))
+            batch = 'queries' in request
+            queries = [parse_query(query) for query in request['queries']] if batch else [parse_query(request)]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            self.send_error_json(400, 'invalid request: {}'.format(e))
+            return
+
+        lines = self.server.process(environment_name, queries)
+        # the results already are JSON strings
+        self.send_json(200, '{"results": [' + ', '.join(lines) + ']}' if batch else lines[0])
+
+
+class QueryServer(ThreadingHTTPServer):
+    """ answers path queries over HTTP
+
+    the environments are being loaded once by every worker process.
+    the queries of a request are being processed in chunks by all worker processes in parallel.
+    """
+    daemon_threads = True
+
+    def __init__(self, environment_paths, address=(DEFAULT_HOST, DEFAULT_PORT), nr_processes=1,
+                 chunk_size=DEFAULT_CHUNK_SIZE, verify=True):
+        """
+        :param environment_paths: the name and path of every prepared environment to load
+        :param address: the host and port to listen on. port 0: any free port
+        :param nr_processes: the amount of worker processes
+        :param chunk_size: the amount of queries sent to a worker at once
+        :param verify: whether it should be checked if the query points lie within the map
+        """
+        super().__init__(address, QueryRequestHandler)
+        self.environment_names = sorted(environment_paths.keys())
+        self.chunk_size = chunk_size
+        self.pool = Pool(nr_processes, initializer=init_worker, initargs=(environment_paths, verify))
+
+    def process(self, environment_name, queries):
+        """ :return: the result of every query as JSON string """
+        chunks = iter_chunks(queries, self.chunk_size)
+        results = self.pool.starmap(process_queries, [(chunk, environment_name) for chunk in chunks])
+        return [line for lines in results for line in lines]
+
+    def server_close(self):
+        super().server_close()
+        self.pool.terminate()
+        self.pool.join()
+
+
+def parse_environment_paths(arguments):
+    """
+    :param arguments: ``name=path`` or ``path`` (name: the file name without extension)
+    :return: the name and path of every environment
+    """
+    environment_paths = {}
+    for argument in arguments:
+        name, separator, path = argument.partition('=')
+        if not separator:
+            path = argument
+            name = os.path.splitext(os.path.basename(path))[0]
+        if name in environment_paths:
+            raise ValueError('duplicate environment name: {}'.format(name))
+        environment_paths[name] = path
+    return environment_paths
+
+
+def prepare_command(args):
+    environment = PolygonEnvironment()
+    environment.store(*read_map(args.map), validate=not args.no_validate)
+    environment.prepare(triangulate=args.triangulate, lazy=args.lazy, landmarks=args.landmarks)
+    environment.export_pickle(args.output)
+    return 0
+
+
+def query_command(args):
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            nr_queries = run_queries(args.environment, iter_queries(args.queries), output_file, args.processes,
+                                     args.chunk_size, not args.no_verify)
+        print('{} results stored in: {}'.format(nr_queries, args.output), file=sys.stderr)
+    else:
+        run_queries(args.environment, iter_queries(args.queries), sys.stdout, args.processes, args.chunk_size,
+                    not args.no_verify)
+    return 0
+
+
+def serve_command(args):
+    server = QueryServer(parse_environment_paths(args.environments), (args.host, args.port), args.processes,
+                         args.chunk_size, not args.no_verify)
+    host, port = server.server_address[:2]
+    print('serving {} on http://{}:{}'.format(', '.join(server.environment_names), host, port), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='extremitypathfinder', description='geometric shortest path computation')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    prepare_parser = commands.add_parser('prepare', help='prepare an environment and store it (pickle)')
+    prepare_parser.add_argument('map', help='path of the map file (.json, .ndjson or .geojson)')
+    prepare_parser.add_argument('--output', default=DEFAULT_PICKLE_NAME, help='path of the prepared environment')
+    prepare_parser.add_argument('--triangulate', action='store_true', help='compute a triangulation additionally')
+    prepare_parser.add_argument('--lazy', action='store_true', help='compute the graph on demand')
+    prepare_parser.add_argument('--landmarks', type=int, default=0, help='amount of landmarks for the heuristic')
+    prepare_parser.add_argument('--no-validate', action='store_true', help='skip checking the input polygons')
+    prepare_parser.set_defaults(function=prepare_command)
+
+    query_parser = commands.add_parser('query', help='compute the shortest paths of a file of queries')
+    query_parser.add_argument('environment', help='path of the prepared environment')
+    query_parser.add_argument('queries', help='path of the query file (.ndjson or .csv)')
+    query_parser.add_argument('--output', help='path of the NDJSON result file. default: standard output')
+    query_parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                              help='amount of worker processes. default: all CPUs')
+    query_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                              help='amount of queries sent to a worker at once')
+    query_parser.add_argument('--no-verify', action='store_true', help='skip checking if the points lie within the map')
+    query_parser.set_defaults(function=query_command)
+
+    serve_parser = commands.add_parser('serve', help='answer queries over HTTP with the environments kept loaded')
+    serve_parser.add_argument('environments', nargs='+',
+                              help='paths of the prepared environments (optionally: name=path)')
+    serve_parser.add_argument('--host', default=DEFAULT_HOST, help='address to listen on. default: localhost only')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    serve_parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                              help='amount of worker processes. default: all CPUs')
+    serve_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                              help='amount of queries sent to a worker at once')
+    serve_parser.add_argument('--no-verify', action='store_true', help='skip checking if the points lie within the map')
+    serve_parser.set_defaults(function=serve_command)
+
+    args = parser.parse_args(argv)
+    return args.function(args)
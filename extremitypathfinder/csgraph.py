@@ -0,0 +1,227 @@
+"""
+export of the visibility graph to a sparse matrix and batch queries with ``scipy.sparse.csgraph``
+
+the nodes of the graph are being indexed in a stable order (sorted by their coordinates).
+a batch of queries is being answered with a single Dijkstra run from all start points at once:
+the start and goal points are being appended to the matrix as additional rows and columns,
+the start points with edges to their visible extremities, the goal points with edges from their visible extremities.
+
+.. note::
+    requires scipy (optional dependency)
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from extremitypathfinder.extremitypathfinder import (
+    INPUT_COORD_LIST_TYPE, INPUT_COORD_TYPE, LENGTH_TYPE, PATH_TYPE, PolygonEnvironment,
+)
+from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Vertex
+from extremitypathfinder.helper_fcts import find_visible
+
+
+def sorted_nodes(graph: DirectedHeuristicGraph) -> List[Vertex]:
+    """ :return: all nodes of the graph in a deterministic order (same order as the distance oracle) """
+    return sorted(graph.get_all_nodes(), key=lambda n: tuple(n.coordinates.tolist()))
+
+
+def graph_to_csr(graph: DirectedHeuristicGraph) -> Tuple[csr_matrix, List[Vertex]]:
+    """ exports the edges of the graph to a sparse matrix
+
+    :param graph: a complete (not lazy) graph
+    :return: the matrix (entry i,j: the length of the edge from node i to node j) and the node of every index
+    """
+    nodes = sorted_nodes(graph)
+    node_indices = {n: i for i, n in enumerate(nodes)}
+    nr_edges = len(graph.distances)
+    rows = np.empty(nr_edges, dtype=np.int32)
+    columns = np.empty(nr_edges, dtype=np.int32)
+    lengths = np.empty(nr_edges, dtype=float)
+    for i, ((node1, node2), distance) in enumerate(graph.distances.items()):
+        rows[i] = node_indices[node1]
+        columns[i] = node_indices[node2]
+        lengths[i] = distance
+    # NOTE: explicit zeros (nodes with identical coordinates) are edges for scipy.sparse.csgraph
+    matrix = csr_matrix((lengths, (rows, columns)), shape=(len(nodes), len(nodes)))
+    return matrix, nodes
+
+
+class CSGraphEnvironment(object):
+    """ answers batches of queries on a prepared environment with ``scipy.sparse.csgraph.dijkstra``
+
+    the paths and lengths are identical to the ones of ``PolygonEnvironment.find_shortest_path()``
+    """
+    __slots__ = ['environment', 'matrix', 'nodes', 'node_indices', 'coordinates']
+
+    def __init__(self, environment: PolygonEnvironment):
+        """
+        :param environment: the environment with the map. being prepared if required
+        :raises ValueError: when the graph is lazy (incomplete)
+        """
+        if not environment.prepared:
+            environment.prepare()
+        if len(environment.graph.unexpanded) > 0:
+            raise ValueError('the export requires the complete graph (not lazy)')
+        self.environment: PolygonEnvironment = environment
+        self.matrix, self.nodes = graph_to_csr(environment.graph)
+        self.node_indices: Dict[Vertex, int] = {n: i for i, n in enumerate(self.nodes)}
+        self.coordinates: np.ndarray = np.array([n.coordinates for n in self.nodes], dtype=float).reshape(-1, 2)
+
+    def graph_distances(self, indices: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        :param indices: the indices of the source nodes. default: all nodes
+        :return: the shortest distances from the source nodes to all nodes of the graph (inf: not reachable)
+        """
+        if indices is not None:
+            indices = np.asarray(list(indices), dtype=np.int32)
+        return dijkstra(self.matrix, directed=True, indices=indices)
+
+    def _verify(self, points: List[tuple]):
+        if len(points) > 0 and not self.environment._within_map_vectorized(np.array(points, dtype=float)).all():
+            raise ValueError('start or goal do not lie within the map')
+
+    def _query_vertex(self, coordinates: tuple):
+        # :return: the vertex of a query point and its triangles
+        triangles = None
+        if self.environment.triangulation is not None:
+            triangles = self.environment.triangulation.locate(coordinates)
+        return Vertex(coordinates), triangles
+
+    def _directly_visible(self, start: tuple, goal: tuple) -> bool:
+        # NOTE: the visibility is being checked from the goal (same as PolygonEnvironment.find_shortest_path())
+        start_vertex, start_triangles = self._query_vertex(start)
+        goal_vertex, goal_triangles = self._query_vertex(goal)
+        if start_triangles is not None and goal_triangles is not None:
+            visibles = self.environment.triangulation.find_visible(goal_vertex.coordinates, goal_triangles,
+                                                                   start_vertex, start_triangles)
+        else:
+            # only check the visibility of the start
+            self.environment.translate(new_origin=goal_vertex)
+            start_vertex.mark_outdated()
+            visibles = find_visible({start_vertex}, edges_to_check=set(self.environment.all_edges))
+        return any(v is start_vertex for v, _ in visibles)
+
+    def _search(self, starts: List[tuple], goals: List[tuple], direct_pairs: Dict[Tuple[int, int], float],
+                return_predecessors: bool):
+        """ a single Dijkstra run from all start points
+
+        :param direct_pairs: the lengths of the straight lines between the visible pairs of start and goal indices
+        :return: the distances from every start to all matrix rows (and the predecessors)
+        """
+        environment = self.environment
+        nr_nodes = len(self.nodes)
+        graph_edges = self.matrix.tocoo()
+        rows, columns, lengths = [graph_edges.row], [graph_edges.col], [graph_edges.data]
+
+        def append_edges(row_indices, column_indices, edge_lengths):
+            rows.append(np.asarray(row_indices, dtype=np.int32))
+            columns.append(np.asarray(column_indices, dtype=np.int32))
+            lengths.append(np.asarray(edge_lengths, dtype=float))
+
+        # edges in the direction: start -> extremity
+        for i, start in enumerate(starts):
+            start_vertex, start_triangles = self._query_vertex(start)
+            visibles = environment._find_visible_nodes(start_vertex, start_triangles)
+            append_edges([nr_nodes + i] * len(visibles), [self.node_indices[v] for v, _ in visibles],
+                         [d for _, d in visibles])
+        # edges in the direction: extremity -> goal
+        goal_offset = nr_nodes + len(starts)
+        for j, goal in enumerate(goals):
+            goal_vertex, goal_triangles = self._query_vertex(goal)
+            visibles = environment._find_visible_nodes(goal_vertex, goal_triangles)
+            append_edges([self.node_indices[v] for v, _ in visibles], [goal_offset + j] * len(visibles),
+                         [d for _, d in visibles])
+        if len(direct_pairs) > 0:
+            (start_indices, goal_indices), direct_lengths = zip(*direct_pairs.keys()), direct_pairs.values()
+            append_edges(np.add(start_indices, nr_nodes), np.add(goal_indices, goal_offset), list(direct_lengths))
+
+        size = goal_offset + len(goals)
+        # NOTE: all edges are unique (no summation of duplicate entries)
+        matrix = csr_matrix((np.concatenate(lengths), (np.concatenate(rows), np.concatenate(columns))),
+                            shape=(size, size))
+        return dijkstra(matrix, directed=True, indices=np.arange(nr_nodes, goal_offset),
+                        return_predecessors=return_predecessors)
+
+    def many_to_many(self, starts: INPUT_COORD_LIST_TYPE, goals: INPUT_COORD_LIST_TYPE,
+                     verify: bool = True) -> np.ndarray:
+        """ computes the lengths of the shortest paths from every start to every goal point
+
+        :param starts: the coordinates of the start points
+        :param goals: the coordinates of the goal points
+        :param verify: whether it should be checked if the points really lie inside the environment
+        :return: an array with the lengths (shape: (nr. of starts, nr. of goals)), ``np.inf`` if not reachable
+        :raises ValueError: when verify=True and a point does not lie within the map
+        """
+        starts = [tuple(map(float, p)) for p in np.asarray(starts, dtype=float).reshape(-1, 2)]
+        goals = [tuple(map(float, p)) for p in np.asarray(goals, dtype=float).reshape(-1, 2)]
+        if verify:
+            self._verify(starts + goals)
+        lengths = np.full((len(starts), len(goals)), np.inf)
+        if len(starts) == 0 or len(goals) == 0:
+            return lengths
+
+        unique_starts = list(dict.fromkeys(starts))
+        unique_goals = list(dict.fromkeys(goals))
+        direct_pairs = {}
+        for i, start in enumerate(unique_starts):
+            for j, goal in enumerate(unique_goals):
+                if start != goal and self._directly_visible(start, goal):
+                    direct_pairs[i, j] = float(np.linalg.norm(np.subtract(goal, start)))
+        distances = self._search(unique_starts, unique_goals, direct_pairs, return_predecessors=False)
+
+        start_indices = {p: i for i, p in enumerate(unique_starts)}
+        goal_indices = {p: j for j, p in enumerate(unique_goals)}
+        goal_offset = len(self.nodes) + len(unique_starts)
+        rows = [start_indices[p] for p in starts]
+        columns = [goal_offset + goal_indices[p] for p in goals]
+        lengths = distances[np.ix_(rows, columns)]
+        # identical start and goal
+        lengths[np.all(np.array(starts)[:, None, :] == np.array(goals)[None, :, :], axis=2)] = 0.0
+        return lengths
+
+    def find_shortest_paths(self, queries: Iterable[Tuple[INPUT_COORD_TYPE, INPUT_COORD_TYPE]],
+                            verify: bool = True) -> List[Tuple[PATH_TYPE, LENGTH_TYPE]]:
+        """ computes the shortest paths of a batch of queries
+
+        :param queries: (start, goal) coordinate pairs
+        :param verify: whether it should be checked if the points really lie inside the environment
+        :return: the path and length of every query (refer to ``PolygonEnvironment.find_shortest_path()``)
+        :raises ValueError: when verify=True and a point does not lie within the map
+        """
+        queries = [(tuple(map(float, start)), tuple(map(float, goal))) for start, goal in queries]
+        if verify:
+            self._verify([p for query in queries for p in query])
+        if len(queries) == 0:
+            return []
+        unique_starts = list(dict.fromkeys(start for start, _ in queries))
+        unique_goals = list(dict.fromkeys(goal for _, goal in queries))
+        start_indices = {p: i for i, p in enumerate(unique_starts)}
+        goal_indices = {p: j for j, p in enumerate(unique_goals)}
+        direct_pairs = {}
+        for start, goal in set(queries):
+            if start != goal and self._directly_visible(start, goal):
+                direct_pairs[start_indices[start], goal_indices[goal]] = float(np.linalg.norm(np.subtract(goal, start)))
+        distances, predecessors = self._search(unique_starts, unique_goals, direct_pairs, return_predecessors=True)
+
+        nr_nodes = len(self.nodes)
+        goal_offset = nr_nodes + len(unique_starts)
+        results = []
+        for start, goal in queries:
+            if start == goal:
+                results.append(([start, goal], 0.0))
+                continue
+            i, j = start_indices[start], goal_offset + goal_indices[goal]
+            length = distances[i, j]
+            if not np.isfinite(length):
+                results.append(([], None))
+                continue
+            path = [goal]
+            node = predecessors[i, j]
+            while node < nr_nodes:
+                path.append(tuple(self.coordinates[node]))
+                node = predecessors[i, node]
+            path.append(start)
+            results.append((path[::-1], float(length)))
+        return results
@@ -1,14 +1,23 @@
 import pickle
 from copy import deepcopy
-from typing import Iterable, List, Tuple, Union
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 
-from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Edge, Polygon, PolygonVertex, Vertex
+from extremitypathfinder.helper_classes import (
+    DirectedHeuristicGraph, Edge, Polygon, PolygonVertex, Statistics, Vertex,
+)
 from extremitypathfinder.helper_fcts import (
     check_data_requirements, convert_gridworld, find_visible, find_within_range, inside_polygon,
+    inside_polygon_vectorized,
 )
 
+if TYPE_CHECKING:
+    # optional features: only being imported when used (keeps the import of the package fast)
+    from extremitypathfinder.oracle import DistanceOracle
+    from extremitypathfinder.triangulation import Triangulation
+
 # TODO possible to allow polygon consisting of 2 vertices only(=barrier)? lots of functions need at least 3 vertices atm
 
 COORDINATE_TYPE = Tuple[float, float]
@@ -18,8 +27,12 @@ INPUT_NUMERICAL_TYPE = Union[float, int]
 INPUT_COORD_TYPE = Tuple[INPUT_NUMERICAL_TYPE, INPUT_NUMERICAL_TYPE]
 OBSTACLE_ITER_TYPE = Iterable[INPUT_COORD_TYPE]
 INPUT_COORD_LIST_TYPE = Union[np.ndarray, List]
+# called with the name of the method ('prepare', 'find_shortest_path') and the collected statistics
+STATISTICS_CALLBACK_TYPE = Callable[[str, Statistics], None]
 
 DEFAULT_PICKLE_NAME = 'environment.pickle'
+# the amount of queries being processed together by iter_shortest_paths()
+DEFAULT_CHUNK_SIZE = 256
 
 
 # is not a helper function to make it an importable part of the package
@@ -46,6 +59,16 @@ class PolygonEnvironment:
     prepared: bool = False
     graph: DirectedHeuristicGraph = None
     temp_graph: DirectedHeuristicGraph = None  # for storing and plotting the graph during a query
+    # optional: for accelerating the visibility computations of the query points
+    triangulation: Optional['Triangulation'] = None
+    # lazy graph: all extremities with identical coordinates (the first being the graph node) for every extremity
+    identical_extremities: Optional[Dict[PolygonVertex, List[PolygonVertex]]] = None
+    # optional: the precomputed distances between all graph nodes (replaces the graph search)
+    oracle: Optional['DistanceOracle'] = None
+    # the connected component of every graph node (None: lazy graph)
+    node_components: Optional[Dict[Vertex, int]] = None
+    # opt-in: when set, statistics are being collected for every prepare() and query and passed to this function
+    statistics_callback: Optional[STATISTICS_CALLBACK_TYPE] = None
 
     @property
     def polygons(self) -> Iterable[Polygon]:
@@ -88,6 +111,10 @@ class PolygonEnvironment:
         :raises AssertionError: when validate=True and the input is invalid.
         """
         self.prepared = False
+        self.triangulation = None
+        self.oracle = None
+        self.node_components = None
+        self.identical_extremities = None
         # 'loading the map
         boundary_coordinates = np.array(boundary_coordinates)
         list_of_hole_coordinates = [np.array(hole_coords) for hole_coords in list_of_hole_coordinates]
@@ -131,7 +158,8 @@ class PolygonEnvironment:
         for p in self.polygons:
             p.translate(new_origin)
 
-    def prepare(self):
+    def prepare(self, return_statistics: bool = False, triangulate: bool = False, lazy: bool = False,
+                landmarks: int = 0) -> Optional[Statistics]:
         """ computes a visibility graph optimized (=reduced) for path planning and stores it
 
         computes all directly reachable extremities based on visibility and their distance to each other
@@ -145,16 +173,75 @@ class PolygonEnvironment:
             pre computing the shortest paths between all directly reachable extremities
             and storing them in the graph would not be an advantage, because then the graph is fully connected
             a star would visit every node in the graph at least once (-> disadvantage!).
+
+        :param return_statistics: whether the counters and timings of the preparation should be returned
+        :param triangulate: whether a triangulation of the free space should be computed additionally.
+            accelerates the visibility computations of the queries (cost proportional to the visible region only)
+        :param lazy: whether the edges of the graph should only be computed when required:
+            the neighbours of an extremity are being computed (and stored) when a query expands it for the first time.
+            fast preparation, the graph fills up with the queries
+        :param landmarks: the amount of graph nodes ("landmarks") to compute the shortest distances to all nodes from.
+            the distances give tighter lower bounds for the A* heuristic (ALT: A*, landmarks, triangle inequality)
+            resulting in less expanded nodes. requires memory proportional to landmarks * nodes
+        :return: the collected statistics if requested
+
+        :raises ValueError: when the triangulation failed (e.g. due to invalid input polygons)
+            or when both a lazy graph and landmarks are requested
         """
 
         if self.prepared:
             raise ValueError('this environment is already prepared. load new polygons first.')
+        if lazy and landmarks > 0:
+            raise ValueError('the landmark distances require the complete graph (not lazy)')
+
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
 
         # preprocessing the map
         # construct graph of visible (=directly reachable) extremities
         # and optimize graph further at construction time
         self.graph = DirectedHeuristicGraph()
+        if lazy:
+            self._prepare_lazy_graph()
+        else:
+            # the lazy graph data of a previous preparation (keeping the vertices alive)
+            self.identical_extremities = None
+            self._prepare_graph(statistics)
+        if statistics is not None:
+            statistics.lap('graph_cleaning')
+
+        if not lazy:
+            self.node_components = self.graph.find_components()
+            if statistics is not None:
+                statistics.lap('components')
+
+        if landmarks > 0:
+            self.graph.compute_landmarks(landmarks)
+            if statistics is not None:
+                statistics.lap('landmarks')
+
+        if triangulate:
+            from extremitypathfinder.triangulation import Triangulation
+            nodes = {tuple(node.coordinates.tolist()): node for node in self.graph.get_all_nodes()}
+            self.triangulation = Triangulation(self.boundary_polygon, self.holes, nodes)
+            if statistics is not None:
+                statistics.lap('triangulation')
+        self.prepared = True
+
+        if statistics is not None:
+            self._report_statistics('prepare', statistics)
+            if return_statistics:
+                return statistics
+        return None
+
+    def _prepare_graph(self, statistics: Optional[Statistics]):
         extremities_to_check = set(self.all_extremities)
+        # IMPORTANT: all extremities have to be nodes of the graph, also the ones without any edges
+        #   (they might become reachable by adding start and goal node!)
+        #   otherwise the graph would depend on the order the extremities are being checked in
+        for extremity in extremities_to_check:
+            self.graph.add_node(extremity)
         # have to run for all (also last one!), because existing edges might get deleted every loop
         while len(extremities_to_check) > 0:
             # extremities are always visible to each other (bi-directional relation -> undirected graph)
@@ -162,83 +249,136 @@ class PolygonEnvironment:
             #  (would only give the same result when algorithms are correct)
             # the extremity itself must not be checked when looking for visible neighbours
             query_extremity: PolygonVertex = extremities_to_check.pop()
-            self.translate(new_origin=query_extremity)
-
-            visible_vertices = set()
-            candidate_extremities = extremities_to_check.copy()
-            # remove the extremities with the same coordinates as the query extremity
-            candidate_extremities.difference_update(
-                {c for c in candidate_extremities if c.get_angle_representation() is None})
-
-            # these vertices all belong to a polygon
-            # direct neighbours of the query vertex are visible
-            # neighbouring vertices are reachable with the distance equal to the edge length
-            n1, n2 = query_extremity.get_neighbours()
-            try:
-                candidate_extremities.remove(n1)
-                visible_vertices.add((n1, n1.get_distance_to_origin()))
-            except KeyError:
-                pass
-            try:
-                candidate_extremities.remove(n2)
-                visible_vertices.add((n2, n2.get_distance_to_origin()))
-            except KeyError:
-                pass
-
-            # even though candidate_extremities might be empty now
-            # must not skip to next loop here, because existing graph edges might get deleted here!
-
-            # eliminate all vertices 'behind' the query point from the candidate set
-            # since the query vertex is an extremity the 'outer' angle is < 180 degree
-            # then the difference between the angle representation of the two edges has to be < 2.0
-            # all vertices between the angle of the two neighbouring edges ('outer side')
-            #   are not visible (no candidates!)
-            # vertices with the same angle representation might be visible! do not delete them!
-            repr1 = n1.get_angle_representation()
-            repr2 = n2.get_angle_representation()
-            repr_diff = abs(repr1 - repr2)
-            candidate_extremities.difference_update(
-                find_within_range(repr1, repr2, repr_diff, candidate_extremities, angle_range_less_180=True,
-                                  equal_repr_allowed=False))
-
-            # as shown in [1, Ch. II 4.4.2 "Property One"] Starting from any point lying "in front of" an extremity e,
-            # such that both adjacent edges are visible, one will never visit e, because everything is
-            # reachable on a shorter path without e (except e itself). An extremity e1 lying in the area "in front of"
-            #   extremity e hence is never the next vertex in a shortest path coming from e.
-            #   And also in reverse: when coming from e1 everything else than e itself can be reached faster
-            #   without visiting e2. -> e1 and e do not have to be connected in the graph.
-            # IMPORTANT: this condition only holds for building the basic visibility graph!
-            #   when a query point happens to be an extremity, edges to the (visible) extremities in front
-            #   MUST be added to the graph!
-            # find extremities which fulfill this condition for the given query extremity
-            repr1 = (repr1 + 2.0) % 4.0  # rotate 180 deg
-            repr2 = (repr2 + 2.0) % 4.0
-            # IMPORTANT: the true angle diff does not change, but the repr diff does! compute again
-            repr_diff = abs(repr1 - repr2)
-
-            # IMPORTANT: check all extremities here, not just current candidates
-            # do not check extremities with equal coordinates (also query extremity itself!)
-            #   and with the same angle representation (those edges must not get deleted from graph!)
-            temp_candidates = set(filter(lambda e: e.get_angle_representation() is not None, self.all_extremities))
-            lie_in_front = find_within_range(repr1, repr2, repr_diff, temp_candidates, angle_range_less_180=True,
-                                             equal_repr_allowed=False)
-
+            visible_vertices, lie_in_front = self._find_extremity_neighbours(
+                query_extremity, extremities_to_check.copy(), statistics)
             # already existing edges in the graph to the extremities in front have to be removed
             self.graph.remove_multiple_undirected_edges(query_extremity, lie_in_front)
-            # do not consider when looking for visible extremities (NOTE: they might actually be visible!)
-            candidate_extremities.difference_update(lie_in_front)
-
-            # all edges except the neighbouring edges (handled above!) have to be checked
-            edges_to_check = set(self.all_edges)
-            edges_to_check.remove(query_extremity.edge1)
-            edges_to_check.remove(query_extremity.edge2)
-
-            visible_vertices.update(find_visible(candidate_extremities, edges_to_check))
             self.graph.add_multiple_undirected_edges(query_extremity, visible_vertices)
 
         # join all nodes with the same coordinates
         self.graph.make_clean()
-        self.prepared = True
+
+    def _prepare_lazy_graph(self):
+        # only the nodes of the graph (one per coordinate, like after make_clean()).
+        # the edges of a node are being computed when it is being expanded during a query for the first time
+        self.identical_extremities = {}
+        nodes = {}
+        for extremity in self.all_extremities:
+            coordinates = tuple(extremity.coordinates.tolist())
+            identical_extremities = nodes.setdefault(coordinates, [])
+            identical_extremities.append(extremity)
+            self.identical_extremities[extremity] = identical_extremities
+        for identical_extremities in nodes.values():
+            node = identical_extremities[0]
+            self.graph.add_node(node)
+            self.graph.unexpanded.add(node)
+        self.graph.lazy_neighbours = self._compute_lazy_neighbours
+
+    def _compute_lazy_neighbours(self, node: PolygonVertex) -> Iterable[Tuple[PolygonVertex, LENGTH_TYPE]]:
+        # NOTE: only directed edges. the extremities in front of the node are never the next vertex
+        #   in a shortest path coming from the node [1, Ch. II 4.4.2 "Property One"].
+        #   in the opposite direction the edges are being filtered when expanding the other node.
+        neighbours = {}
+        for extremity in self.identical_extremities[node]:
+            candidate_extremities = set(self.all_extremities)
+            visible_vertices, _ = self._find_extremity_neighbours(extremity, candidate_extremities)
+            for vertex, distance in visible_vertices:
+                # the graph only contains one node per coordinate
+                neighbours[self.identical_extremities[vertex][0]] = distance
+        # memoize in the original graph (the search runs on a copy)
+        self.graph.add_multiple_directed_edges(node, neighbours.items())
+        self.graph.unexpanded.discard(node)
+        return neighbours.items()
+
+    def _find_extremity_neighbours(self, query_extremity: PolygonVertex, candidate_extremities: set,
+                                   statistics: Optional[Statistics] = None):
+        """ finds the extremities which should be connected to the query extremity in the graph
+
+        :param query_extremity: the extremity to check the visibility from
+        :param candidate_extremities: the extremities to check. NOTE: is being modified
+        :param statistics: the statistics to record the counters in
+        :return: a set of tuples of all visible extremities and their distance
+            and the set of all extremities lying in front of the query extremity (not to be connected)
+        """
+        self.translate(new_origin=query_extremity)
+
+        visible_vertices = set()
+        # remove the extremities with the same coordinates as the query extremity
+        candidate_extremities.difference_update(
+            {c for c in candidate_extremities if c.get_angle_representation() is None})
+
+        # these vertices all belong to a polygon
+        # direct neighbours of the query vertex are visible
+        # neighbouring vertices are reachable with the distance equal to the edge length
+        n1, n2 = query_extremity.get_neighbours()
+        try:
+            candidate_extremities.remove(n1)
+            visible_vertices.add((n1, n1.get_distance_to_origin()))
+        except KeyError:
+            pass
+        try:
+            candidate_extremities.remove(n2)
+            visible_vertices.add((n2, n2.get_distance_to_origin()))
+        except KeyError:
+            pass
+
+        # even though candidate_extremities might be empty now
+        # must not return here, because existing graph edges to the extremities in front might have to be deleted!
+
+        # eliminate all vertices 'behind' the query point from the candidate set
+        # since the query vertex is an extremity the 'outer' angle is < 180 degree
+        # then the difference between the angle representation of the two edges has to be < 2.0
+        # all vertices between the angle of the two neighbouring edges ('outer side')
+        #   are not visible (no candidates!)
+        # vertices with the same angle representation might be visible! do not delete them!
+        repr1 = n1.get_angle_representation()
+        repr2 = n2.get_angle_representation()
+        repr_diff = abs(repr1 - repr2)
+        candidate_extremities.difference_update(
+            find_within_range(repr1, repr2, repr_diff, candidate_extremities, angle_range_less_180=True,
+                              equal_repr_allowed=False))
+
+        # as shown in [1, Ch. II 4.4.2 "Property One"] Starting from any point lying "in front of" an extremity e,
+        # such that both adjacent edges are visible, one will never visit e, because everything is
+        # reachable on a shorter path without e (except e itself). An extremity e1 lying in the area "in front of"
+        #   extremity e hence is never the next vertex in a shortest path coming from e.
+        #   And also in reverse: when coming from e1 everything else than e itself can be reached faster
+        #   without visiting e2. -> e1 and e do not have to be connected in the graph.
+        # IMPORTANT: this condition only holds for building the basic visibility graph!
+        #   when a query point happens to be an extremity, edges to the (visible) extremities in front
+        #   MUST be added to the graph!
+        # find extremities which fulfill this condition for the given query extremity
+        repr1 = (repr1 + 2.0) % 4.0  # rotate 180 deg
+        repr2 = (repr2 + 2.0) % 4.0
+        # IMPORTANT: the true angle diff does not change, but the repr diff does! compute again
+        repr_diff = abs(repr1 - repr2)
+
+        # IMPORTANT: check all extremities here, not just current candidates
+        # do not check extremities with equal coordinates (also query extremity itself!)
+        #   and with the same angle representation (those edges must not get deleted from graph!)
+        temp_candidates = set(filter(lambda e: e.get_angle_representation() is not None, self.all_extremities))
+        lie_in_front = find_within_range(repr1, repr2, repr_diff, temp_candidates, angle_range_less_180=True,
+                                         equal_repr_allowed=False)
+
+        # do not consider when looking for visible extremities (NOTE: they might actually be visible!)
+        candidate_extremities.difference_update(lie_in_front)
+
+        # all edges except the neighbouring edges (handled above!) have to be checked
+        edges_to_check = set(self.all_edges)
+        edges_to_check.remove(query_extremity.edge1)
+        edges_to_check.remove(query_extremity.edge2)
+
+        if statistics is not None:
+            statistics.lap('candidate_filtering')
+        visible_vertices.update(find_visible(candidate_extremities, edges_to_check, statistics))
+        if statistics is not None:
+            statistics.lap('visibility')
+        return visible_vertices, lie_in_front
+
+    def _report_statistics(self, method_name: str, statistics: Statistics):
+        statistics.finish()
+        if self.statistics_callback is not None:
+            self.statistics_callback(method_name, statistics)
 
     # make sure start and goal are within the boundary polygon and outside of all holes
     def within_map(self, coords: INPUT_COORD_TYPE):
@@ -256,8 +396,20 @@ class PolygonEnvironment:
                 return False
         return True
 
+    def _within_map_vectorized(self, points: np.ndarray) -> np.ndarray:
+        # :return: for every point whether it lies within the map (refer to within_map())
+        # NOTE: the vectorised test is only undefined for points on the polygon edges, which lie within the map.
+        #   only the points classified as outside have to be checked again exactly
+        within = inside_polygon_vectorized(points, self.boundary_polygon.coordinates)
+        for hole in self.holes:
+            within &= ~inside_polygon_vectorized(points, hole.coordinates)
+        for i in np.nonzero(~within)[0]:
+            within[i] = self.within_map(tuple(points[i]))
+        return within
+
     def find_shortest_path(self, start_coordinates: INPUT_COORD_TYPE, goal_coordinates: INPUT_COORD_TYPE,
-                           free_space_after: bool = True, verify: bool = True) -> Tuple[PATH_TYPE, LENGTH_TYPE]:
+                           free_space_after: bool = True, verify: bool = True, return_statistics: bool = False,
+                           bidirectional: bool = False, max_distance: Optional[float] = None):
         """ computes the shortest path and its length between start and goal node
 
         :param start_coordinates: a (x,y) coordinate tuple representing the start node
@@ -266,22 +418,358 @@ class PolygonEnvironment:
             should be deleted after the query
         :param verify: whether it should be checked if start and goal points really lie inside the environment.
          if points close to or on polygon edges should be accepted as valid input, set this to ``False``.
-        :return: a tuple of shortest path and its length
+        :param return_statistics: whether the counters and timings of the query should be returned additionally
+        :param bidirectional: whether the graph should be searched from start and goal at the same time.
+            fewer expanded nodes on long, winding paths (e.g. in mazes)
+        :param max_distance: the maximal length of the path. the search terminates as soon as all remaining paths
+            are known to be longer. goals further away count as not reachable
+        :return: a tuple of shortest path and its length (and the collected statistics if requested)
+        """
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
+
+        path, distance = self._find_shortest_path(start_coordinates, goal_coordinates, free_space_after, verify,
+                                                  statistics, bidirectional, max_distance)
+
+        if statistics is not None:
+            self._report_statistics('find_shortest_path', statistics)
+            if return_statistics:
+                return path, distance, statistics
+        return path, distance
+
+    def iter_shortest_paths(self, queries: Iterable[Tuple[INPUT_COORD_TYPE, INPUT_COORD_TYPE]],
+                            chunk_size: int = DEFAULT_CHUNK_SIZE, verify: bool = True, bidirectional: bool = False):
+        """ computes the shortest paths of a stream of queries
+
+        the queries are being consumed lazily in chunks. within a chunk the verification of all points is vectorised
+        and the visibility of repeated start points is being computed only once.
+        NOTE: only the visibility of the start points is being shared. the translation and visibility computations
+        of the goal points and the graph search are being performed for every query independently.
+        the memory consumption does not depend on the amount of queries.
+
+        :param queries: an iterable of (start coordinates, goal coordinates) tuples
+        :param chunk_size: the amount of queries being processed together
+        :param verify: whether it should be checked if start and goal points really lie inside the environment
+        :param bidirectional: whether the graph should be searched from start and goal at the same time
+        :return: a generator yielding a tuple of the shortest path and its length for every query (in order)
+
+        :raises ValueError: when a start or goal point does not lie within the map.
+            the message states the index (position in the stream) and the coordinates of the first invalid query
         """
+        if self.boundary_polygon is None:
+            raise ValueError('No Polygons have been loaded into the map yet.')
+        if not self.prepared:
+            self.prepare()
+        queries = iter(queries)
+        chunk_offset = 0
+        while True:
+            chunk = [(tuple(start), tuple(goal)) for start, goal in islice(queries, chunk_size)]
+            if len(chunk) == 0:
+                return
+            if verify:
+                points = np.array(chunk, dtype=float).reshape(-1, 2)
+                invalid = np.flatnonzero(~self._within_map_vectorized(points))
+                if len(invalid) > 0:
+                    # two points per query
+                    query_idx = int(invalid[0]) // 2
+                    raise ValueError('start or goal of query {} do not lie within the map: {}'.format(
+                        chunk_offset + query_idx, chunk[query_idx]))
+            chunk_offset += len(chunk)
+            start_visibility = {}
+            for start_coordinates, goal_coordinates in chunk:
+                statistics = None
+                if self.statistics_callback is not None:
+                    statistics = Statistics()
+                result = self._find_shortest_path(start_coordinates, goal_coordinates, True, False, statistics,
+                                                  bidirectional, start_visibility=start_visibility)
+                if statistics is not None:
+                    self._report_statistics('iter_shortest_paths', statistics)
+                yield result
+
+    def shortest_distance(self, start_coordinates: INPUT_COORD_TYPE, goal_coordinates: INPUT_COORD_TYPE,
+                          max_distance: Optional[float] = None, verify: bool = True, return_statistics: bool = False,
+                          bidirectional: bool = False):
+        """ computes only the length of the shortest path between start and goal node
+
+        faster than ``find_shortest_path()``: the search does not record the paths
+
+        :param start_coordinates: a (x,y) coordinate tuple representing the start node
+        :param goal_coordinates:  a (x,y) coordinate tuple representing the goal node
+        :param max_distance: the maximal length of the path. the search terminates as soon as all remaining paths
+            are known to be longer. goals further away count as not reachable
+        :param verify: whether it should be checked if start and goal points really lie inside the environment
+        :param return_statistics: whether the counters and timings of the query should be returned additionally
+        :param bidirectional: whether the graph should be searched from start and goal at the same time
+        :return: the length of the shortest path, None if the goal is not reachable
+            (and the collected statistics if requested)
+        """
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
+
+        _, distance = self._find_shortest_path(start_coordinates, goal_coordinates, True, verify, statistics,
+                                               bidirectional, max_distance, return_path=False)
+
+        if statistics is not None:
+            self._report_statistics('shortest_distance', statistics)
+            if return_statistics:
+                return distance, statistics
+        return distance
+
+    def find_nearest(self, start_coordinates: INPUT_COORD_TYPE, targets: INPUT_COORD_LIST_TYPE, verify: bool = True,
+                     return_statistics: bool = False):
+        """ finds the target with the shortest path from the start among multiple targets
+
+        all targets are being added to a single temporary graph, which is being searched only once
+        until the nearest target has been reached (refer to ``DirectedHeuristicGraph.multi_goal_a_star()``).
+
+        :param start_coordinates: a (x,y) coordinate tuple representing the start node
+        :param targets: the (x,y) coordinates of all targets
+        :param verify: whether it should be checked if start and targets really lie inside the environment
+        :param return_statistics: whether the counters and timings of the query should be returned additionally
+        :return: a tuple of the index of the nearest target, the shortest path and its length
+            ((None, [], None) if no target is reachable) (and the collected statistics if requested)
+        """
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
+
+        index, path, distance = self._find_nearest(start_coordinates, targets, verify, statistics)
+
+        if statistics is not None:
+            self._report_statistics('find_nearest', statistics)
+            if return_statistics:
+                return index, path, distance, statistics
+        return index, path, distance
+
+    def _find_nearest(self, start_coordinates: INPUT_COORD_TYPE, targets: INPUT_COORD_LIST_TYPE, verify: bool,
+                      statistics: Optional[Statistics]) -> Tuple[Optional[int], PATH_TYPE, LENGTH_TYPE]:
+        if self.boundary_polygon is None:
+            raise ValueError('No Polygons have been loaded into the map yet.')
+        if not self.prepared:
+            self.prepare()
+        # NOTE: the coordinates are being compared with each other (the start possibly being given as list)
+        start_coordinates = tuple(start_coordinates)
+        targets = [tuple(t) for t in targets]
+        if verify and not all(self.within_map(c) for c in [start_coordinates] + targets):
+            raise ValueError('start or targets do not lie within the map')
+        if statistics is not None:
+            statistics.lap('verification')
+
+        for i, target_coordinates in enumerate(targets):
+            if start_coordinates == target_coordinates:
+                return i, [start_coordinates, target_coordinates], 0.0
+
+        start_vertex = Vertex(start_coordinates)
+        start_triangles = None
+        if self.triangulation is not None:
+            start_triangles = self.triangulation.locate(start_coordinates)
+        visibles_n_distances_start = self._find_visible_nodes(start_vertex, start_triangles, statistics=statistics)
+        if statistics is not None:
+            statistics.lap('start_visibility')
+        start_components = None
+        if self.node_components is not None:
+            start_components = {self.node_components[v] for v, d in visibles_n_distances_start}
+
+        self.temp_graph = deepcopy(self.graph)
+        self.temp_graph.add_multiple_directed_edges(start_vertex, visibles_n_distances_start)
+        target_vertices = {}
+        for i, target_coordinates in enumerate(targets):
+            target_vertex = Vertex(target_coordinates)
+            target_triangles = other_triangles = None
+            if start_triangles is not None and self.triangulation is not None:
+                target_triangles = self.triangulation.locate(target_coordinates)
+                if target_triangles is not None:
+                    if not self.triangulation.same_region(start_triangles[0], target_triangles[0]):
+                        continue
+                    other_triangles = start_triangles
+            visibles_n_distances = self._find_visible_nodes(target_vertex, target_triangles, start_vertex,
+                                                            other_triangles or (), statistics)
+            if start_components is not None and all(
+                    v is not start_vertex and self.node_components[v] not in start_components
+                    for v, d in visibles_n_distances):
+                # not reachable
+                continue
+            target_vertices[target_vertex] = i
+            for v, d in visibles_n_distances:
+                # add edges in the direction: extremity (or start) -> target
+                # NOTE: the edges to the extremities "in front" of the targets do not have to be removed.
+                #   they are never part of a shortest path (only not being considered to speed up the search)
+                self.temp_graph.add_directed_edge(v, target_vertex, d)
+        if statistics is not None:
+            statistics.lap('target_visibility')
+
+        vertex_path, distance, target_vertex = self.temp_graph.multi_goal_a_star(start_vertex, target_vertices,
+                                                                                 statistics)
+        if statistics is not None:
+            statistics.lap('search')
+        del self.temp_graph  # free the memory
+        if target_vertex is None:
+            return None, [], None
+        return target_vertices[target_vertex], [tuple(v.coordinates) for v in vertex_path], distance
+
+    def reachable_within(self, coordinates: INPUT_COORD_TYPE, max_distance: float, verify: bool = True,
+                         return_statistics: bool = False):
+        """ computes all extremities reachable from a point with a path not longer than the given distance
+
+        a single (bounded) Dijkstra expansion through the graph starting with all extremities visible from the point
+
+        :param coordinates: a (x,y) coordinate tuple representing the point
+        :param max_distance: the maximal length of the paths
+        :param verify: whether it should be checked if the point really lies inside the environment
+        :param return_statistics: whether the counters and timings of the query should be returned additionally
+        :return: a dictionary mapping the coordinates of every reachable extremity to the length of its shortest path
+            (and the collected statistics if requested)
+        """
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
+
+        node_distances, _, _ = self._expand_within(coordinates, max_distance, verify, statistics)
+        reachable = {tuple(n.coordinates): d for n, d in node_distances.items()}
+
+        if statistics is not None:
+            self._report_statistics('reachable_within', statistics)
+            if return_statistics:
+                return reachable, statistics
+        return reachable
+
+    def reachable_points_within(self, coordinates: INPUT_COORD_TYPE, max_distance: float, points,
+                                verify: bool = True, return_statistics: bool = False):
+        """ computes the lengths of the shortest paths from a point to multiple (sample) points within a distance
+
+        the graph is being expanded only once (refer to ``reachable_within()``).
+        the path to a sample point leads through one of the visible reached extremities (or is the straight line).
+        points further away than the maximal distance (straight line) are being excluded at once,
+        the visibility is only being computed for the remaining points.
+
+        :param coordinates: a (x,y) coordinate tuple representing the point
+        :param max_distance: the maximal length of the paths
+        :param points: the coordinates of the sample points, shape: (n,2)
+        :param verify: whether it should be checked if the points really lie inside the environment
+            (the lengths of points lying outside are infinite)
+        :param return_statistics: whether the counters and timings of the query should be returned additionally
+        :return: an array with the length of the shortest path to every sample point,
+            ``np.inf`` if not reachable within the maximal distance (and the collected statistics if requested)
+        """
+        statistics = None
+        if return_statistics or self.statistics_callback is not None:
+            statistics = Statistics()
+
+        node_distances, origin_vertex, origin_triangles = self._expand_within(coordinates, max_distance, verify,
+                                                                              statistics)
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        lengths = np.full(len(points), np.inf)
+        straight_lengths = np.linalg.norm(points - origin_vertex.coordinates, axis=1)
+        # the straight line is the shortest possible path
+        candidates = np.nonzero(straight_lengths <= max_distance)[0]
+        for i in candidates:
+            point = tuple(points[i].tolist())
+            if straight_lengths[i] == 0.0:
+                lengths[i] = 0.0
+                continue
+            if verify and not self.within_map(point):
+                continue
+            point_triangles = None
+            if origin_triangles is not None:
+                point_triangles = self.triangulation.locate(point)
+                if point_triangles is not None and not self.triangulation.same_region(point_triangles[0],
+                                                                                      origin_triangles[0]):
+                    continue
+            visibles = self._find_visible_nodes(Vertex(point), point_triangles, origin_vertex, origin_triangles)
+            visible_lengths = [d + node_distances[v] for v, d in visibles if v in node_distances]
+            visible_lengths += [d for v, d in visibles if v is origin_vertex]
+            if len(visible_lengths) > 0:
+                lengths[i] = min(visible_lengths)
+        lengths[lengths > max_distance] = np.inf
+        if statistics is not None:
+            statistics.lap('points')
+            self._report_statistics('reachable_points_within', statistics)
+            if return_statistics:
+                return lengths, statistics
+        return lengths
+
+    def _expand_within(self, coordinates: INPUT_COORD_TYPE, max_distance: float, verify: bool,
+                       statistics: Optional[Statistics]):
+        # :return: the distances of the reached graph nodes, the vertex of the point and its triangles
+        if self.boundary_polygon is None:
+            raise ValueError('No Polygons have been loaded into the map yet.')
+        if not self.prepared:
+            self.prepare()
+        if verify and not self.within_map(coordinates):
+            raise ValueError('the point does not lie within the map')
+
+        origin_vertex = Vertex(coordinates)
+        origin_triangles = None
+        if self.triangulation is not None:
+            origin_triangles = self.triangulation.locate(coordinates)
+        # NOTE: all visible extremities. the ones "in front" of the point might be the end of a path
+        visibles_n_distances = self._find_visible_nodes(origin_vertex, origin_triangles, statistics=statistics)
+        if statistics is not None:
+            statistics.lap('visibility')
+        node_distances = self.graph.multi_source_dijkstra(visibles_n_distances, max_distance)
+        if statistics is not None:
+            statistics.nodes_expanded += len(node_distances)
+            statistics.lap('expansion')
+        return node_distances, origin_vertex, origin_triangles
+
+    def _find_visible_nodes(self, query_vertex: Vertex, query_triangles: Optional[Tuple[int, ...]],
+                            other_vertex: Optional[Vertex] = None, other_triangles: Tuple[int, ...] = (),
+                            statistics: Optional[Statistics] = None):
+        """ finds all graph nodes (and optionally another query vertex) visible from the query vertex
+
+        :param query_vertex: the vertex to check the visibility from
+        :param query_triangles: the triangles containing the query vertex, None: check all polygon edges instead
+        :param other_vertex: another query vertex to check the visibility of
+        :param other_triangles: the triangles containing the other vertex
+        :param statistics: the statistics to record the counters in
+        :return: a set of tuples of all visible vertices and their distance
+        """
+        if query_triangles is not None:
+            return self.triangulation.find_visible(query_vertex.coordinates, query_triangles, other_vertex,
+                                                   other_triangles, statistics)
+
+        self.translate(new_origin=query_vertex)  # do before checking angle representations!
+        # the visibility of only the graphs nodes has to be checked (not all extremities!)
+        # points with the same angle representation should not be considered visible
+        # (they also cause errors in the algorithms, because their angle repr is not defined!)
+        candidates = set(filter(lambda n: n.get_angle_representation() is not None, self.graph.get_all_nodes()))
+        if other_vertex is not None:
+            # IMPORTANT: manually translate the other vertex, because it is not part of any polygon
+            #   and hence does not get translated automatically
+            other_vertex.mark_outdated()
+            candidates.add(other_vertex)
+        return find_visible(candidates, edges_to_check=set(self.all_edges), statistics=statistics)
+
+    def _find_shortest_path(self, start_coordinates: INPUT_COORD_TYPE, goal_coordinates: INPUT_COORD_TYPE,
+                            free_space_after: bool, verify: bool, statistics: Optional[Statistics],
+                            bidirectional: bool = False, max_distance: Optional[float] = None,
+                            return_path: bool = True,
+                            start_visibility: Optional[dict] = None) -> Tuple[PATH_TYPE, LENGTH_TYPE]:
+        # start_visibility: optional cache of the visible nodes of the start points
         # path planning query:
         # make sure the map has been loaded and prepared
         if self.boundary_polygon is None:
             raise ValueError('No Polygons have been loaded into the map yet.')
         if not self.prepared:
             self.prepare()
+            if statistics is not None:
+                statistics.lap('prepare')
 
         if verify and not (self.within_map(start_coordinates) and self.within_map(goal_coordinates)):
             raise ValueError('start or goal do not lie within the map')
+        if statistics is not None:
+            statistics.lap('verification')
 
         if start_coordinates == goal_coordinates:
             # start and goal are identical and can be reached instantly
             return [start_coordinates, goal_coordinates], 0.0
 
+        if max_distance is not None and np.linalg.norm(np.subtract(goal_coordinates, start_coordinates)) > max_distance:
+            # the straight line is the shortest possible path
+            return [], None
+
         # could check if start and goal nodes have identical coordinates with one of the vertices
         # optimisations for visibility test can be made in this case:
         # for extremities the visibility has already been (except for in front) computed
@@ -291,51 +779,78 @@ class PolygonEnvironment:
         start_vertex = Vertex(start_coordinates)
         goal_vertex = Vertex(goal_coordinates)
 
-        # check the goal node first (earlier termination possible)
-        self.translate(new_origin=goal_vertex)  # do before checking angle representations!
-        # IMPORTANT: manually translate the start vertex, because it is not part of any polygon
-        #   and hence does not get translated automatically
-        start_vertex.mark_outdated()
+        # the triangles containing the query points
+        # None: no triangulation available or degenerate cases (e.g. query point on a polygon edge)
+        start_triangles = goal_triangles = None
+        if self.triangulation is not None:
+            start_triangles = self.triangulation.locate(start_coordinates)
+            goal_triangles = self.triangulation.locate(goal_coordinates)
+            if start_triangles is None or goal_triangles is None:
+                start_triangles = goal_triangles = None
+            elif not self.triangulation.same_region(start_triangles[0], goal_triangles[0]):
+                # start and goal lie in disconnected parts of the free space
+                return [], None
 
-        # the visibility of only the graphs nodes has to be checked (not all extremities!)
-        # points with the same angle representation should not be considered visible
-        # (they also cause errors in the algorithms, because their angle repr is not defined!)
-        candidates = set(filter(lambda n: n.get_angle_representation() is not None, self.graph.get_all_nodes()))
+        # check the goal node first (earlier termination possible)
         # IMPORTANT: check if the start node is visible from the goal node!
-        candidates.add(start_vertex)
-
-        visibles_n_distances_goal = find_visible(candidates, edges_to_check=set(self.all_edges))
+        visibles_n_distances_goal = self._find_visible_nodes(goal_vertex, goal_triangles, start_vertex,
+                                                             start_triangles, statistics)
+        if statistics is not None:
+            statistics.lap('goal_visibility')
         if len(visibles_n_distances_goal) == 0:
             # The goal node does not have any neighbours. Hence there is not possible path to the goal.
             return [], None
 
-        # create temporary graph TODO make more performant, avoid real copy
-        # DirectedHeuristicGraph implements __deepcopy__() to not change the original precomputed self.graph
-        # but to still not create real copies of vertex instances!
-        self.temp_graph = deepcopy(self.graph)
-
         # IMPORTANT geometrical property of this problem: it is always shortest to directly reach a node
         #   instead of visiting other nodes first (there is never an advantage through reduced edge weight)
         # -> when goal is directly reachable, there can be no other shorter path to it. Terminate
-
         for v, d in visibles_n_distances_goal:
             if v == start_vertex:
                 return [start_coordinates, goal_coordinates], d
 
-            # add unidirectional edges to the temporary graph
-            # add edges in the direction: extremity (v) -> goal
-            # TODO: improvement: add edges last, after filtering them. instead of deleting edges
-            self.temp_graph.add_directed_edge(v, goal_vertex, d)
-
-        self.translate(new_origin=start_vertex)  # do before checking angle representations!
-        # the visibility of only the graphs nodes have to be checked
         # the goal node does not have to be considered, because of the earlier check
-        candidates = set(filter(lambda n: n.get_angle_representation() is not None, self.graph.get_all_nodes()))
-        visibles_n_distances_start = find_visible(candidates, edges_to_check=set(self.all_edges))
+        visibles_n_distances_start = None
+        if start_visibility is not None:
+            visibles_n_distances_start = start_visibility.get(start_coordinates, None)
+        if visibles_n_distances_start is None:
+            visibles_n_distances_start = self._find_visible_nodes(start_vertex, start_triangles, statistics=statistics)
+            if start_visibility is not None:
+                start_visibility[start_coordinates] = visibles_n_distances_start
+        if statistics is not None:
+            statistics.lap('start_visibility')
         if len(visibles_n_distances_start) == 0:
             # The start node does not have any neighbours. Hence there is not possible path to the goal.
             return [], None
 
+        if self.node_components is not None:
+            # a path leads through an extremity visible from the start and one visible from the goal
+            # -> they must lie in the same connected component of the graph
+            start_components = {self.node_components[v] for v, d in visibles_n_distances_start}
+            if all(self.node_components[v] not in start_components for v, d in visibles_n_distances_goal):
+                if statistics is not None:
+                    statistics.lap('component_check')
+                return [], None
+
+        if self.oracle is not None:
+            path, distance = self._find_shortest_path_oracle(start_vertex, goal_vertex, visibles_n_distances_start,
+                                                             visibles_n_distances_goal, statistics)
+            if max_distance is not None and distance is not None and distance > max_distance:
+                return [], None
+            return path, distance
+
+        # create temporary graph TODO make more performant, avoid real copy
+        # DirectedHeuristicGraph implements __deepcopy__() to not change the original precomputed self.graph
+        # but to still not create real copies of vertex instances!
+        self.temp_graph = deepcopy(self.graph)
+        if statistics is not None:
+            statistics.lap('graph_copy')
+
+        for v, d in visibles_n_distances_goal:
+            # add unidirectional edges to the temporary graph
+            # add edges in the direction: extremity (v) -> goal
+            # TODO: improvement: add edges last, after filtering them. instead of deleting edges
+            self.temp_graph.add_directed_edge(v, goal_vertex, d)
+
         # add edges in the direction: start -> extremity
         # TODO: improvement: add edges last, after filtering them. instead of deleting edges
         self.temp_graph.add_multiple_directed_edges(start_vertex, visibles_n_distances_start)
@@ -379,16 +894,87 @@ class PolygonEnvironment:
                                                  equal_repr_allowed=False)
                 self.temp_graph.remove_multiple_undirected_edges(vertex, lie_in_front)
 
+        if statistics is not None:
+            statistics.lap('edge_filtering')
+
         # NOTE: exploiting property 2 from [1] here would be more expensive than beneficial
-        vertex_path, distance = self.temp_graph.modified_a_star(start_vertex, goal_vertex)
+        vertex_path, distance = self.temp_graph.modified_a_star(start_vertex, goal_vertex, statistics, bidirectional,
+                                                                max_distance, return_path)
+        if statistics is not None:
+            statistics.lap('search')
 
         if free_space_after:
             del self.temp_graph  # free the memory
 
+        if vertex_path is None:
+            # only the length has been computed
+            return [], distance
         # extract the coordinates from the path
         return [tuple(v.coordinates) for v in vertex_path], distance
 
+    def _find_shortest_path_oracle(self, start_vertex: Vertex, goal_vertex: Vertex, visibles_n_distances_start,
+                                   visibles_n_distances_goal,
+                                   statistics: Optional[Statistics]) -> Tuple[PATH_TYPE, LENGTH_TYPE]:
+        # no graph search: look up the distances between all extremities visible from start and goal
+        # NOTE: the edges to the extremities "in front" of the start and goal do not have to be removed.
+        #   they are never part of a shortest path (only not being considered to speed up the graph search)
+        vertex_path, distance = self.oracle.find_shortest_path(list(visibles_n_distances_start),
+                                                               list(visibles_n_distances_goal))
+        if statistics is not None:
+            statistics.lap('oracle_lookup')
+        if distance is None:
+            return [], None
+        vertex_path = [start_vertex] + vertex_path + [goal_vertex]
+        return [tuple(v.coordinates) for v in vertex_path], distance
+
+    def memory_report(self) -> Dict[str, float]:
+        """ estimates the memory used by the environment
+
+        the bytes used by: the polygon coordinates (``polygon_coordinates``),
+        the ``PolygonVertex`` objects with their coordinates (``vertices``),
+        the ``AngleRepresentation`` objects (``angle_representations``), the ``Edge`` objects (``edges``),
+        the polygon objects and lists (``polygons``), the neighbour sets of the graph (``graph_neighbours``),
+        the edge distances of the graph (``graph_distances``), the remaining graph data (``graph_other``),
+        the optional triangulation, distance oracle and lazy graph data
+        (``triangulation``, ``oracle``, ``identical_extremities``)
+        and their sum (``total``).
+        ``temp_graph``: the memory additionally used by the graph copy of a query (not part of the total).
+        measured on the retained copy of the last query if available (``free_space_after=False``), otherwise on
+        a new copy without any start and goal edges (-> a lower bound).
+        the averages ``bytes_per_vertex``, ``bytes_per_edge`` (polygon edges) and ``bytes_per_graph_edge``
+        allow predicting the memory of other maps.
+
+        :return: a dictionary with the amount of bytes of every part, the averages
+            and the amount of vertices (``nr_vertices``) and graph edges (``nr_graph_edges``)
+        """
+        from extremitypathfinder.memory import memory_report
+        return memory_report(self)
+
+    def build_distance_oracle(self, nr_processes: Optional[int] = None):
+        """ precomputes the shortest distances between all nodes of the graph
+
+        the queries then do not have to search the graph, but only look up the distances
+        between the extremities visible from the start and the goal.
+
+        .. note::
+            opposed to the visibility graph, the required memory grows quadratically with the amount of extremities
+
+        :param nr_processes: the amount of processes to compute the distances in parallel. default: all CPUs
+
+        :raises ValueError: when the graph is lazy (incomplete)
+        """
+        if not self.prepared:
+            self.prepare()
+        if len(self.graph.unexpanded) > 0:
+            raise ValueError('the distance oracle requires the complete graph (not lazy)')
+        from extremitypathfinder.oracle import DistanceOracle
+        self.oracle = DistanceOracle(self.graph, nr_processes)
+
 
 if __name__ == "__main__":
-    # TODO command line support. read polygons and holes from .json files?
-    pass
+    # command line support: refer to command_line.py
+    import sys
+
+    from extremitypathfinder.command_line import main
+
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import heapq
-from typing import List, Optional
+import random
+from itertools import count
+from time import perf_counter
+from typing import Callable, Iterable, List, Optional, Tuple
 
 import numpy as np
 
@@ -67,6 +70,23 @@ class AngleRepresentation(object):
         return self.__str__()
 
 
+def angle_representations(np_vectors: np.ndarray) -> np.ndarray:
+    """ the values of the angle representations (see ``AngleRepresentation``) of multiple vectors at once
+
+    :param np_vectors: array of 2D vectors (shape (n, 2))
+    :return: array of the representation values
+    :raises ValueError: when a vector is the null vector
+    """
+    dx, dy = np_vectors[:, 0], np_vectors[:, 1]
+    norms = np.sqrt(dx * dx + dy * dy)
+    if np.any(norms == 0.0):
+        raise ValueError('received null vector:', np_vectors[norms == 0.0])
+    dx_positive = dx >= 0
+    dy_positive = dy >= 0
+    return np.select([dx_positive & dy_positive, ~dx_positive & dy_positive, ~dx_positive & ~dy_positive],
+                     [dy / norms, 1.0 + -dx / norms, 2.0 + -dy / norms], 3.0 + dx / norms)
+
+
 class Vertex(object):
     # defining static attributes on class to safe memory
     __slots__ = ['coordinates', 'is_extremity', 'is_outdated', 'coordinates_translated', 'angle_representation',
@@ -207,37 +227,29 @@ class Polygon(object):
                 holes: clockwise
             :return:
             """
+            # vectorised: all vertices p2 with their predecessors p1 and successors p3 at once
+            # since consequent vertices are not permitted to be equal,
+            #   the angle representation of the difference is well defined
+            p2 = self.coordinates.astype(float)
+            p1 = np.roll(p2, 1, axis=0)
+            p3 = np.roll(p2, -1, axis=0)
+            # basic idea:
+            #   - translate the coordinate system to have p2 as origin
+            #   - compute the angle representations of both vectors representing the edges
+            #   - "rotate" the coordinate system (equal to deducting) so that the p1p2 representation is 0
+            #   - check in which quadrant the p2p3 representation lies
+            # %4 because the quadrant has to be in [0,1,2,3] (representation in [0:4[)
+            # if the representation lies within quadrant 0 or 1 (<2.0), the inside angle
+            #   (for boundary polygon inside, for holes outside) between p1p2p3 is > 180 degree
+            # then p2 = extremity
+            is_extremity = (angle_representations(p3 - p2) - angle_representations(p1 - p2)) % 4 < 2.0
+            # same order as checking the vertices sequentially starting with the last vertex
+            extremity_indices = np.flatnonzero(np.roll(is_extremity, 1))
             self.extremities = []
-            # extremity_indices = []
-            # extremity_index = -1
-            v1 = self.vertices[-2]
-            p1 = v1.coordinates
-            v2 = self.vertices[-1]
-            p2 = v2.coordinates
-
-            for v3 in self.vertices:
-
-                p3 = v3.coordinates
-                # since consequent vertices are not permitted to be equal,
-                #   the angle representation of the difference is well defined
-                if (AngleRepresentation(p3 - p2).value - AngleRepresentation(p1 - p2).value) % 4 < 2.0:
-                    # basic idea:
-                    #   - translate the coordinate system to have p2 as origin
-                    #   - compute the angle representations of both vectors representing the edges
-                    #   - "rotate" the coordinate system (equal to deducting) so that the p1p2 representation is 0
-                    #   - check in which quadrant the p2p3 representation lies
-                    # %4 because the quadrant has to be in [0,1,2,3] (representation in [0:4[)
-                    # if the representation lies within quadrant 0 or 1 (<2.0), the inside angle
-                    #   (for boundary polygon inside, for holes outside) between p1p2p3 is > 180 degree
-                    # then p2 = extremity
-                    v2.declare_extremity()
-                    self.extremities.append(v2)
-
-                # move to the next point
-                # vertex1=vertex2
-                v2 = v3
-                p1 = p2
-                p2 = p3
+            for i in extremity_indices:
+                v2 = self.vertices[i - 1]
+                v2.declare_extremity()
+                self.extremities.append(v2)
 
         self.extremities: List[PolygonVertex] = None
         find_extremities()
@@ -249,23 +261,153 @@ class Polygon(object):
             vertex.mark_outdated()
 
 
+class Statistics(object):
+    """ counters and timings (in seconds) of the algorithms, for analysing the performance
+
+    only being collected when requested (opt-in) to not slow down the algorithms
+    """
+    __slots__ = ['timings', 'edges_checked', 'lies_behind_calls', 'candidates_eliminated', 'nodes_expanded',
+                 'heap_pushes', 'triangles_expanded', 'start_timestamp', 'last_timestamp']
+
+    def __init__(self):
+        # phase name -> accumulated time
+        self.timings: dict = {}
+        # find_visible()
+        self.edges_checked: int = 0
+        self.lies_behind_calls: int = 0
+        self.candidates_eliminated: int = 0
+        # modified_a_star()
+        self.nodes_expanded: int = 0
+        self.heap_pushes: int = 0
+        # Triangulation.find_visible()
+        self.triangles_expanded: int = 0
+        self.start_timestamp: float = perf_counter()
+        self.last_timestamp: float = self.start_timestamp
+
+    def lap(self, phase: str):
+        # adds the time passed since the last lap to the given phase
+        now = perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - self.last_timestamp
+        self.last_timestamp = now
+
+    def finish(self):
+        self.timings['total'] = perf_counter() - self.start_timestamp
+
+    def as_dict(self) -> dict:
+        return {attr: getattr(self, attr) for attr in self.__slots__ if not attr.endswith('timestamp')}
+
+    def __str__(self):
+        return str(self.as_dict())
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class PriorityQueue:
     def __init__(self):
         self.elements = []
+        # IMPORTANT: tie breaker for items with equal priority. the items themselves are not always comparable
+        self.counter = count()
 
     def empty(self):
         return len(self.elements) == 0
 
     def put(self, item, priority):
-        heapq.heappush(self.elements, (priority, item))
+        heapq.heappush(self.elements, (priority, next(self.counter), item))
 
     def get(self):
-        return heapq.heappop(self.elements)[1]  # return only the item without the priority
+        return heapq.heappop(self.elements)[2]  # return only the item without the priority
+
+    def min_priority(self):
+        return self.elements[0][0]
+
+
+class SkipListNode(object):
+    __slots__ = ['item', 'next', 'prev']
+
+    def __init__(self, item, height: int):
+        self.item = item
+        # the neighbouring nodes on every level of the node
+        self.next: List[Optional['SkipListNode']] = [None] * height
+        self.prev: List[Optional['SkipListNode']] = [None] * height
+
+
+class SkipList(object):
+    """ an ordered sequence of (hashable) items as doubly linked skip list
+
+    the order is not being stored: the position of an item is being located with a predicate
+    telling if an item comes before the position (-> the order may depend on the state of the caller, e.g. a sweep line)
+
+    expected O(log n) for inserting and locating,
+    O(log n) for removing and O(1) for accessing the neighbours of an item (without any comparisons)
+    """
+    __slots__ = ['head', 'height', 'nodes', 'random']
+    MAX_HEIGHT = 32
+
+    def __init__(self, seed: int = 0):
+        self.head: SkipListNode = SkipListNode(None, self.MAX_HEIGHT)
+        self.height: int = 1
+        self.nodes: dict = {}
+        # deterministic node heights
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _predecessors(self, is_before: Callable) -> List[SkipListNode]:
+        # :return: the last node on every level for which is_before() holds (the head otherwise)
+        predecessors = [self.head] * self.MAX_HEIGHT
+        node = self.head
+        for level in reversed(range(self.height)):
+            next_node = node.next[level]
+            while next_node is not None and is_before(next_node.item):
+                node = next_node
+                next_node = node.next[level]
+            predecessors[level] = node
+        return predecessors
+
+    def first_after(self, is_before: Callable):
+        """ :return: the first item for which is_before() does not hold, None if there is none """
+        node = self._predecessors(is_before)[0].next[0]
+        return None if node is None else node.item
+
+    def insert(self, item, is_before: Callable):
+        """ inserts the item after all items for which is_before() holds """
+        predecessors = self._predecessors(is_before)
+        height = 1
+        while height < self.MAX_HEIGHT and self.random.random() < 0.5:
+            height += 1
+        self.height = max(self.height, height)
+        node = SkipListNode(item, height)
+        for level in range(height):
+            prev_node = predecessors[level]
+            next_node = prev_node.next[level]
+            node.prev[level] = prev_node
+            node.next[level] = next_node
+            prev_node.next[level] = node
+            if next_node is not None:
+                next_node.prev[level] = node
+        self.nodes[item] = node
+
+    def remove(self, item):
+        node = self.nodes.pop(item)
+        for level in range(len(node.next)):
+            prev_node, next_node = node.prev[level], node.next[level]
+            prev_node.next[level] = next_node
+            if next_node is not None:
+                next_node.prev[level] = prev_node
+
+    def neighbours(self, item) -> Tuple:
+        """ :return: the previous and the next item, None if there is none """
+        node = self.nodes[item]
+        prev_node, next_node = node.prev[0], node.next[0]
+        return (None if prev_node is self.head else prev_node.item), (None if next_node is None else next_node.item)
 
 
 # TODO often empty sets in self.neighbours
 class DirectedHeuristicGraph(object):
-    __slots__ = ['all_nodes', 'distances', 'goal_node', 'heuristic', 'neighbours']
+    __slots__ = ['all_nodes', 'distances', 'goal_node', 'heuristic', 'neighbours', 'lazy_neighbours', 'unexpanded',
+                 'landmarks', 'landmark_distances', 'node_indices', 'goal_landmark_distances']
 
     def __init__(self):
         self.distances: dict = {}
@@ -280,6 +422,19 @@ class DirectedHeuristicGraph(object):
         self.heuristic: dict = {}
         self.goal_node: Optional[Vertex] = None
 
+        # optional: computes the (node, distance) pairs of the outgoing edges of a node when required.
+        # the edges of the nodes in self.unexpanded have not been computed yet
+        self.lazy_neighbours: Optional[Callable[[Vertex], Iterable[Tuple[Vertex, float]]]] = None
+        self.unexpanded: set = set()
+
+        # optional: the shortest distances from some nodes ("landmarks") to all nodes (ALT heuristic)
+        # landmark_distances[i, node_indices[n]]: distance from landmark i to node n (inf: not reachable)
+        self.landmarks: list = []
+        self.landmark_distances: Optional[np.ndarray] = None
+        self.node_indices: dict = {}
+        # the distances from all landmarks to the current goal node
+        self.goal_landmark_distances: Optional[np.ndarray] = None
+
     def __deepcopy__(self, memodict=None):
         # returns an independent copy (nodes can be added without changing the original graph),
         # but without actually copying vertex instances!
@@ -287,6 +442,12 @@ class DirectedHeuristicGraph(object):
         independent_copy.distances = self.distances.copy()
         independent_copy.neighbours = {k: v.copy() for k, v in self.neighbours.items()}
         independent_copy.all_nodes = self.all_nodes.copy()
+        independent_copy.lazy_neighbours = self.lazy_neighbours
+        independent_copy.unexpanded = self.unexpanded.copy()
+        # the landmark distances of the original nodes stay valid
+        independent_copy.landmarks = self.landmarks
+        independent_copy.landmark_distances = self.landmark_distances
+        independent_copy.node_indices = self.node_indices
         return independent_copy
 
     def get_all_nodes(self):
@@ -303,30 +464,181 @@ class DirectedHeuristicGraph(object):
         return self.distances[(node1, node2)]
 
     def get_heuristic(self, node):
-        global origin  # use origin contains the current goal node
         # lazy evaluation:
         h = self.heuristic.get(node, None)
         if h is None:
             # has been reset, compute again
-            h = np.linalg.norm(node.coordinates - origin.coordinates)
+            # NOTE: do not use the global origin, it changes when edges are being computed lazily during the search
+            h = np.linalg.norm(node.coordinates - self.goal_node.coordinates)
+            if self.goal_landmark_distances is not None:
+                h = max(h, self.get_landmark_bound(node))
             self.heuristic[node] = h
         return h
 
     def set_goal_node(self, goal_node):
         assert goal_node in self.all_nodes  # has no outgoing edges -> no neighbours
-        # IMPORTANT: while using heuristic graph (a star), do not change origin!
-        global origin
-        origin = goal_node  # use origin for temporally storing the goal node
         self.goal_node = goal_node
         # reset heuristic for all
         self.heuristic.clear()
+        self.goal_landmark_distances = None
+        if self.landmark_distances is not None:
+            self.goal_landmark_distances = self.get_landmark_distances(goal_node)
+
+    def get_landmark_distances(self, node) -> np.ndarray:
+        """ :return: the shortest distances from all landmarks to the node """
+        idx = self.node_indices.get(node, None)
+        if idx is not None:
+            return self.landmark_distances[:, idx]
+        # a node added after computing the landmark distances (e.g. the goal of a query)
+        # every path to the node leads through one of the nodes with an edge to it
+        distances = np.full(len(self.landmarks), np.inf)
+        for n, neighbours in self.neighbours.items():
+            if node in neighbours:
+                idx = self.node_indices.get(n, None)
+                if idx is not None:
+                    np.minimum(distances, self.landmark_distances[:, idx] + self.get_distance(n, node), out=distances)
+        return distances
+
+    def compute_heuristics(self, nodes):
+        # vectorised computation of the landmark heuristic of multiple nodes at once
+        nodes = [n for n in nodes if n not in self.heuristic and n in self.node_indices]
+        if len(nodes) == 0:
+            return
+        coordinates = np.array([n.coordinates for n in nodes], dtype=float)
+        euclidean = np.linalg.norm(coordinates - self.goal_node.coordinates, axis=1)
+        indices = [self.node_indices[n] for n in nodes]
+        with np.errstate(invalid='ignore'):
+            bounds = self.goal_landmark_distances[:, None] - self.landmark_distances[:, indices]
+        bounds[np.isnan(bounds)] = 0.0
+        for n, h in zip(nodes, np.maximum(euclidean, bounds.max(axis=0)).tolist()):
+            self.heuristic[n] = h
+
+    def get_landmark_bound(self, node) -> float:
+        # triangle inequality: d(landmark, goal) <= d(landmark, node) + d(node, goal)
+        # -> d(node, goal) >= d(landmark, goal) - d(landmark, node)
+        # NOTE: the reverse bound d(landmark, node) - d(landmark, goal) is not valid here:
+        #   the graph distances between extremities might be longer than the actual shortest distances,
+        #   because edges to the extremities "in front" are missing in the graph
+        #   (those edges are only unnecessary for paths continuing beyond the extremity)
+        idx = self.node_indices.get(node, None)
+        if idx is None:
+            return 0.0
+        with np.errstate(invalid='ignore'):
+            bounds = self.goal_landmark_distances - self.landmark_distances[:, idx]
+        # both not reachable from a landmark: no information
+        bounds[np.isnan(bounds)] = 0.0
+        return float(bounds.max(initial=0.0))
+
+    def dijkstra(self, source) -> dict:
+        """ computes the shortest distances from the source to all reachable nodes
+
+        :param source: the node to start from
+        :return: a dictionary mapping every reachable node to its distance
+        """
+        return self.multi_source_dijkstra([(source, 0.0)])
+
+    def multi_source_dijkstra(self, source_distances: Iterable[Tuple[Vertex, float]],
+                              max_distance: float = float('inf')) -> dict:
+        """ computes the shortest distances from multiple sources with initial distances to all reachable nodes
+
+        :param source_distances: the nodes to start from and their initial distance
+        :param max_distance: nodes further away are not being expanded
+        :return: a dictionary mapping every node reachable within the maximal distance to its distance
+        """
+        distances = {}
+        priority_queue = PriorityQueue()
+        for source, distance in source_distances:
+            if distance <= max_distance:
+                priority_queue.put(source, distance)
+        while not priority_queue.empty():
+            distance = priority_queue.min_priority()
+            node = priority_queue.get()
+            if node in distances:
+                continue
+            distances[node] = distance
+            if node in self.unexpanded:
+                self.expand(node)
+            for neighbour in self.get_neighbours_of(node):
+                if neighbour not in distances:
+                    new_distance = distance + self.get_distance(node, neighbour)
+                    if new_distance <= max_distance:
+                        priority_queue.put(neighbour, new_distance)
+        return distances
+
+    def compute_landmarks(self, nr_landmarks: int):
+        """ selects landmarks and computes the shortest distances from them to all nodes
+
+        farthest point selection: every new landmark is the node with the largest distance to all previous landmarks.
+        nodes not reachable from any previous landmark are being chosen first.
+        such landmarks lie "behind" many nodes as seen from the others, which results in tight bounds.
+
+        :param nr_landmarks: the amount of landmarks to select
+        """
+        # in a deterministic order
+        nodes = sorted(self.all_nodes, key=lambda n: tuple(n.coordinates.tolist()))
+        self.node_indices = {n: i for i, n in enumerate(nodes)}
+        nr_landmarks = min(nr_landmarks, len(nodes))
+        self.landmarks = []
+        # NOTE: float64. the bounds are differences of (possibly large) distances.
+        #   rounding errors (float32) could make the heuristic overestimate and the found paths not the shortest
+        self.landmark_distances = np.full((nr_landmarks, len(nodes)), np.inf, dtype=np.float64)
+        if nr_landmarks == 0:
+            return
+
+        def distance_array(source):
+            distances = np.full(len(nodes), np.inf)
+            for n, distance in self.dijkstra(source).items():
+                distances[self.node_indices[n]] = distance
+            return distances
+
+        # the first landmark: farthest from an arbitrary node
+        min_distances = distance_array(nodes[0])
+        min_distances[np.isinf(min_distances)] = -1.0
+        for i in range(nr_landmarks):
+            landmark = nodes[int(np.argmax(min_distances))]
+            self.landmarks.append(landmark)
+            self.landmark_distances[i] = distance_array(landmark)
+            min_distances = self.landmark_distances[:i + 1].min(axis=0)
+            # the landmarks themselves must not be chosen again
+            min_distances[[self.node_indices[n] for n in self.landmarks]] = -1.0
+
+    def find_components(self) -> dict:
+        """ labels the connected components of the graph (edges in any direction connect nodes)
+
+        :return: a dictionary mapping every node to the index of its component
+        """
+        undirected_neighbours = {n: set() for n in self.all_nodes}
+        for node1, neighbours in self.neighbours.items():
+            for node2 in neighbours:
+                undirected_neighbours[node1].add(node2)
+                undirected_neighbours[node2].add(node1)
+        components = {}
+        nr_components = 0
+        # in a deterministic order
+        for node in sorted(self.all_nodes, key=lambda n: tuple(n.coordinates.tolist())):
+            if node in components:
+                continue
+            component = nr_components
+            nr_components += 1
+            components[node] = component
+            stack = [node]
+            while stack:
+                for neighbour in undirected_neighbours[stack.pop()]:
+                    if neighbour not in components:
+                        components[neighbour] = component
+                        stack.append(neighbour)
+        return components
 
     def edges_from(self, node1):
         # optimisation:
         #   return the neighbours ordered after their cost estimate: distance+ heuristic (= current-next + next-goal)
         #   -> when the goal is reachable return it first (-> a star search terminates)
+        if node1 in self.unexpanded:
+            self.expand(node1)
 
         neighbours = self.get_neighbours_of(node1)
+        if self.goal_landmark_distances is not None:
+            self.compute_heuristics(neighbours)
         distances = [self.get_distance(node1, n) for n in neighbours]
         out_sorted = sorted([(n, distances[i], distances[i] + self.get_heuristic(n)) for i, n in enumerate(neighbours)],
                             key=lambda x: x[2])
@@ -334,6 +646,15 @@ class DirectedHeuristicGraph(object):
         # yield node, distance, cost= distance + heuristic
         yield from out_sorted
 
+    def expand(self, node):
+        # computes the missing edges of the node (in addition to the already existing ones, e.g. to the goal)
+        self.add_multiple_directed_edges(node, self.lazy_neighbours(node))
+        self.unexpanded.discard(node)
+
+    def add_node(self, node):
+        self.neighbours.setdefault(node, set())
+        self.all_nodes.add(node)
+
     def add_directed_edge(self, node1, node2, distance):
         assert node1 != node2  # no self loops allowed!
         self.neighbours.setdefault(node1, set()).add(node2)
@@ -400,7 +721,8 @@ class DirectedHeuristicGraph(object):
 
                 self.all_nodes.remove(n2)
 
-    def modified_a_star(self, start, goal):
+    def modified_a_star(self, start, goal, statistics: Optional[Statistics] = None, bidirectional: bool = False,
+                        max_distance: Optional[float] = None, return_path: bool = True):
         """ implementation of the popular A* algorithm with optimisations for this special use case
 
         IMPORTANT: geometrical property of this problem (and hence also the extracted graph):
@@ -422,8 +744,15 @@ class DirectedHeuristicGraph(object):
 
         :param start: the vertex to start from
         :param goal: the vertex to end at
-        :return: a tuple of the shortest path from start to goal and its total length
+        :param statistics: optional container for counting the expanded nodes and heap operations
+        :param bidirectional: whether to search from start and goal at the same time (``bidirectional_a_star()``)
+        :param max_distance: the search terminates as soon as the lowest cost estimate exceeds this length.
+            paths which are longer count as not reachable
+        :param return_path: whether the path should be recorded. when not, only its length is being returned
+        :return: a tuple of the shortest path from start to goal (None if not recorded) and its total length
         """
+        if bidirectional:
+            return self.bidirectional_a_star(start, goal, statistics, max_distance)
 
         def enqueue_next_from(generator):
             try:
@@ -432,6 +761,8 @@ class DirectedHeuristicGraph(object):
                 # the priority has to be the lower bound (=estimate) of the TOTAL cost!
                 # = cost_so_far + cost_estim  (= start-current + estimate(current-goal))
                 priority_queue.put((next_n, dist, generator, path, cost_so_far), cost_so_far + cost_estim)
+                if statistics is not None:
+                    statistics.heap_pushes += 1
             except StopIteration:
                 # there is no neighbour left
                 pass
@@ -441,11 +772,14 @@ class DirectedHeuristicGraph(object):
         priority_queue = PriorityQueue()
         neighbour_gen = self.edges_from(start)
         cost_so_far = 0.0
-        path = [start]
+        path = [start] if return_path else None
         enqueue_next_from(neighbour_gen)
         visited_nodes = set()
 
         while not priority_queue.empty():
+            if max_distance is not None and priority_queue.min_priority() > max_distance:
+                # all remaining paths are longer (lower bound)
+                break
             # always 'visit' the node with the current lowest total cost estimate
             current, distance, neighbour_gen, path, cost_so_far = priority_queue.get()
             # print('visiting:', current)
@@ -460,12 +794,15 @@ class DirectedHeuristicGraph(object):
                 continue
 
             visited_nodes.add(current)
+            if statistics is not None:
+                statistics.nodes_expanded += 1
             # NOTE: in contrast to vanilla A*,
             # here the path and cost have to be stored separately for every open generator!
             cost_so_far += distance
-            # IMPORTANT: use independent path lists
-            path = path.copy()
-            path.append(current)
+            if return_path:
+                # IMPORTANT: use independent path lists
+                path = path.copy()
+                path.append(current)
 
             if current == goal:
                 # since the goal node is the one with the lowest cost estimate
@@ -482,3 +819,213 @@ class DirectedHeuristicGraph(object):
 
         # goal is not reachable
         return [], None
+
+    def _edges_sorted(self, neighbour_distances, potential):
+        # like edges_from(): yields (node, distance, cost estimate) ordered after the cost estimate
+        out_sorted = sorted([(n, d, d + potential(n)) for n, d in neighbour_distances], key=lambda x: x[2])
+        yield from out_sorted
+
+    def bidirectional_a_star(self, start, goal, statistics: Optional[Statistics] = None,
+                             max_distance: Optional[float] = None):
+        """ A* searching from the start and from the goal at the same time
+
+        keeps the 'neighbour generator' optimisation of ``modified_a_star()`` in both directions.
+
+        IMPORTANT: the graph must be symmetric (undirected) except for the outgoing edges of the start
+        and the incoming edges of the goal (like the query graph of an environment).
+        the backward search hence uses the outgoing edges of the nodes in reverse.
+
+        average potentials are being used as heuristics to keep them consistent in both directions:
+        p_forward(n) = (|n - goal| - |n - start|) / 2 = -p_backward(n)
+        the search terminates, when the sum of the lowest cost estimates of both directions
+        is not lower than the length of the shortest path found so far.
+        in contrast to unidirectional search, the goal might not be found first along the shortest path.
+        hence the meeting points of both searches (also across single edges) have to be compared.
+
+        :param start: the vertex to start from
+        :param goal: the vertex to end at
+        :param statistics: optional container for counting the expanded nodes and heap operations
+        :param max_distance: the search terminates as soon as the sum of the lowest cost estimates exceeds this length.
+            paths which are longer count as not reachable
+        :return: a tuple of the shortest path from start to goal and its total length
+        """
+        potentials = {}
+
+        def forward_potential(node):
+            # lazy evaluation
+            p = potentials.get(node, None)
+            if p is None:
+                goal_distance = np.linalg.norm(node.coordinates - goal.coordinates)
+                start_distance = np.linalg.norm(node.coordinates - start.coordinates)
+                p = (goal_distance - start_distance) / 2.0
+                potentials[node] = p
+            return p
+
+        def backward_potential(node):
+            return -forward_potential(node)
+
+        # the incoming edges of the goal and the outgoing edges of the start are only stored in one direction
+        goal_predecessors = [(n, self.distances[(n, goal)]) for n, neighbours in self.neighbours.items()
+                             if goal in neighbours]
+
+        def forward_edges(node):
+            if node in self.unexpanded:
+                self.expand(node)
+            return [(n, self.get_distance(node, n)) for n in self.get_neighbours_of(node)]
+
+        def backward_edges(node):
+            if node == goal:
+                return goal_predecessors
+            if node in self.unexpanded:
+                self.expand(node)
+            # symmetric: use the outgoing edges in reverse, the edges to the goal are only valid forwards
+            edges = [(n, self.get_distance(node, n)) for n in self.get_neighbours_of(node) if n != goal]
+            distance = self.distances.get((start, node), None)
+            if distance is not None:
+                edges.append((start, distance))
+            return edges
+
+        # forward and backward direction:
+        # the edge function, the potential, the queue, the visited nodes with their cost and path
+        directions = [
+            (forward_edges, forward_potential, PriorityQueue(), {}),
+            (backward_edges, backward_potential, PriorityQueue(), {}),
+        ]
+
+        def enqueue_next_from(generator, path, cost_so_far, queue):
+            try:
+                next_n, dist, cost_estim = next(generator)
+                queue.put((next_n, dist, generator, path, cost_so_far), cost_so_far + cost_estim)
+                if statistics is not None:
+                    statistics.heap_pushes += 1
+            except StopIteration:
+                pass
+
+        for (edges_fct, potential, queue, visited), origin_node in zip(directions, [start, goal]):
+            visited[origin_node] = (0.0, [origin_node])
+            generator = self._edges_sorted(edges_fct(origin_node), potential)
+            enqueue_next_from(generator, [origin_node], 0.0, queue)
+
+        shortest_length = float('inf')
+        meeting = None  # the forward and backward path of the shortest path found so far
+
+        while not (directions[0][2].empty() or directions[1][2].empty()):
+            min_priority_forward = directions[0][2].min_priority()
+            min_priority_backward = directions[1][2].min_priority()
+            if min_priority_forward + min_priority_backward >= shortest_length:
+                # no shorter path can be found
+                break
+            if max_distance is not None and min_priority_forward + min_priority_backward > max_distance:
+                # all remaining paths are longer (lower bound)
+                break
+
+            # always continue the search in the direction with the lower cost estimate
+            direction = 0 if min_priority_forward <= min_priority_backward else 1
+            edges_fct, potential, queue, visited = directions[direction]
+            other_visited = directions[1 - direction][3]
+
+            current, distance, generator, path, cost_so_far = queue.get()
+            enqueue_next_from(generator, path, cost_so_far, queue)
+            if current in visited:
+                continue
+
+            if statistics is not None:
+                statistics.nodes_expanded += 1
+            cost_so_far += distance
+            path = path.copy()
+            path.append(current)
+            visited[current] = (cost_so_far, path)
+
+            if current == (goal if direction == 0 else start):
+                # reached the other end: the shortest path (consistent heuristic)
+                meeting = (path, []) if direction == 0 else ([], path)
+                shortest_length = cost_so_far
+                break
+
+            neighbour_distances = edges_fct(current)
+            # check if the searches meet: in this node or across an edge
+            for n, d in [(current, 0.0)] + neighbour_distances:
+                try:
+                    other_cost, other_path = other_visited[n]
+                except KeyError:
+                    continue
+                length = cost_so_far + d + other_cost
+                if length < shortest_length:
+                    shortest_length = length
+                    meeting = (path, other_path) if direction == 0 else (other_path, path)
+
+            generator = self._edges_sorted(neighbour_distances, potential)
+            enqueue_next_from(generator, path, cost_so_far, queue)
+
+        if meeting is None or (max_distance is not None and shortest_length > max_distance):
+            # goal is not reachable
+            return [], None
+
+        forward_path, backward_path = meeting
+        if len(forward_path) > 0 and len(backward_path) > 0 and forward_path[-1] == backward_path[-1]:
+            # meeting in a node, not across an edge
+            backward_path = backward_path[:-1]
+        return forward_path + list(reversed(backward_path)), shortest_length
+
+    def multi_goal_a_star(self, start, goals, statistics: Optional[Statistics] = None):
+        """ A* searching the shortest path from the start to the nearest of multiple goals
+
+        keeps the 'neighbour generator' optimisation of ``modified_a_star()``.
+        the heuristic is the euclidean distance to the nearest goal (a lower bound of the distance to every goal).
+        the search terminates as soon as the first goal is being reached.
+
+        :param start: the vertex to start from
+        :param goals: the vertices to end at
+        :param statistics: optional container for counting the expanded nodes and heap operations
+        :return: a tuple of the shortest path from start to the nearest goal, its total length and the goal.
+            ([], None, None) if no goal is reachable
+        """
+        goals = set(goals)
+        goal_coordinates = np.array([g.coordinates for g in goals], dtype=float).reshape(-1, 2)
+        heuristic = {}
+
+        def potential(node):
+            # lazy evaluation
+            h = heuristic.get(node, None)
+            if h is None:
+                h = float(np.sqrt(((goal_coordinates - node.coordinates) ** 2).sum(axis=1).min(initial=np.inf)))
+                heuristic[node] = h
+            return h
+
+        def edges(node):
+            if node in self.unexpanded:
+                self.expand(node)
+            return [(n, self.get_distance(node, n)) for n in self.get_neighbours_of(node)]
+
+        def enqueue_next_from(generator, path, cost_so_far):
+            try:
+                next_n, dist, cost_estim = next(generator)
+                priority_queue.put((next_n, dist, generator, path, cost_so_far), cost_so_far + cost_estim)
+                if statistics is not None:
+                    statistics.heap_pushes += 1
+            except StopIteration:
+                pass
+
+        priority_queue = PriorityQueue()
+        enqueue_next_from(self._edges_sorted(edges(start), potential), [start], 0.0)
+        visited_nodes = {start}
+        while not priority_queue.empty():
+            current, distance, generator, path, cost_so_far = priority_queue.get()
+            enqueue_next_from(generator, path, cost_so_far)
+            if current in visited_nodes:
+                continue
+
+            visited_nodes.add(current)
+            if statistics is not None:
+                statistics.nodes_expanded += 1
+            cost_so_far += distance
+            path = path.copy()
+            path.append(current)
+            if current in goals:
+                # consistent heuristic: the first reached goal is the nearest one
+                return path, cost_so_far, current
+
+            enqueue_next_from(self._edges_sorted(edges(current), potential), path, cost_so_far)
+
+        # no goal is reachable
+        return [], None, None
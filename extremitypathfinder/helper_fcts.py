@@ -1,9 +1,8 @@
-from itertools import combinations
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 
-from extremitypathfinder.helper_classes import AngleRepresentation, PolygonVertex
+from extremitypathfinder.helper_classes import AngleRepresentation, PolygonVertex, SkipList, Statistics
 
 
 # TODO numba precompilation of some parts possible?! do line speed profiling first! speed impact
@@ -60,6 +59,31 @@ def inside_polygon(x, y, coords, border_value):
     return contained
 
 
+def inside_polygon_vectorized(points: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """ even-odd rule point in polygon test for multiple points at once
+
+    NOTE: in contrast to inside_polygon() the result for points lying directly on the polygon edges is not defined
+
+    :param points: array of shape (n,2)
+    :param coords: the polygon coordinates
+    :return: a boolean array, True for the points lying inside the polygon
+    """
+    x = points[:, 0]
+    y = points[:, 1]
+    contained = np.zeros(len(points), dtype=bool)
+    x1, y1 = coords[-1]
+    for x2, y2 in coords:
+        # only edges crossing the horizontal line through the point (horizontal edges never do)
+        crossing = np.nonzero((y1 > y) != (y2 > y))[0]
+        if len(crossing) > 0:
+            # count the crossings "right" of the point
+            x_intersection = x1 + (y[crossing] - y1) * (x2 - x1) / (y2 - y1)
+            crossing = crossing[x[crossing] < x_intersection]
+            contained[crossing] = ~contained[crossing]
+        x1, y1 = x2, y2
+    return contained
+
+
 def no_identical_consequent_vertices(coords):
     p1 = coords[-1]
     for p2 in coords:
@@ -125,28 +149,114 @@ def lies_behind(p1, p2, v):
     return x[1] < 1.0
 
 
-def no_self_intersection(coords):
-    polygon_length = len(coords)
-    # again_check = []
-    for index_p1, index_q1 in combinations(range(polygon_length), 2):
-        # always: index_p1 < index_q1
-        if index_p1 == index_q1 - 1 or index_p1 == index_q1 + 1:
-            # neighbouring edges never have an intersection
+# event types of the sweep line. at equal x coordinates edges are removed first, then vertical edges are checked
+#   and only then new edges are inserted (-> the sweep line status only contains edges actually crossing x)
+_EVENT_REMOVE = 0
+_EVENT_VERTICAL = 1
+_EVENT_INSERT = 2
+
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    # > 0: c lies left of the line a->b, < 0: right, 0: on the line
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _edges_cross(edge1, edge2):
+    # true intersection: the edges cross each other in the interior of both edges
+    # touching edges and parallel edges are not considered to intersect (consistent with get_intersection_status())
+    ax, ay, bx, by = edge1[:4]
+    cx, cy, dx, dy = edge2[:4]
+    o1 = _orientation(ax, ay, bx, by, cx, cy)
+    o2 = _orientation(ax, ay, bx, by, dx, dy)
+    if not (o1 > 0.0 > o2 or o1 < 0.0 < o2):
+        return False
+    o3 = _orientation(cx, cy, dx, dy, ax, ay)
+    o4 = _orientation(cx, cy, dx, dy, bx, by)
+    return o3 > 0.0 > o4 or o3 < 0.0 < o4
+
+
+def find_intersecting_edges(list_of_coords):
+    """ finds two polygon edges which truly intersect each other
+
+    sweep line algorithm after Shamos and Hoey: the edges are being processed in x order,
+    only edges which are neighbouring in y direction along the sweep line have to be tested against each other.
+    the sweep line status is a skip list (O(log n) updates).
+    -> O(n log n) (expected) instead of testing all pairs of edges. terminates with the first intersection found.
+    since all edges of all polygons are being checked together,
+    self intersections as well as intersections between different polygons are being detected.
+
+    NOTE: only true intersections (crossing in the interior of both edges) are being reported.
+    edges touching each other or sharing vertices are allowed, parallel (overlapping) edges are being ignored.
+
+    :param list_of_coords: a list of polygon coordinate arrays
+    :return: None if there is no intersection, otherwise a tuple of the two intersecting edges
+        each given as ``(polygon index, edge index)``. the edge with index i runs from vertex i to vertex i+1
+    """
+    edges = []
+    events = []
+    for polygon_index, coords in enumerate(list_of_coords):
+        coords = np.asarray(coords, dtype=float).tolist()
+        nr_vertices = len(coords)
+        for edge_index in range(nr_vertices):
+            p1 = tuple(coords[edge_index])
+            p2 = tuple(coords[(edge_index + 1) % nr_vertices])
+            if p2 < p1:
+                # the edges are being processed from left to right (and bottom to top)
+                p1, p2 = p2, p1
+            if p1 == p2:
+                # identical consequent vertices are being tested in no_identical_consequent_vertices()
+                continue
+            (x1, y1), (x2, y2) = p1, p2
+            edge_id = len(edges)
+            if x1 == x2:
+                slope = None
+                events.append((x1, _EVENT_VERTICAL, y1, edge_id))
+            else:
+                slope = (y2 - y1) / (x2 - x1)
+                events.append((x1, _EVENT_INSERT, y1, edge_id))
+                events.append((x2, _EVENT_REMOVE, y2, edge_id))
+            edges.append((x1, y1, x2, y2, slope, polygon_index, edge_index))
+
+    events.sort()
+
+    def y_at(edge_id, x):
+        x1, y1, _, _, slope = edges[edge_id][:5]
+        return y1 + (x - x1) * slope
+
+    def found(edge_id1, edge_id2):
+        return tuple(sorted((edges[edge_id1][5:], edges[edge_id2][5:])))
+
+    # all non vertical edges currently crossing the sweep line, ordered by their y coordinate
+    status = SkipList()
+    for x, event_type, y, edge_id in events:
+        if event_type == _EVENT_VERTICAL:
+            # the status contains only edges spanning over x (not starting or ending at x)
+            # a vertical edge intersects the lowest of these edges lying above its lower end,
+            # when the edge also lies below the upper end
+            above = status.first_after(lambda other: y_at(other, x) <= y)
+            if above is not None and y_at(above, x) < edges[edge_id][3]:
+                return found(edge_id, above)
             continue
-        p1, p2 = coords[index_p1], coords[(index_p1 + 1) % polygon_length]
-        q1, q2 = coords[index_q1], coords[(index_q1 + 1) % polygon_length]
-        intersect_status = get_intersection_status(p1, p2, q1, q2)
-        if intersect_status == 1:
-            return False
-        # if intersect_status == 2:
-        # TODO 4 different options. check which side the other edge lies on.
-        # if edge changes sides this is a an intersection
-        # again_check.append((p1, p2, q1, q2))
-        # print(p1, p2, q1, q2)
-
-    # TODO check for intersections across 2 edges! use computed intersection
 
-    return True
+        if event_type == _EVENT_INSERT:
+            # ordering right of x: by y, then by slope
+            slope = edges[edge_id][4]
+            status.insert(edge_id, lambda other: (y_at(other, x), edges[other][4]) < (y, slope))
+            for neighbour in status.neighbours(edge_id):
+                if neighbour is not None and _edges_cross(edges[edge_id], edges[neighbour]):
+                    return found(edge_id, neighbour)
+        else:
+            below, above = status.neighbours(edge_id)
+            status.remove(edge_id)
+            # the edges below and above are now neighbours
+            if below is not None and above is not None and _edges_cross(edges[below], edges[above]):
+                return found(below, above)
+
+    return None
+
+
+def no_self_intersection(coords):
+    return find_intersecting_edges([coords]) is None
 
 
 def has_clockwise_numbering(coords):
@@ -170,12 +280,12 @@ def has_clockwise_numbering(coords):
 
 
 # TODO test
-# todo - polygons must not intersect each other
 def check_data_requirements(boundary_coords: np.ndarray, list_hole_coords: List[np.ndarray]):
     """ ensures that all the following conditions on the polygons are fulfilled:
         - must at least contain 3 vertices
         - no consequent vertices with identical coordinates in the polygons! In general might have the same coordinates
-        - a polygon must not have self intersections (intersections with other polygons are allowed)
+        - a polygon must not have self intersections
+        - polygons must not intersect each other
         - edge numbering has to follow this convention (for easier computations):
             * outer boundary polygon: counter clockwise
             * holes: clockwise
@@ -188,16 +298,19 @@ def check_data_requirements(boundary_coords: np.ndarray, list_hole_coords: List[
     assert boundary_coords.shape[0] >= 3
     assert boundary_coords.shape[1] == 2
     assert no_identical_consequent_vertices(boundary_coords)
-    assert no_self_intersection(boundary_coords)
     assert not has_clockwise_numbering(boundary_coords)
 
     for hole_coords in list_hole_coords:
         assert hole_coords.shape[0] >= 3
         assert hole_coords.shape[1] == 2
         assert no_identical_consequent_vertices(hole_coords)
-        assert no_self_intersection(hole_coords)
         assert has_clockwise_numbering(hole_coords)
 
+    # checking all polygons at once also detects intersections between the polygons
+    intersection = find_intersecting_edges([boundary_coords] + list_hole_coords)
+    assert intersection is None, 'the edges (polygon index, edge index) {} and {} intersect ' \
+                                 '(polygon index 0: boundary, 1+: holes)'.format(*intersection)
+
     # TODO rectification
 
 
@@ -298,11 +411,13 @@ def convert_gridworld(size_x: int, size_y: int, obstacle_iter: iter, simplify: b
 
     if len(obstacle_iter) == 0:
         # there are no obstacles. return just the simple boundary rectangle
-        return [np.array(x, y) for x, y in [(0, 0), (size_x, 0), (size_x, size_y), (0, size_y)]], []
+        return np.array([(0, 0), (size_x, 0), (size_x, size_y), (0, size_y)]), []
 
     # convert (x,y) into np.arrays
     # obstacle_iter = [np.array(o) for o in obstacle_iter]
     obstacle_iter = np.array(obstacle_iter)
+    # constant time look up of obstacles (grid worlds might be large)
+    obstacle_set = {(x, y) for x, y in obstacle_iter.tolist()}
 
     def within_grid(pos):
         return 0 <= pos[0] < size_x and 0 <= pos[1] < size_y
@@ -310,14 +425,8 @@ def convert_gridworld(size_x: int, size_y: int, obstacle_iter: iter, simplify: b
     def is_equal(pos1, pos2):
         return np.all(pos1 == pos2)
 
-    def pos_in_iter(pos, iter):
-        for i in iter:
-            if is_equal(pos, i):
-                return True
-        return False
-
     def is_obstacle(pos):
-        return pos_in_iter(pos, obstacle_iter)
+        return (pos[0], pos[1]) in obstacle_set
 
     def is_blocked(pos):
         return not within_grid(pos) or is_obstacle(pos)
@@ -410,19 +519,18 @@ def convert_gridworld(size_x: int, size_y: int, obstacle_iter: iter, simplify: b
     # detect which of the obstacles have to be converted into holes
     # just the obstacles inside the boundary polygon are part of holes
     # shift coordinates by +(0.5,0.5) for correct detection
-    # the border value does not matter here
-    unchecked_obstacles = [o for o in obstacle_iter if
-                           inside_polygon(o[0] + 0.5, o[1] + 0.5, boundary_edges, border_value=True)]
+    # (the centers of the grid cells never lie on the polygon edges)
+    unchecked_obstacles = obstacle_iter[inside_polygon_vectorized(obstacle_iter + 0.5, boundary_edges)]
 
     hole_list = []
     while len(unchecked_obstacles) > 0:
-        start_pos = find_start(start_pos=(0, 0), boundary_detect_fct=pos_in_iter, iter=unchecked_obstacles)
+        # start at the lowest and leftmost obstacle
+        start_pos = unchecked_obstacles[np.lexsort((unchecked_obstacles[:, 0], unchecked_obstacles[:, 1]))[0]]
         hole = construct_polygon(start_pos, boundary_detect_fct=is_unblocked, cntr_clockwise_wanted=False)
 
         # detect which of the obstacles still do not belong to any hole:
         # delete the obstacles which are included in the just constructed hole
-        unchecked_obstacles = [o for o in unchecked_obstacles if
-                               not inside_polygon(o[0] + 0.5, o[1] + 0.5, hole, border_value=True)]
+        unchecked_obstacles = unchecked_obstacles[~inside_polygon_vectorized(unchecked_obstacles + 0.5, hole)]
 
         if simplify:
             # TODO
@@ -433,7 +541,7 @@ def convert_gridworld(size_x: int, size_y: int, obstacle_iter: iter, simplify: b
     return boundary_edges, hole_list
 
 
-def find_visible(vertex_candidates, edges_to_check):
+def find_visible(vertex_candidates, edges_to_check, statistics: Optional[Statistics] = None):
     """
     # IMPORTANT: self.translate(new_origin=query_vertex) always has to be called before!
         (for computing the angle representations wrt. the query vertex)
@@ -446,6 +554,7 @@ def find_visible(vertex_candidates, edges_to_check):
         IMPORTANT: must not contain the query vertex!
 
     :param edges_to_check: the set of edges which determine visibility
+    :param statistics: optional container for counting the checked edges and eliminated candidates
     :return: a set of tuples of all vertices visible from the query vertex and the corresponding distance
     """
 
@@ -453,6 +562,10 @@ def find_visible(vertex_candidates, edges_to_check):
     if len(vertex_candidates) == 0:
         return visible_vertices
 
+    if statistics is not None:
+        nr_candidates = len(vertex_candidates)
+        nr_edges = len(edges_to_check)
+
     priority_edges = set()
     # goal: eliminating all vertices lying 'behind' any edge
     # TODO improvement in combination with priority: process edges roughly in sequence, but still allow jumps
@@ -570,6 +683,8 @@ def find_visible(vertex_candidates, edges_to_check):
         # vertices directly on the edge are allowed (not eliminated)!
         p1 = v1.get_coordinates_translated()
         p2 = v2.get_coordinates_translated()
+        if statistics is not None:
+            statistics.lies_behind_calls += len(vertices_to_check)
         for vertex in vertices_to_check:
             if lies_behind(p1, p2, vertex.get_coordinates_translated()):
                 vertices_behind.add(vertex)
@@ -600,5 +715,10 @@ def find_visible(vertex_candidates, edges_to_check):
     # all remaining vertices were not concealed behind any edge and hence are visible
     visible_vertices.update(vertex_candidates)
 
+    if statistics is not None:
+        # NOTE: edges with the same coordinates as the query vertex are also being discarded without checking
+        statistics.edges_checked += nr_edges - len(edges_to_check)
+        statistics.candidates_eliminated += nr_candidates - len(visible_vertices)
+
     # return a set of tuples: (vertex, distance)
     return {(e, e.get_distance_to_origin()) for e in visible_vertices}
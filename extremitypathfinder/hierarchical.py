@@ -0,0 +1,207 @@
+"""
+hierarchical path planning for very large maps
+
+the map is being split into regions, each being an independent ``PolygonEnvironment``.
+neighbouring regions are connected by portals: points lying within (or on the boundary of) multiple regions.
+every region is being prepared independently and the shortest distances between all portals of a region
+are being precomputed. they form an abstract graph on top of the regions.
+a query then only searches the abstract graph and afterwards refines the regions on the chosen route.
+
+.. note::
+    all paths between different regions are leading through the portals.
+    the computed paths are hence the shortest paths among all paths through the portals,
+    which are only globally shortest when the portals are placed accordingly (e.g. in narrow passages).
+"""
+from copy import deepcopy
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from extremitypathfinder.extremitypathfinder import (
+    INPUT_COORD_LIST_TYPE, INPUT_COORD_TYPE, LENGTH_TYPE, PATH_TYPE, PolygonEnvironment,
+)
+from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Vertex
+
+
+class HierarchicalEnvironment:
+    """ an environment consisting of multiple regions connected by portals
+
+    keeps the prepared regions and the abstract graph of portals for consecutive path queries.
+    """
+
+    def __init__(self):
+        self.regions: List[PolygonEnvironment] = []
+        self.portals: List[Vertex] = []
+        # the indices of all regions a portal belongs to
+        self.portal_regions: List[List[int]] = []
+        # the indices of all portals of a region
+        self.region_portals: List[List[int]] = []
+        # the shortest distances between the portals within a region
+        self.portal_graph: Optional[DirectedHeuristicGraph] = None
+        # the region in which the shortest path between two (abstract graph) nodes has been found
+        self.edge_regions: Dict[Tuple[Vertex, Vertex], int] = {}
+        self.prepared: bool = False
+
+    def add_region(self, boundary_coordinates: INPUT_COORD_LIST_TYPE, list_of_hole_coordinates: INPUT_COORD_LIST_TYPE,
+                   validate: bool = False) -> int:
+        """ adds a region to the environment
+
+        the polygons must meet the same requirements as for ``PolygonEnvironment.store()``
+
+        :param boundary_coordinates: array of coordinates with counter clockwise edge numbering
+        :param list_of_hole_coordinates: array of coordinates with clockwise edge numbering
+        :param validate: whether the requirements of the data should be tested
+        :return: the index of the region
+        """
+        region = PolygonEnvironment()
+        region.store(boundary_coordinates, list_of_hole_coordinates, validate)
+        return self.add_environment(region)
+
+    def add_environment(self, environment: PolygonEnvironment) -> int:
+        """ adds an (optionally already prepared) environment as region
+
+        :param environment: the environment representing the region
+        :return: the index of the region
+        """
+        self.prepared = False
+        self.regions.append(environment)
+        self.region_portals.append([])
+        return len(self.regions) - 1
+
+    def add_portal(self, coordinates: INPUT_COORD_TYPE, region_indices: Optional[List[int]] = None) -> int:
+        """ adds a point connecting regions
+
+        :param coordinates: the coordinates of the portal
+        :param region_indices: the indices of the regions the portal belongs to.
+            default: all regions containing the portal (including their boundary)
+        :return: the index of the portal
+
+        :raises ValueError: when the portal does not lie within any region
+        """
+        if region_indices is None:
+            region_indices = self.find_regions(coordinates)
+        if len(region_indices) == 0:
+            raise ValueError('the portal {} does not lie within any region'.format(coordinates))
+        self.prepared = False
+        portal_idx = len(self.portals)
+        self.portals.append(Vertex(coordinates))
+        self.portal_regions.append(list(region_indices))
+        for region_idx in region_indices:
+            self.region_portals[region_idx].append(portal_idx)
+        return portal_idx
+
+    @property
+    def nr_regions(self) -> int:
+        return len(self.region_portals)
+
+    def get_region(self, region_idx: int) -> PolygonEnvironment:
+        return self.regions[region_idx]
+
+    def candidate_regions(self, coordinates: INPUT_COORD_TYPE) -> Iterable[int]:
+        """ :return: the indices of all regions possibly containing the given point """
+        return range(self.nr_regions)
+
+    def find_regions(self, coordinates: INPUT_COORD_TYPE) -> List[int]:
+        """ :return: the indices of all regions containing the given point """
+        return [i for i in self.candidate_regions(coordinates) if self.get_region(i).within_map(coordinates)]
+
+    def prepare(self, **prepare_kwargs):
+        """ prepares all regions and computes the abstract graph of the portals
+
+        :param prepare_kwargs: keyword arguments passed to ``PolygonEnvironment.prepare()`` of every region
+        """
+        if self.prepared:
+            raise ValueError('this environment is already prepared. add new regions or portals first.')
+
+        self.portal_graph = DirectedHeuristicGraph()
+        self.edge_regions = {}
+        for portal in self.portals:
+            self.portal_graph.add_node(portal)
+
+        for region_idx in range(self.nr_regions):
+            region = self.get_region(region_idx)
+            if not region.prepared:
+                region.prepare(**prepare_kwargs)
+            for portal_idx1, portal_idx2 in combinations(self.region_portals[region_idx], 2):
+                portal1, portal2 = self.portals[portal_idx1], self.portals[portal_idx2]
+                self._add_region_edges(region_idx, portal1, portal2, self.portal_graph, self.edge_regions,
+                                       undirected=True)
+        self.prepared = True
+
+    def _region_distance(self, region_idx: int, vertex1: Vertex, vertex2: Vertex) -> Optional[LENGTH_TYPE]:
+        # the query points lie on the region boundaries (portals). do not verify
+        region = self.get_region(region_idx)
+        _, distance = region.find_shortest_path(tuple(vertex1.coordinates), tuple(vertex2.coordinates), verify=False)
+        return distance
+
+    def _add_region_edges(self, region_idx: int, vertex1: Vertex, vertex2: Vertex, graph: DirectedHeuristicGraph,
+                          edge_regions: Dict[Tuple[Vertex, Vertex], int], undirected: bool = False):
+        # adds the edges with the distance within the region (when shorter than within another region)
+        distance = self._region_distance(region_idx, vertex1, vertex2)
+        if distance is None:
+            # not reachable within this region
+            return
+        for edge in [(vertex1, vertex2), (vertex2, vertex1)] if undirected else [(vertex1, vertex2)]:
+            try:
+                if graph.get_distance(*edge) <= distance:
+                    # a shorter connection within another region exists
+                    continue
+            except KeyError:
+                pass
+            graph.add_directed_edge(*edge, distance)
+            edge_regions[edge] = region_idx
+
+    def find_shortest_path(self, start_coordinates: INPUT_COORD_TYPE,
+                           goal_coordinates: INPUT_COORD_TYPE) -> Tuple[PATH_TYPE, Optional[LENGTH_TYPE]]:
+        """ computes the shortest path (through the portals) and its length between start and goal
+
+        searches the abstract graph of portals first and only then computes the paths within the regions
+
+        :param start_coordinates: a (x,y) coordinate tuple representing the start node
+        :param goal_coordinates:  a (x,y) coordinate tuple representing the goal node
+        :return: a tuple of shortest path and its length. ([], None) if the goal is not reachable
+
+        :raises ValueError: when start or goal do not lie within any region
+        """
+        if not self.prepared:
+            self.prepare()
+
+        start_regions = self.find_regions(start_coordinates)
+        goal_regions = self.find_regions(goal_coordinates)
+        if len(start_regions) == 0 or len(goal_regions) == 0:
+            raise ValueError('start or goal do not lie within the map')
+
+        if start_coordinates == goal_coordinates:
+            return [start_coordinates, goal_coordinates], 0.0
+
+        start_vertex = Vertex(start_coordinates)
+        goal_vertex = Vertex(goal_coordinates)
+        # do not change the precomputed graph
+        graph = deepcopy(self.portal_graph)
+        graph.add_node(start_vertex)
+        graph.add_node(goal_vertex)
+        edge_regions = self.edge_regions.copy()
+        for region_idx in start_regions:
+            if region_idx in goal_regions:
+                # the direct connection within the region
+                self._add_region_edges(region_idx, start_vertex, goal_vertex, graph, edge_regions)
+            for portal_idx in self.region_portals[region_idx]:
+                self._add_region_edges(region_idx, start_vertex, self.portals[portal_idx], graph, edge_regions)
+        for region_idx in goal_regions:
+            for portal_idx in self.region_portals[region_idx]:
+                self._add_region_edges(region_idx, self.portals[portal_idx], goal_vertex, graph, edge_regions)
+
+        abstract_path, distance = graph.modified_a_star(start_vertex, goal_vertex)
+        if distance is None:
+            return [], None
+
+        # refine only the regions on the route
+        path = [start_coordinates]
+        for vertex1, vertex2 in zip(abstract_path[:-1], abstract_path[1:]):
+            region = self.get_region(edge_regions[(vertex1, vertex2)])
+            region_path, _ = region.find_shortest_path(tuple(vertex1.coordinates), tuple(vertex2.coordinates),
+                                                       verify=False)
+            # the first point is the last point of the previous section
+            path.extend(region_path[1:])
+        # use the exact input coordinates
+        path[-1] = goal_coordinates
+        return path, distance
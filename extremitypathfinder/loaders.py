@@ -0,0 +1,166 @@
+"""
+loading maps from common polygon formats
+
+the loaders return the boundary coordinates and the list of hole coordinates as numpy arrays
+in the format expected by ``PolygonEnvironment.store()``::
+
+    environment.store(*from_geojson(geojson))
+
+* the exterior ring of the polygon is the boundary, the interior rings are the holes
+* the ring orientation is being corrected: boundary counter clockwise, holes clockwise
+* the closing point (repetition of the first point) and consequent duplicate points are being removed
+
+as well as reading query workloads (``iter_queries()``), one query per line, either as NDJSON::
+
+    {"start": [x1, y1], "goal": [x2, y2]}
+
+or as CSV with the columns ``start_x,start_y,goal_x,goal_y`` (optional header line)
+"""
+import csv
+import json
+import struct
+from typing import List, Tuple, Union
+
+import numpy as np
+
+# geometry type of polygons in (extended) WKB
+WKB_POLYGON = 3
+# flags of the extended WKB geometry type (PostGIS)
+EWKB_Z_FLAG = 0x80000000
+EWKB_M_FLAG = 0x40000000
+EWKB_SRID_FLAG = 0x20000000
+
+MAP_TYPE = Tuple[np.ndarray, List[np.ndarray]]
+
+
+def signed_area(coords: np.ndarray) -> float:
+    """ shoelace formula
+
+    :return: the area of the polygon, positive for counter clockwise vertex numbering
+    """
+    xs, ys = coords[:, 0], coords[:, 1]
+    return 0.5 * float(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1)))
+
+
+def normalise_ring(coords: np.ndarray, counter_clockwise: bool) -> np.ndarray:
+    """
+    :param coords: the coordinates of a polygon ring (optionally closed)
+    :param counter_clockwise: the required orientation
+    :return: the coordinates without closing point and duplicate points in the required orientation
+    :raises ValueError: when the ring does not have at least 3 distinct vertices
+    """
+    coords = np.asarray(coords, dtype=float)
+    if coords.ndim != 2 or coords.shape[1] < 2:
+        raise ValueError('invalid ring coordinates of shape {}'.format(coords.shape))
+    # drop additional dimensions (e.g. z)
+    coords = coords[:, :2]
+    # consequent duplicates, including the closing point
+    is_duplicate = np.all(coords == np.roll(coords, -1, axis=0), axis=1)
+    coords = coords[~is_duplicate]
+    if len(coords) < 3:
+        raise ValueError('a polygon ring must consist of at least 3 distinct vertices')
+    if (signed_area(coords) > 0.0) != counter_clockwise:
+        coords = coords[::-1]
+    return np.ascontiguousarray(coords)
+
+
+def rings_to_map(rings: List[np.ndarray]) -> MAP_TYPE:
+    if len(rings) == 0:
+        raise ValueError('the polygon has no exterior ring')
+    boundary_coordinates = normalise_ring(rings[0], counter_clockwise=True)
+    list_of_hole_coordinates = [normalise_ring(ring, counter_clockwise=False) for ring in rings[1:]]
+    return boundary_coordinates, list_of_hole_coordinates
+
+
+def from_geojson(geojson: Union[dict, str]) -> MAP_TYPE:
+    """ converts a GeoJSON polygon into a map
+
+    :param geojson: a GeoJSON object (dictionary or JSON string): a Polygon geometry,
+        a Feature with a Polygon geometry or a FeatureCollection with a single such Feature
+    :return: the boundary coordinates and the list of hole coordinates
+    :raises ValueError: when the object does not describe a single polygon
+    """
+    if isinstance(geojson, str):
+        geojson = json.loads(geojson)
+    geometry_type = geojson.get('type')
+    if geometry_type == 'FeatureCollection':
+        features = geojson['features']
+        if len(features) != 1:
+            raise ValueError('the FeatureCollection must contain exactly one feature, found {}'.format(len(features)))
+        geojson = features[0]
+        geometry_type = geojson.get('type')
+    if geometry_type == 'Feature':
+        geojson = geojson['geometry']
+        geometry_type = geojson.get('type')
+    if geometry_type != 'Polygon':
+        raise ValueError('expected a Polygon geometry, found: {}'.format(geometry_type))
+    return rings_to_map(geojson['coordinates'])
+
+
+def from_wkb(wkb: Union[bytes, str]) -> MAP_TYPE:
+    """ converts a polygon in well-known binary format into a map
+
+    supports ISO and extended (PostGIS) WKB with z or m coordinates (being ignored) and SRIDs
+
+    :param wkb: the WKB bytes or their hexadecimal representation
+    :return: the boundary coordinates and the list of hole coordinates
+    :raises ValueError: when the data does not describe a single polygon
+    """
+    if isinstance(wkb, str):
+        wkb = bytes.fromhex(wkb)
+    wkb = memoryview(wkb)
+    byte_order = '<' if wkb[0] == 1 else '>'
+    geometry_type, = struct.unpack_from(byte_order + 'I', wkb, 1)
+    offset = 5
+    if geometry_type & EWKB_SRID_FLAG:
+        offset += 4
+    nr_dimensions = 2 + bool(geometry_type & EWKB_Z_FLAG) + bool(geometry_type & EWKB_M_FLAG)
+    geometry_type &= 0x0FFFFFFF
+    # ISO WKB: 1000 z, 2000 m, 3000 zm
+    nr_dimensions += (geometry_type // 1000 + 1) // 2
+    geometry_type %= 1000
+    if geometry_type != WKB_POLYGON:
+        raise ValueError('expected a Polygon geometry, found WKB geometry type {}'.format(geometry_type))
+
+    nr_rings, = struct.unpack_from(byte_order + 'I', wkb, offset)
+    offset += 4
+    dtype = np.dtype(byte_order + 'f8')
+    rings = []
+    for _ in range(nr_rings):
+        nr_points, = struct.unpack_from(byte_order + 'I', wkb, offset)
+        offset += 4
+        ring = np.frombuffer(wkb, dtype=dtype, count=nr_points * nr_dimensions, offset=offset)
+        rings.append(ring.reshape(nr_points, nr_dimensions))
+        offset += nr_points * nr_dimensions * dtype.itemsize
+    return rings_to_map(rings)
+
+
+def iter_queries(path):
+    """ reads the queries lazily
+
+    :param path: the path of the query workload file (.csv or NDJSON)
+    :return: a generator of ((start_x, start_y), (goal_x, goal_y)) tuples
+    :raises ValueError: when a line does not contain a valid query (only the first CSV row may be a header)
+    """
+    with open(path) as f:
+        if path.endswith('.csv'):
+            reader = csv.reader(f)
+            is_first_row = True
+            for row in reader:
+                if len(row) == 0:
+                    continue
+                try:
+                    start_x, start_y, goal_x, goal_y = map(float, row)
+                except ValueError:
+                    if is_first_row:
+                        # header line
+                        is_first_row = False
+                        continue
+                    raise ValueError('invalid query in line {}: {}'.format(reader.line_num, ','.join(row)))
+                is_first_row = False
+                yield (start_x, start_y), (goal_x, goal_y)
+        else:
+            for line in f:
+                if line.strip():
+                    query = json.loads(line)
+                    yield tuple(query['start']), tuple(query['goal'])
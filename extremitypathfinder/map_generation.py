@@ -0,0 +1,235 @@
+"""
+seeded generators of synthetic environments for testing and benchmarking
+
+all polygon environments are being returned as ``(boundary_coordinates, list_of_hole_coordinates)``
+following the data requirements of ``PolygonEnvironment.store()``
+(boundary polygon counter clockwise, holes clockwise, no intersections).
+all grid worlds are being returned as ``(size_x, size_y, obstacle_iter)``
+following the requirements of ``PolygonEnvironment.store_grid_world()``
+(no free cells surrounded by obstacles). NOTE: store them with ``simplify=False``.
+
+the same seed always produces the same environment.
+"""
+from math import ceil, sqrt
+from typing import List, Tuple
+
+import numpy as np
+
+POLYGON_ENV_TYPE = Tuple[np.ndarray, List[np.ndarray]]
+GRID_WORLD_TYPE = Tuple[int, int, List[Tuple[int, int]]]
+
+CELL_SIZE = 10.0  # size of the square cell reserved for every hole
+MIN_HOLE_VERTICES = 3
+
+
+def _rectangle(x_min, y_min, x_max, y_max, clockwise):
+    coords = np.array([(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)], dtype=float)
+    if clockwise:
+        return coords[::-1]
+    return coords
+
+
+def random_hole(rng: np.random.RandomState, center, max_radius: float, nr_vertices: int, concave: bool) -> np.ndarray:
+    """ a random star shaped polygon with clockwise numbering lying completely within the given radius
+
+    :param rng: the random number generator to use
+    :param center: the center coordinates of the polygon
+    :param max_radius: no vertex lies farther away from the center
+    :param nr_vertices: the amount of vertices of the polygon
+    :param concave: whether the polygon is allowed to be concave (otherwise: convex)
+    :return: the coordinates of the polygon
+    """
+    nr_vertices = max(nr_vertices, MIN_HOLE_VERTICES)
+    # evenly spaced angles with random jitter. the spacing guarantees distinct vertices
+    # clockwise numbering: decreasing angles
+    spacing = 2 * np.pi / nr_vertices
+    angles = -np.arange(nr_vertices) * spacing - rng.uniform(0.0, 0.4 * spacing, nr_vertices)
+    if concave:
+        radii = rng.uniform(0.3 * max_radius, max_radius, nr_vertices)
+    else:
+        # all vertices on a circle -> convex
+        radii = np.full(nr_vertices, max_radius)
+    return np.column_stack((center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)))
+
+
+def random_polygon_environment(nr_vertices: int, seed: int = 0, concave: bool = True,
+                               vertices_per_hole: int = 8) -> POLYGON_ENV_TYPE:
+    """ a rectangular boundary with randomly placed non overlapping holes
+
+    every hole lies within its own square cell of a regular grid. the cells are being chosen randomly.
+
+    :param nr_vertices: the approximate total amount of vertices of all polygons
+    :param seed: the seed of the random number generator
+    :param concave: whether the holes are allowed to be concave (otherwise: convex)
+    :param vertices_per_hole: the amount of vertices of every hole
+    :return: the boundary coordinates and the list of hole coordinates
+    """
+    rng = np.random.RandomState(seed)
+    vertices_per_hole = max(vertices_per_hole, MIN_HOLE_VERTICES)
+    nr_holes = max((nr_vertices - 4) // vertices_per_hole, 1)
+    # leave some of the cells free
+    nr_cells_x = int(ceil(sqrt(nr_holes * 1.5)))
+    nr_cells_y = int(ceil(nr_holes * 1.5 / nr_cells_x))
+    boundary = _rectangle(0.0, 0.0, nr_cells_x * CELL_SIZE, nr_cells_y * CELL_SIZE, clockwise=False)
+
+    holes = []
+    cells = rng.choice(nr_cells_x * nr_cells_y, nr_holes, replace=False)
+    for cell in sorted(cells):
+        cell_x, cell_y = divmod(cell, nr_cells_y)
+        max_radius = rng.uniform(0.25, 0.4) * CELL_SIZE
+        # random position within the cell, keep a distance to the cell borders
+        slack = 0.45 * CELL_SIZE - max_radius
+        center = ((cell_x + 0.5) * CELL_SIZE + rng.uniform(-slack, slack),
+                  (cell_y + 0.5) * CELL_SIZE + rng.uniform(-slack, slack))
+        holes.append(random_hole(rng, center, max_radius, vertices_per_hole, concave))
+    return boundary, holes
+
+
+def warehouse_environment(nr_vertices: int, seed: int = 0, rack_length: int = 8,
+                          cross_aisle_interval: int = 3) -> POLYGON_ENV_TYPE:
+    """ a warehouse like layout: rows of rectangular racks separated by aisles
+
+    long aisles run between the rows of racks, cross aisles interrupt the rows regularly.
+    some racks are randomly missing or shortened.
+
+    :param nr_vertices: the approximate total amount of vertices of all polygons
+    :param seed: the seed of the random number generator
+    :param rack_length: the maximal length of a single rack
+    :param cross_aisle_interval: the amount of racks in a row between two cross aisles
+    :return: the boundary coordinates and the list of hole coordinates
+    """
+    rng = np.random.RandomState(seed)
+    nr_racks = max((nr_vertices - 4) // 4, 1)
+    rack_width = 1.0
+    aisle_width = 2.0
+    cross_aisle_width = 3.0
+    segment_length = rack_length + 1.0  # rack plus gap
+
+    nr_rows = max(int(round(sqrt(nr_racks / cross_aisle_interval))), 1)
+    racks_per_row = int(ceil(nr_racks / nr_rows))
+    nr_blocks = int(ceil(racks_per_row / cross_aisle_interval))
+    block_length = cross_aisle_interval * segment_length
+    size_x = cross_aisle_width + nr_blocks * (block_length + cross_aisle_width)
+    size_y = aisle_width + nr_rows * (rack_width + aisle_width)
+    boundary = _rectangle(0.0, 0.0, size_x, size_y, clockwise=False)
+
+    holes = []
+    for row in range(nr_rows):
+        y_min = aisle_width + row * (rack_width + aisle_width)
+        for rack in range(racks_per_row):
+            if len(holes) == nr_racks:
+                break
+            if rng.uniform() < 0.05:
+                # missing rack
+                continue
+            block, position = divmod(rack, cross_aisle_interval)
+            x_min = cross_aisle_width + block * (block_length + cross_aisle_width) + position * segment_length
+            length = rack_length * rng.uniform(0.5, 1.0)
+            holes.append(_rectangle(x_min, y_min, x_min + length, y_min + rack_width, clockwise=True))
+    return boundary, holes
+
+
+def _fill_enclosed_cells(free: np.ndarray) -> np.ndarray:
+    """ keeps only the largest 4-connected region of free cells, all others are being turned into obstacles """
+    size_x, size_y = free.shape
+    labels = np.full(free.shape, -1, dtype=int)
+    largest_label, largest_size = -1, 0
+    label = 0
+    for x_start, y_start in zip(*np.nonzero(free)):
+        if labels[x_start, y_start] >= 0:
+            continue
+        # flood fill
+        labels[x_start, y_start] = label
+        stack = [(x_start, y_start)]
+        region_size = 0
+        while stack:
+            x, y = stack.pop()
+            region_size += 1
+            for x2, y2 in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= x2 < size_x and 0 <= y2 < size_y and free[x2, y2] and labels[x2, y2] < 0:
+                    labels[x2, y2] = label
+                    stack.append((x2, y2))
+        if region_size > largest_size:
+            largest_label, largest_size = label, region_size
+        label += 1
+    return labels == largest_label
+
+
+def _remove_diagonal_contacts(free: np.ndarray) -> np.ndarray:
+    """ blocks free cells where obstacles only touch diagonally
+
+    such 2x2 configurations result in polygons touching themselves in a single vertex
+    """
+    free = free.copy()
+    while True:
+        a = free[:-1, :-1]
+        b = free[1:, :-1]
+        c = free[:-1, 1:]
+        d = free[1:, 1:]
+        # free cells on one diagonal, obstacles on the other
+        pattern1 = a & d & ~b & ~c
+        pattern2 = b & c & ~a & ~d
+        if not (pattern1.any() or pattern2.any()):
+            return free
+        xs, ys = np.nonzero(pattern1)
+        free[xs, ys] = False
+        xs, ys = np.nonzero(pattern2)
+        free[xs + 1, ys] = False
+
+
+def _obstacles_from_free(free: np.ndarray) -> List[Tuple[int, int]]:
+    return [(int(x), int(y)) for x, y in zip(*np.nonzero(~free))]
+
+
+def random_grid_world(size_x: int, size_y: int, obstacle_density: float = 0.2, seed: int = 0) -> GRID_WORLD_TYPE:
+    """ a grid world with randomly blocked cells
+
+    free cells which are not reachable from the largest free region are being blocked
+    (required by ``PolygonEnvironment.store_grid_world()``).
+
+    :param size_x: the horizontal grid world size
+    :param size_y: the vertical grid world size
+    :param obstacle_density: the probability of a grid cell being an obstacle
+    :param seed: the seed of the random number generator
+    :return: the grid world size and the list of obstacle cells
+    """
+    rng = np.random.RandomState(seed)
+    free = rng.uniform(size=(size_x, size_y)) >= obstacle_density
+    # blocking cells might create enclosed regions again
+    free = _fill_enclosed_cells(_remove_diagonal_contacts(free))
+    return size_x, size_y, _obstacles_from_free(free)
+
+
+def maze_grid_world(nr_cells_x: int, nr_cells_y: int, seed: int = 0) -> GRID_WORLD_TYPE:
+    """ a perfect maze (exactly one route between any two points) with corridors of width 1
+
+    generated with a randomised depth first search. the maze cells lie on the even grid positions,
+    the walls in between.
+
+    :param nr_cells_x: the amount of maze cells in horizontal direction
+    :param nr_cells_y: the amount of maze cells in vertical direction
+    :param seed: the seed of the random number generator
+    :return: the grid world size and the list of obstacle cells
+    """
+    rng = np.random.RandomState(seed)
+    size_x, size_y = 2 * nr_cells_x - 1, 2 * nr_cells_y - 1
+    free = np.zeros((size_x, size_y), dtype=bool)
+    free[0, 0] = True
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        unvisited = [(x2, y2) for x2, y2 in ((x + 2, y), (x - 2, y), (x, y + 2), (x, y - 2))
+                     if 0 <= x2 < size_x and 0 <= y2 < size_y and not free[x2, y2]]
+        if not unvisited:
+            stack.pop()
+            continue
+        x2, y2 = unvisited[rng.randint(len(unvisited))]
+        # remove the wall in between
+        free[(x + x2) // 2, (y + y2) // 2] = True
+        free[x2, y2] = True
+        stack.append((x2, y2))
+    return size_x, size_y, _obstacles_from_free(free)
+
+
+def count_vertices(boundary_coordinates, list_of_hole_coordinates) -> int:
+    return len(boundary_coordinates) + sum(len(h) for h in list_of_hole_coordinates)
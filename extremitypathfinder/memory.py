@@ -0,0 +1,125 @@
+"""
+estimating the memory footprint of an environment
+
+the sizes are being measured with ``sys.getsizeof()`` (python objects incl. their numpy arrays).
+objects referenced multiple times (e.g. the vertices being graph nodes) are only being counted once,
+in the first category they appear in.
+"""
+import sys
+from copy import deepcopy
+from typing import Dict, Iterable, Optional, Set
+
+import numpy as np
+
+from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Edge, Polygon, Vertex
+
+# accounted for separately (not being followed when measuring other objects)
+ACCOUNTED_TYPES = (Vertex, Edge, Polygon)
+
+
+def slot_values(obj) -> Iterable:
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            value = getattr(obj, slot, None)
+            if value is not None:
+                yield value
+
+
+def deep_size(obj, seen: Set[int]) -> int:
+    """ :return: the size of the object and all objects referenced by it (not seen yet) in bytes """
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        if isinstance(obj, ACCOUNTED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, np.ndarray):
+            if obj.base is not None:
+                # a view: the data is being stored in another array
+                stack.append(obj.base)
+            if obj.dtype == object:
+                stack.extend(obj.flat)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(type(obj), '__slots__'):
+            stack.extend(slot_values(obj))
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return total
+
+
+def shallow_size(objects: Iterable, seen: Set[int]) -> int:
+    """ :return: the size of the objects themselves (not seen yet) in bytes """
+    total = 0
+    for obj in objects:
+        if obj is not None and id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+    return total
+
+
+def vertex_size(vertex: Vertex, seen: Set[int]) -> int:
+    """ :return: the size of a vertex and its coordinates (not seen yet) in bytes (without the angle representation) """
+    attributes = [vertex.coordinates, vertex.coordinates_translated, vertex.distance_to_origin]
+    return shallow_size([vertex], seen) + sum(deep_size(attribute, seen) for attribute in attributes)
+
+
+def memory_report(environment) -> Dict[str, float]:
+    """ estimates the memory used by the parts of an environment
+
+    :param environment: a ``PolygonEnvironment``
+    :return: a dictionary with the bytes used by every part, the total amount of bytes
+        and the average amount of bytes per polygon vertex, per polygon edge and per graph edge
+    """
+    seen: Set[int] = {id(True), id(False)}
+    polygons = list(environment.polygons) if environment.boundary_polygon is not None else []
+    vertices = [v for p in polygons for v in p.vertices]
+    edges = [e for p in polygons for e in p.edges]
+    report = {
+        'polygon_coordinates': sum(deep_size(p.coordinates, seen) for p in polygons),
+        'vertices': sum(vertex_size(v, seen) for v in vertices),
+        'angle_representations': sum(deep_size(v.angle_representation, seen) for v in vertices),
+        'edges': shallow_size(edges, seen),
+        # the polygon objects and their lists of vertices, edges and extremities
+        'polygons': sum(shallow_size([p, p.vertices, p.edges, p.extremities], seen) for p in polygons),
+    }
+
+    graph: Optional[DirectedHeuristicGraph] = environment.graph
+    nr_graph_edges = 0
+    if graph is None:
+        report.update(graph_neighbours=0, graph_distances=0, graph_other=0, temp_graph=0)
+    else:
+        nr_graph_edges = len(graph.distances)
+        neighbour_sets = [graph.neighbours] + list(graph.neighbours.values())
+        report['graph_neighbours'] = shallow_size(neighbour_sets, seen)
+        report['graph_distances'] = deep_size(graph.distances, seen)
+        # the graph object itself, all nodes, heuristic, landmarks etc. and the connected components
+        report['graph_other'] = deep_size(graph, seen) + deep_size(environment.node_components, seen)
+        # the graph copy of a query (additionally to the persistent memory)
+        temp_graph = getattr(environment, 'temp_graph', None)
+        if temp_graph is None:
+            # an actual copy (without the edges of a start and goal)
+            temp_graph = deepcopy(graph)
+        report['temp_graph'] = deep_size(temp_graph, set(seen))
+
+    report['triangulation'] = deep_size(environment.triangulation, seen)
+    report['oracle'] = deep_size(environment.oracle, seen)
+    report['identical_extremities'] = deep_size(environment.identical_extremities, seen)
+    report['total'] = sum(size for name, size in report.items() if name != 'temp_graph')
+
+    nr_vertices = len(vertices)
+    vertex_bytes = report['polygon_coordinates'] + report['vertices'] + report['angle_representations']
+    report['nr_vertices'] = nr_vertices
+    report['nr_graph_edges'] = nr_graph_edges
+    report['bytes_per_vertex'] = vertex_bytes / nr_vertices if nr_vertices > 0 else 0.0
+    report['bytes_per_edge'] = report['edges'] / len(edges) if len(edges) > 0 else 0.0
+    graph_edge_bytes = report['graph_neighbours'] + report['graph_distances']
+    report['bytes_per_graph_edge'] = graph_edge_bytes / nr_graph_edges if nr_graph_edges > 0 else 0.0
+    return report
@@ -0,0 +1,143 @@
+"""
+precomputed shortest distances between all nodes of the visibility graph ("distance oracle")
+
+replaces the graph search of a query by a table look up:
+the shortest path from the start to the goal leads through one extremity visible from the start
+and one extremity visible from the goal (or is the direct connection).
+with all distances between the extremities being known, the query reduces to finding the pair of visible
+extremities with the lowest total distance. the path itself is being reconstructed from a table of next hops.
+
+.. note::
+    requires memory quadratic in the amount of graph nodes (8 bytes per pair): e.g. 200MB for 5000 nodes
+"""
+import heapq
+import os
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Vertex
+
+NO_NEXT_HOP = -1
+DISTANCE_DTYPE = np.float32
+INDEX_DTYPE = np.int32
+
+# the adjacency of the graph in the worker processes
+_neighbours: List[List[int]] = []
+_weights: List[List[float]] = []
+
+
+def _init_worker(neighbours: List[List[int]], weights: List[List[float]]):
+    global _neighbours, _weights
+    _neighbours = neighbours
+    _weights = weights
+
+
+def _shortest_distances(source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """ dijkstra from the source to all nodes
+
+    :return: the distances and the first node on the shortest path to every node (the next hop)
+    """
+    # NOTE: python lists are faster than numpy arrays for accessing single elements
+    nr_nodes = len(_neighbours)
+    distances = [float('inf')] * nr_nodes
+    next_hops = [NO_NEXT_HOP] * nr_nodes
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            # outdated entry, the node has already been reached on a shorter path
+            continue
+        # the next hop of the nodes reached from the source directly is the node itself
+        next_hop = next_hops[node]
+        for neighbour, weight in zip(_neighbours[node], _weights[node]):
+            new_distance = distance + weight
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                next_hops[neighbour] = neighbour if node == source else next_hop
+                heapq.heappush(heap, (new_distance, neighbour))
+    distances = np.array(distances, dtype=DISTANCE_DTYPE)
+    next_hops = np.array(next_hops, dtype=INDEX_DTYPE)
+    return distances, next_hops
+
+
+class DistanceOracle:
+    """ the shortest distances and next hops between all nodes of a graph """
+
+    __slots__ = ['nodes', 'node_indices', 'coordinates', 'distances', 'next_hops']
+
+    def __init__(self, graph: DirectedHeuristicGraph, nr_processes: Optional[int] = None):
+        """
+        :param graph: the visibility graph of an environment
+        :param nr_processes: the amount of processes to compute the distances in parallel. default: all CPUs
+        """
+        # in a deterministic order
+        self.nodes: List[Vertex] = sorted(graph.get_all_nodes(), key=lambda n: tuple(n.coordinates.tolist()))
+        self.node_indices: Dict[Vertex, int] = {n: i for i, n in enumerate(self.nodes)}
+        self.coordinates: np.ndarray = np.array([n.coordinates for n in self.nodes], dtype=float).reshape(-1, 2)
+        nr_nodes = len(self.nodes)
+        neighbours = [[] for _ in range(nr_nodes)]
+        weights = [[] for _ in range(nr_nodes)]
+        for (node1, node2), distance in graph.distances.items():
+            idx1 = self.node_indices[node1]
+            neighbours[idx1].append(self.node_indices[node2])
+            weights[idx1].append(float(distance))
+
+        # distances[i, j]: the shortest distance from node i to node j
+        # next_hops[i, j]: the next node after node i on the shortest path to node j
+        self.distances: np.ndarray = np.empty((nr_nodes, nr_nodes), dtype=DISTANCE_DTYPE)
+        self.next_hops: np.ndarray = np.empty((nr_nodes, nr_nodes), dtype=INDEX_DTYPE)
+        if nr_processes is None:
+            nr_processes = os.cpu_count() or 1
+        if nr_processes == 1 or nr_nodes < 2:
+            _init_worker(neighbours, weights)
+            rows = map(_shortest_distances, range(nr_nodes))
+            self._store_rows(rows)
+        else:
+            with Pool(nr_processes, initializer=_init_worker, initargs=(neighbours, weights)) as pool:
+                chunk_size = max(1, nr_nodes // (4 * nr_processes))
+                self._store_rows(pool.imap(_shortest_distances, range(nr_nodes), chunksize=chunk_size))
+
+    def _store_rows(self, rows):
+        for idx, (distances, next_hops) in enumerate(rows):
+            self.distances[idx] = distances
+            self.next_hops[idx] = next_hops
+
+    def get_path(self, node1: Vertex, node2: Vertex) -> List[Vertex]:
+        """ :return: the nodes of the shortest path between the two nodes (including both). [] if not reachable """
+        idx1, idx2 = self.node_indices[node1], self.node_indices[node2]
+        if idx1 == idx2:
+            return [node1]
+        if self.next_hops[idx1, idx2] == NO_NEXT_HOP:
+            return []
+        path = [idx1]
+        while path[-1] != idx2:
+            path.append(int(self.next_hops[path[-1], idx2]))
+        return [self.nodes[i] for i in path]
+
+    def find_shortest_path(self, start_visibles: List[Tuple[Vertex, float]],
+                           goal_visibles: List[Tuple[Vertex, float]]) -> Tuple[List[Vertex], Optional[float]]:
+        """ finds the shortest path through the graph between two points not being part of the graph
+
+        :param start_visibles: the nodes (and their distance) visible from the start
+        :param goal_visibles: the nodes (and their distance) visible from the goal
+        :return: the nodes of the shortest path and the total length (incl. start and goal connections).
+            ([], None) if not reachable
+        """
+        start_indices = [self.node_indices[n] for n, _ in start_visibles]
+        goal_indices = [self.node_indices[n] for n, _ in goal_visibles]
+        start_distances = np.array([d for _, d in start_visibles])
+        goal_distances = np.array([d for _, d in goal_visibles])
+        # start - node1 - ... - node2 - goal for all combinations of visible nodes
+        node_distances = self.distances[np.ix_(start_indices, goal_indices)]
+        lengths = start_distances[:, None] + node_distances + goal_distances[None, :]
+        i, j = np.unravel_index(np.argmin(lengths), lengths.shape)
+        if not np.isfinite(lengths[i, j]):
+            return [], None
+        path = self.get_path(self.nodes[start_indices[i]], self.nodes[goal_indices[j]])
+        # NOTE: the stored distances have a lower precision. compute the length of the path exactly
+        coordinates = self.coordinates[[self.node_indices[n] for n in path]]
+        length = start_distances[i] + np.linalg.norm(np.diff(coordinates, axis=0), axis=1).sum() + goal_distances[j]
+        return path, float(length)
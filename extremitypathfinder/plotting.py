@@ -3,6 +3,8 @@ from os import makedirs
 from os.path import abspath, exists, join
 
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.patches import Polygon
 
 from extremitypathfinder.extremitypathfinder import PolygonEnvironment
@@ -18,6 +20,10 @@ POLYGON_SETTINGS = {
 }
 
 SHOW_PLOTS = False
+# the maximal amount of plotted graph edges (evenly sampled). None: plot all edges
+MAX_PLOTTED_EDGES = None
+# collections with more elements are being rasterized (vector graphics with many elements render slowly)
+RASTERIZATION_THRESHOLD = 10000
 # TODO avoid global variable
 PLOTTING_DIR = 'all_plots'
 
@@ -32,24 +38,57 @@ def export_plot(fig, file_name):
     plt.close()
 
 
+def get_coordinates(vertex_iter) -> np.ndarray:
+    """ :return: the coordinates of the vertices (or coordinate tuples) as array of shape (n, 2) """
+    coordinates = [v.coordinates if hasattr(v, 'coordinates') else v for v in vertex_iter]
+    return np.array(coordinates, dtype=float).reshape(-1, 2)
+
+
 def mark_points(vertex_iter, **kwargs):
-    try:
-        coordinates = [v.coordinates.tolist() for v in vertex_iter]
-    except AttributeError:
-        coordinates = [v for v in vertex_iter]
-    coords_zipped = list(zip(*coordinates))
-    if coords_zipped:  # there might be no vertices at all
-        plt.scatter(*coords_zipped, **kwargs)
+    coordinates = get_coordinates(vertex_iter)
+    if len(coordinates) > 0:  # there might be no vertices at all
+        kwargs.setdefault('rasterized', len(coordinates) > RASTERIZATION_THRESHOLD)
+        plt.scatter(coordinates[:, 0], coordinates[:, 1], **kwargs)
+
+
+def decimate(segments: np.ndarray, max_amount=None) -> np.ndarray:
+    """ :return: at most the given amount of evenly sampled segments """
+    if max_amount is None or len(segments) <= max_amount:
+        return segments
+    return segments[np.linspace(0, len(segments) - 1, max_amount).astype(int)]
+
+
+def get_segments(edge_iter) -> np.ndarray:
+    """
+    :param edge_iter: pairs of vertices (or coordinate tuples)
+    :return: the coordinates of the edges as array of shape (n, 2, 2)
+    """
+    vertices = [v for edge in edge_iter for v in edge]
+    return get_coordinates(vertices).reshape(-1, 2, 2)
+
+
+def get_graph_segments(graph) -> np.ndarray:
+    """ :return: the coordinates of all edges of the graph (edges in both directions only once) """
+    edges = [(n1, n2) for n1, neighbours in graph.get_neighbours() for n2 in neighbours
+             if id(n1) < id(n2) or n1 not in graph.get_neighbours_of(n2)]
+    return get_segments(edges)
+
+
+def draw_edges(segments: np.ndarray, c, alpha, max_amount=None, **kwargs):
+    """ draws all edges as a single artist
+
+    :param segments: the coordinates of the edges, shape (n, 2, 2)
+    :param max_amount: the maximal amount of edges to draw (evenly sampled). None: all edges
+    """
+    segments = decimate(segments, max_amount)
+    if len(segments) == 0:
+        return
+    kwargs.setdefault('rasterized', len(segments) > RASTERIZATION_THRESHOLD)
+    plt.gca().add_collection(LineCollection(segments, colors=c, alpha=alpha, **kwargs))
 
 
 def draw_edge(v1, v2, c, alpha, **kwargs):
-    if type(v1) == tuple:
-        x1, y1 = v1
-        x2, y2 = v2
-    else:
-        x1, y1 = v1.coordinates
-        x2, y2 = v2.coordinates
-    plt.plot([x1, x2], [y1, y2], color=c, alpha=alpha, **kwargs)
+    draw_edges(get_segments([(v1, v2)]), c, alpha, **kwargs)
 
 
 def draw_polygon(ax, coords, **kwargs):
@@ -60,19 +99,19 @@ def draw_polygon(ax, coords, **kwargs):
 
 def draw_boundaries(map, ax):
     # TODO outside light grey
-    # TODO fill holes light grey
     draw_polygon(ax, map.boundary_polygon.coordinates)
-    for h in map.holes:
-        draw_polygon(ax, h.coordinates, facecolor='grey', fill=True)
+    # all holes as a single artist
+    hole_coordinates = [h.coordinates for h in map.holes]
+    if hole_coordinates:
+        ax.add_collection(PolyCollection(hole_coordinates, facecolors='grey', edgecolors='black', linewidths=1.0,
+                                         rasterized=len(hole_coordinates) > RASTERIZATION_THRESHOLD))
 
     mark_points(map.all_vertices, c='black', s=15)
     mark_points(map.all_extremities, c='red', s=50)
 
 
 def draw_internal_graph(map, ax):
-    for start, all_goals in map.graph.get_neighbours():
-        for goal in all_goals:
-            draw_edge(start, goal, c='red', alpha=0.2, linewidth=2)
+    draw_edges(get_graph_segments(map.graph), c='red', alpha=0.2, max_amount=MAX_PLOTTED_EDGES, linewidth=2)
 
 
 def set_limits(map, ax):
@@ -85,10 +124,7 @@ def draw_path(vertex_path):
     if vertex_path:
         mark_points(vertex_path, c='g', alpha=0.9, s=50)
         mark_points([vertex_path[0], vertex_path[-1]], c='g', s=100)
-        v1 = vertex_path[0]
-        for v2 in vertex_path[1:]:
-            draw_edge(v1, v2, c='g', alpha=1.0)
-            v1 = v2
+        draw_edges(get_segments(zip(vertex_path[:-1], vertex_path[1:])), c='g', alpha=1.0)
 
 
 def draw_loaded_map(map):
@@ -122,16 +158,14 @@ def draw_with_path(map, temp_graph, vertex_path):
 
     # additionally draw:
     # new edges yellow
-    if start in temp_graph.get_all_nodes():
-        for n2, d in temp_graph.edges_from(start):
-            draw_edge(start, n2, c='y', alpha=0.7)
-
+    new_edges = []
     all_nodes = temp_graph.get_all_nodes()
+    if start in all_nodes:
+        new_edges += [(start, n2) for n2 in temp_graph.get_neighbours_of(start)]
     if goal in all_nodes:
         # edges only run towards goal
-        for n1 in all_nodes:
-            if goal in temp_graph.get_neighbours_of(n1):
-                draw_edge(n1, goal, c='y', alpha=0.7)
+        new_edges += [(n1, goal) for n1, neighbours in temp_graph.get_neighbours() if goal in neighbours]
+    draw_edges(get_segments(new_edges), c='y', alpha=0.7)
 
     # start, path and goal in green
     draw_path(vertex_path)
@@ -159,14 +193,13 @@ def draw_graph(map, graph):
     all_nodes = graph.get_all_nodes()
     mark_points(all_nodes, c='black', s=30)
 
-    for n in all_nodes:
-        x, y = n.coordinates
-        neighbours = graph.get_neighbours_of(n)
-        for n2 in neighbours:
-            x2, y2 = n2.coordinates
-            dx, dy = x2 - x, y2 - y
-            plt.arrow(x, y, dx, dy, head_width=0.15, head_length=0.5, head_starts_at_zero=False, shape='full',
-                      length_includes_head=True)
+    # all directed edges as a single artist
+    segments = decimate(get_segments((n1, n2) for n1, neighbours in graph.get_neighbours() for n2 in neighbours),
+                        MAX_PLOTTED_EDGES)
+    if len(segments) > 0:
+        starts, vectors = segments[:, 0], segments[:, 1] - segments[:, 0]
+        ax.quiver(starts[:, 0], starts[:, 1], vectors[:, 0], vectors[:, 1], angles='xy', scale_units='xy', scale=1.0,
+                  width=0.002, rasterized=len(segments) > RASTERIZATION_THRESHOLD)
 
     set_limits(map, ax)
 
@@ -188,13 +221,15 @@ class PlottingEnvironment(PolygonEnvironment):
         super().store(*args, **kwargs)
         draw_loaded_map(self)
 
-    def prepare(self):
-        super().prepare()
+    def prepare(self, *args, **kwargs):
+        statistics = super().prepare(*args, **kwargs)
         draw_prepared_map(self)
+        return statistics
 
     def find_shortest_path(self, *args, **kwargs):
         # important to not delete the temp graph! for plotting
-        vertex_path, distance = super().find_shortest_path(*args, free_space_after=False, **kwargs)
+        result = super().find_shortest_path(*args, free_space_after=False, **kwargs)
+        vertex_path = result[0]
 
         if self.temp_graph:  # in some cases (e.g. direct path possible) no graph is being created!
             draw_graph(self, self.temp_graph)
@@ -202,5 +237,5 @@ class PlottingEnvironment(PolygonEnvironment):
             draw_only_path(self, vertex_path)
             del self.temp_graph  # free the memory
 
-        # extract the coordinates from the path
-        return vertex_path, distance
+        # path, distance (, statistics)
+        return result
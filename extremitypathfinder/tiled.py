@@ -0,0 +1,140 @@
+"""
+tiled environments with lazy loading and bounded resident memory
+
+every tile is a prepared ``PolygonEnvironment`` persisted on disk.
+tiles are only being loaded when a query touches them and are being evicted (least recently used first)
+when the resident tiles exceed the memory budget.
+paths crossing multiple tiles are being stitched at portals (points on the shared tile boundaries),
+as in the hierarchical environment. the index of the tiles and portals (incl. the distances between the portals)
+is being persisted in the same directory.
+"""
+import os
+import pickle
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from extremitypathfinder.extremitypathfinder import INPUT_COORD_TYPE, PolygonEnvironment
+from extremitypathfinder.hierarchical import HierarchicalEnvironment
+
+INDEX_FILE_NAME = 'index.pickle'
+TILE_FILE_NAME = 'tile_{:06d}.pickle'
+DEFAULT_MEMORY_BUDGET = 512 * 2 ** 20  # bytes
+BOUNDS_TYPE = Tuple[float, float, float, float]  # x_min, y_min, x_max, y_max
+# the attributes stored in the index file
+INDEX_ATTRIBUTES = ['tile_files', 'tile_sizes', 'tile_bounds', 'portals', 'portal_regions', 'region_portals',
+                    'portal_graph', 'edge_regions', 'prepared']
+
+
+def load_tiled_environment(tile_dir: str, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> 'TiledEnvironment':
+    """ loads the index of a tiled environment. the tiles themselves are being loaded on demand
+
+    :param tile_dir: the directory containing the index and the tiles
+    :param memory_budget: the maximal size of all resident tiles in bytes
+    :return: the tiled environment
+    """
+    environment = TiledEnvironment(tile_dir, memory_budget)
+    with open(os.path.join(tile_dir, INDEX_FILE_NAME), 'rb') as f:
+        index = pickle.load(f)
+    for attribute in INDEX_ATTRIBUTES:
+        setattr(environment, attribute, index[attribute])
+    return environment
+
+
+class TiledEnvironment(HierarchicalEnvironment):
+    """ a hierarchical environment keeping its regions ("tiles") on disk
+
+    .. note::
+        the size of the stored tile is being used as estimate of its memory usage
+    """
+
+    def __init__(self, tile_dir: str, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        :param tile_dir: the directory to store the index and the tiles in
+        :param memory_budget: the maximal size of all resident tiles in bytes.
+            the tile required at the moment is always being kept, even if it exceeds the budget on its own
+        """
+        super().__init__()
+        self.tile_dir: str = tile_dir
+        self.memory_budget: int = memory_budget
+        self.tile_files: List[str] = []
+        self.tile_sizes: List[int] = []
+        self.tile_bounds: List[BOUNDS_TYPE] = []
+        # the loaded tiles in the order of their last usage (least recently used first)
+        self.resident_tiles: OrderedDict = OrderedDict()
+        self.resident_size: int = 0
+        self.nr_tile_loads: int = 0
+        os.makedirs(tile_dir, exist_ok=True)
+
+    def add_environment(self, environment: PolygonEnvironment, **prepare_kwargs) -> int:
+        """ prepares the environment (if required) and stores it as a new tile
+
+        :param environment: the environment representing the tile
+        :param prepare_kwargs: keyword arguments passed to ``PolygonEnvironment.prepare()`` of the tile
+            (only being used when the environment is not prepared yet)
+        :return: the index of the tile
+        """
+        if not environment.prepared:
+            environment.prepare(**prepare_kwargs)
+        self.prepared = False
+        tile_idx = self.nr_regions
+        file_name = TILE_FILE_NAME.format(tile_idx)
+        path = os.path.join(self.tile_dir, file_name)
+        with open(path, 'wb') as f:
+            pickle.dump(environment, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        coordinates = environment.boundary_polygon.coordinates
+        x_min, y_min = coordinates.min(axis=0).tolist()
+        x_max, y_max = coordinates.max(axis=0).tolist()
+        self.tile_files.append(file_name)
+        self.tile_sizes.append(os.path.getsize(path))
+        self.tile_bounds.append((x_min, y_min, x_max, y_max))
+        self.region_portals.append([])
+        return tile_idx
+
+    def get_region(self, region_idx: int) -> PolygonEnvironment:
+        """ :return: the tile with the given index, loads it from disk when it is not resident """
+        tile = self.resident_tiles.get(region_idx)
+        if tile is not None:
+            self.resident_tiles.move_to_end(region_idx)
+            return tile
+
+        with open(os.path.join(self.tile_dir, self.tile_files[region_idx]), 'rb') as f:
+            tile = pickle.load(f)
+        self.nr_tile_loads += 1
+        self.resident_tiles[region_idx] = tile
+        self.resident_size += self.tile_sizes[region_idx]
+        self.evict(keep=region_idx)
+        return tile
+
+    def evict(self, keep: Optional[int] = None):
+        """ unloads the least recently used tiles until the resident tiles fit into the memory budget
+
+        :param keep: the index of a tile which must not be evicted
+        """
+        for tile_idx in list(self.resident_tiles.keys()):
+            if self.resident_size <= self.memory_budget:
+                return
+            if tile_idx == keep:
+                continue
+            del self.resident_tiles[tile_idx]
+            self.resident_size -= self.tile_sizes[tile_idx]
+
+    def candidate_regions(self, coordinates: INPUT_COORD_TYPE) -> Iterable[int]:
+        # check the bounding boxes first: does not require loading the tiles
+        x, y = coordinates
+        for tile_idx, (x_min, y_min, x_max, y_max) in enumerate(self.tile_bounds):
+            if x_min <= x <= x_max and y_min <= y <= y_max:
+                yield tile_idx
+
+    def prepare(self):
+        """ computes the distances between the portals of every tile and stores the index
+
+        NOTE: the tiles themselves are already being prepared by ``add_environment()``
+        """
+        super().prepare()
+        self.export_index()
+
+    def export_index(self):
+        index = {attribute: getattr(self, attribute) for attribute in INDEX_ATTRIBUTES}
+        with open(os.path.join(self.tile_dir, INDEX_FILE_NAME), 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,713 @@
+"""
+constrained triangulation of the free space (boundary polygon without the holes)
+
+used for accelerating the visibility computations of query points:
+the triangle containing a query point is being found with a vectorised point location test.
+starting from this triangle the visible region is being explored by expanding through the triangle edges
+while narrowing down the cone of possible lines of sight ("triangular expansion").
+the polygon edges are the edges of the triangulation without neighbouring triangle.
+they block all lines of sight.
+the cost is hence proportional to the visible region instead of the size of the whole map.
+
+the triangulation is being computed by ear clipping (with the holes being connected to the boundary by "bridges")
+followed by edge flips (Lawson) turning it into a constrained Delaunay triangulation (less sliver triangles).
+"""
+from math import hypot
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from extremitypathfinder.helper_classes import Polygon, PolygonVertex, Statistics, Vertex
+
+# relative tolerance for comparing the area of the triangulation with the area of the free space
+AREA_TOLERANCE = 1e-9
+NO_NEIGHBOUR = -1
+
+
+class _RingNode(object):
+    """ a vertex of the (doubly linked) polygon ring being clipped """
+    __slots__ = ['i', 'x', 'y', 'prev', 'next']
+
+    def __init__(self, i, x, y):
+        self.i: int = i  # the index of the vertex
+        self.x: float = x
+        self.y: float = y
+        self.prev: Optional[_RingNode] = None
+        self.next: Optional[_RingNode] = None
+
+
+# ear clipping helpers
+# NOTE: "area" is the negative doubled signed area of the triangle p,q,r: < 0 for a left turn (counter clockwise)
+def _area(p, q, r) -> float:
+    return (q.y - p.y) * (r.x - q.x) - (q.x - p.x) * (r.y - q.y)
+
+
+def _equals(p1, p2) -> bool:
+    return p1.x == p2.x and p1.y == p2.y
+
+
+def _sign(value) -> int:
+    return (value > 0) - (value < 0)
+
+
+def _point_in_triangle(ax, ay, bx, by, cx, cy, px, py) -> bool:
+    # borders included
+    if (cx - px) * (ay - py) < (ax - px) * (cy - py):
+        return False
+    if (ax - px) * (by - py) < (bx - px) * (ay - py):
+        return False
+    return (bx - px) * (cy - py) >= (cx - px) * (by - py)
+
+
+def _on_segment(p, q, r) -> bool:
+    # q lies within the bounding box of p and r
+    return min(p.x, r.x) <= q.x <= max(p.x, r.x) and min(p.y, r.y) <= q.y <= max(p.y, r.y)
+
+
+def _intersects(p1, q1, p2, q2) -> bool:
+    o1 = _sign(_area(p1, q1, p2))
+    o2 = _sign(_area(p1, q1, q2))
+    o3 = _sign(_area(p2, q2, p1))
+    o4 = _sign(_area(p2, q2, q1))
+    if o1 != o2 and o3 != o4:
+        return True
+    # collinear cases
+    if (o1 == 0 and _on_segment(p1, p2, q1)) or (o2 == 0 and _on_segment(p1, q2, q1)):
+        return True
+    return (o3 == 0 and _on_segment(p2, p1, q2)) or (o4 == 0 and _on_segment(p2, q1, q2))
+
+
+def _insert_node(i, x, y, last: Optional[_RingNode]) -> _RingNode:
+    node = _RingNode(i, x, y)
+    if last is None:
+        node.prev = node
+        node.next = node
+    else:
+        node.next = last.next
+        node.prev = last
+        last.next.prev = node
+        last.next = node
+    return node
+
+
+def _remove_node(node: _RingNode):
+    node.next.prev = node.prev
+    node.prev.next = node.next
+
+
+def _linked_ring(indices, xs, ys) -> _RingNode:
+    last = None
+    for i in indices:
+        last = _insert_node(i, xs[i], ys[i], last)
+    return last
+
+
+def _is_removable(node: _RingNode, remove_collinear: bool) -> bool:
+    if _equals(node, node.next):
+        return True
+    if _area(node.prev, node, node.next) != 0:
+        return False
+    if remove_collinear:
+        return True
+    # spike: the ring turns back
+    return (node.x - node.prev.x) * (node.next.x - node.x) + (node.y - node.prev.y) * (node.next.y - node.y) < 0
+
+
+def _filter_points(start: _RingNode, end: Optional[_RingNode] = None, remove_collinear: bool = False) -> _RingNode:
+    """ removes duplicate vertices and spikes from the ring
+
+    NOTE: collinear vertices (inner angle of 180 degree) are never extremities.
+    they are not required for the triangulation and would only create degenerate lines of sight.
+    they may however only be removed before the clipping (and bridging) started:
+    when the same vertex is still part of a triangle or the ring (bridges!),
+    it would lie on an edge of a triangle created later on.
+    the triangles would then not share their edges with their neighbours.
+
+    :param remove_collinear: whether straight vertices should also be removed
+    """
+    if end is None:
+        end = start
+    node = start
+    while True:
+        again = False
+        if _is_removable(node, remove_collinear):
+            _remove_node(node)
+            node = end = node.prev
+            if node is node.next:
+                break
+            again = True
+        else:
+            node = node.next
+        if not again and node is end:
+            break
+    return end
+
+
+def _locally_inside(a: _RingNode, b: _RingNode) -> bool:
+    # whether the diagonal a-b lies locally inside the polygon at a
+    if _area(a.prev, a, a.next) < 0:
+        return _area(a, b, a.next) >= 0 and _area(a, a.prev, b) >= 0
+    return _area(a, b, a.prev) < 0 or _area(a, a.next, b) < 0
+
+
+def _middle_inside(a: _RingNode, b: _RingNode) -> bool:
+    # whether the middle point of the diagonal a-b lies inside the polygon
+    node = a
+    inside = False
+    px, py = (a.x + b.x) / 2, (a.y + b.y) / 2
+    while True:
+        n = node.next
+        if (node.y > py) != (n.y > py) and n.y != node.y and px < (n.x - node.x) * (py - node.y) / (
+                n.y - node.y) + node.x:
+            inside = not inside
+        node = n
+        if node is a:
+            return inside
+
+
+def _intersects_polygon(a: _RingNode, b: _RingNode) -> bool:
+    # whether the diagonal a-b intersects any polygon edge
+    node = a
+    while True:
+        n = node.next
+        if node.i != a.i and n.i != a.i and node.i != b.i and n.i != b.i and _intersects(node, n, a, b):
+            return True
+        node = n
+        if node is a:
+            return False
+
+
+def _is_valid_diagonal(a: _RingNode, b: _RingNode) -> bool:
+    if a.next.i == b.i or a.prev.i == b.i or _intersects_polygon(a, b):
+        return False
+    if _locally_inside(a, b) and _locally_inside(b, a) and _middle_inside(a, b):
+        if _area(a.prev, a, b.prev) != 0 or _area(a, b.prev, b) != 0:
+            return True
+    # special zero length case
+    return _equals(a, b) and _area(a.prev, a, a.next) > 0 and _area(b.prev, b, b.next) > 0
+
+
+def _split_ring(a: _RingNode, b: _RingNode) -> _RingNode:
+    """ connects a and b with a diagonal, splitting the ring into two (or merging two rings into one)
+
+    :return: the copy of b in the second ring
+    """
+    a2 = _RingNode(a.i, a.x, a.y)
+    b2 = _RingNode(b.i, b.x, b.y)
+    an = a.next
+    bp = b.prev
+    a.next = b
+    b.prev = a
+    a2.next = an
+    an.prev = a2
+    b2.next = a2
+    a2.prev = b2
+    bp.next = b2
+    b2.prev = bp
+    return b2
+
+
+def _leftmost(start: _RingNode) -> _RingNode:
+    node = start
+    leftmost = start
+    while True:
+        if node.x < leftmost.x or (node.x == leftmost.x and node.y < leftmost.y):
+            leftmost = node
+        node = node.next
+        if node is start:
+            return leftmost
+
+
+def _sector_contains_sector(m: _RingNode, p: _RingNode) -> bool:
+    return _area(m.prev, m, p.prev) < 0 and _area(p.next, m, m.next) < 0
+
+
+def _find_hole_bridge(hole: _RingNode, outer: _RingNode) -> Optional[_RingNode]:
+    """ finds a vertex of the outer ring which can be connected with the leftmost hole vertex
+
+    casts a ray from the hole vertex to the left and takes the closest edge being hit
+    """
+    hx, hy = hole.x, hole.y
+    qx = -np.inf
+    m = None
+    node = outer
+    while True:
+        n = node.next
+        # only edges facing the hole (running downwards)
+        if node.y >= hy >= n.y and n.y != node.y:
+            x = node.x + (hy - node.y) * (n.x - node.x) / (n.y - node.y)
+            if qx < x <= hx:
+                qx = x
+                m = node if node.x < n.x else n
+                if x == hx:
+                    # the hole touches the edge
+                    return m
+        node = n
+        if node is outer:
+            break
+    if m is None:
+        return None
+
+    # vertices inside the triangle (hole vertex, intersection point, m) might block the connection
+    # choose the vertex with the smallest angle to the ray
+    stop = m
+    mx, my = m.x, m.y
+    tan_min = np.inf
+    node = m
+    while True:
+        if hx >= node.x >= mx and hx != node.x and _point_in_triangle(
+                hx if hy < my else qx, hy, mx, my, qx if hy < my else hx, hy, node.x, node.y):
+            tan = abs(hy - node.y) / (hx - node.x)
+            if _locally_inside(node, hole) and (tan < tan_min or (tan == tan_min and (
+                    node.x > m.x or (node.x == m.x and _sector_contains_sector(m, node))))):
+                m = node
+                tan_min = tan
+        node = node.next
+        if node is stop:
+            return m
+
+
+def _eliminate_holes(outer: _RingNode, holes: List[_RingNode]) -> _RingNode:
+    """ merges the holes into the outer ring by connecting them with "bridges" (from left to right) """
+    for hole in sorted((_leftmost(h) for h in holes), key=lambda n: (n.x, n.y)):
+        bridge = _find_hole_bridge(hole, outer)
+        if bridge is None:
+            raise ValueError('the hole could not be connected to the boundary polygon')
+        bridge_reverse = _split_ring(bridge, hole)
+        _filter_points(bridge_reverse, bridge_reverse.next)
+        outer = _filter_points(bridge, bridge.next)
+    return outer
+
+
+def _on_diagonal(a: _RingNode, c: _RingNode, p: _RingNode) -> bool:
+    # p lies on the segment a-c, but not on its end points
+    return _area(a, p, c) == 0 and not (_equals(p, a) or _equals(p, c)) and _on_segment(a, p, c)
+
+
+def _is_ear(ear: _RingNode) -> bool:
+    a, b, c = ear.prev, ear, ear.next
+    if _area(a, b, c) >= 0:
+        # reflex, can't be an ear
+        return False
+    # no other (reflex) vertex must lie inside the triangle
+    # IMPORTANT: also no vertex on the new diagonal (would create a triangle edge not shared with the neighbours)
+    node = c.next
+    while node is not a:
+        if _point_in_triangle(a.x, a.y, b.x, b.y, c.x, c.y, node.x, node.y) and (
+                _area(node.prev, node, node.next) >= 0 or _on_diagonal(a, c, node)):
+            return False
+        node = node.next
+    return True
+
+
+def _cure_local_intersections(start: _RingNode, triangles: list) -> _RingNode:
+    node = start
+    while True:
+        a = node.prev
+        b = node.next.next
+        if not _equals(a, b) and _intersects(a, node, node.next, b) and _locally_inside(a, b) and _locally_inside(
+                b, a):
+            triangles.append((a.i, node.i, b.i))
+            _remove_node(node)
+            _remove_node(node.next)
+            node = start = b
+        node = node.next
+        if node is start:
+            break
+    return _filter_points(node)
+
+
+def _split_clip(start: _RingNode, triangles: list):
+    # look for a valid diagonal dividing the ring into two and clip them separately
+    a = start
+    while True:
+        b = a.next.next
+        while b is not a.prev:
+            if a.i != b.i and _is_valid_diagonal(a, b):
+                c = _split_ring(a, b)
+                a = _filter_points(a, a.next)
+                c = _filter_points(c, c.next)
+                _clip_ears(a, triangles)
+                _clip_ears(c, triangles)
+                return
+            b = b.next
+        a = a.next
+        if a is start:
+            raise ValueError('the polygon could not be triangulated')
+
+
+def _clip_ears(ear: _RingNode, triangles: list, clipping_pass: int = 0):
+    stop = ear
+    while ear.prev is not ear.next:
+        prev = ear.prev
+        next = ear.next
+        if _is_ear(ear):
+            triangles.append((prev.i, ear.i, next.i))
+            _remove_node(ear)
+            ear = next.next
+            stop = next.next
+            continue
+
+        ear = next
+        if ear is stop:
+            # no ears found anymore. try to recover:
+            if clipping_pass == 0:
+                _clip_ears(_filter_points(ear), triangles, 1)
+            elif clipping_pass == 1:
+                _clip_ears(_cure_local_intersections(_filter_points(ear), triangles), triangles, 2)
+            else:
+                _split_clip(ear, triangles)
+            return
+
+
+def ear_clipping(xs: List[float], ys: List[float], boundary_indices: List[int],
+                 list_of_hole_indices: List[List[int]]) -> List[Tuple[int, int, int]]:
+    """ triangulates a polygon with holes by ear clipping
+
+    :param xs: the x coordinates of all vertices
+    :param ys: the y coordinates of all vertices
+    :param boundary_indices: the indices of the vertices of the boundary polygon (counter clockwise)
+    :param list_of_hole_indices: the indices of the vertices of every hole (clockwise)
+    :return: a list of counter clockwise triangles (vertex indices)
+    """
+    outer = _filter_points(_linked_ring(boundary_indices, xs, ys), remove_collinear=True)
+    holes = [_filter_points(_linked_ring(indices, xs, ys), remove_collinear=True) for indices in list_of_hole_indices]
+    outer = _eliminate_holes(outer, holes)
+    triangles = []
+    _clip_ears(outer, triangles)
+    return triangles
+
+
+def _cross(x1, y1, x2, y2) -> float:
+    return x1 * y2 - y1 * x2
+
+
+def _orientation(xs, ys, a, b, c) -> float:
+    # > 0: counter clockwise
+    return _cross(xs[b] - xs[a], ys[b] - ys[a], xs[c] - xs[a], ys[c] - ys[a])
+
+
+def _in_circle(xs, ys, a, b, c, d) -> bool:
+    """ :return: whether d lies strictly inside the circumcircle of the counter clockwise triangle a,b,c """
+    adx, ady = xs[a] - xs[d], ys[a] - ys[d]
+    bdx, bdy = xs[b] - xs[d], ys[b] - ys[d]
+    cdx, cdy = xs[c] - xs[d], ys[c] - ys[d]
+    a_term = (adx * adx + ady * ady) * _cross(bdx, bdy, cdx, cdy)
+    b_term = (bdx * bdx + bdy * bdy) * _cross(adx, ady, cdx, cdy)
+    c_term = (cdx * cdx + cdy * cdy) * _cross(adx, ady, bdx, bdy)
+    return a_term - b_term + c_term > 0
+
+
+def find_neighbours(triangles: List[List[int]]) -> Tuple[List[List[int]], List[List[int]]]:
+    """ finds the neighbouring triangles sharing an edge
+
+    the edge k of a triangle runs from its vertex k to its vertex k+1
+
+    :return: for every triangle and edge the index of the neighbouring triangle (-1: polygon edge)
+        and the index of the same edge in the neighbouring triangle
+    """
+    edge2triangle: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    for t, triangle in enumerate(triangles):
+        for k in range(3):
+            edge = (triangle[k], triangle[(k + 1) % 3])
+            if edge in edge2triangle:
+                raise ValueError('invalid triangulation: the edge {} is contained twice'.format(edge))
+            edge2triangle[edge] = (t, k)
+
+    neighbours = [[NO_NEIGHBOUR] * 3 for _ in triangles]
+    neighbour_edges = [[NO_NEIGHBOUR] * 3 for _ in triangles]
+    for (i, j), (t, k) in edge2triangle.items():
+        # the neighbouring triangle contains the edge in reverse direction
+        try:
+            t2, k2 = edge2triangle[(j, i)]
+        except KeyError:
+            continue
+        neighbours[t][k] = t2
+        neighbour_edges[t][k] = k2
+    return neighbours, neighbour_edges
+
+
+def make_delaunay(xs, ys, triangles: List[List[int]], neighbours: List[List[int]],
+                  neighbour_edges: List[List[int]]):
+    """ flips the (non polygon) edges until the triangulation fulfills the constrained Delaunay condition
+
+    works in place
+    """
+
+    def set_neighbour(t, k, t2, k2):
+        neighbours[t][k] = t2
+        neighbour_edges[t][k] = k2
+        if t2 != NO_NEIGHBOUR:
+            neighbours[t2][k2] = t
+            neighbour_edges[t2][k2] = k
+
+    edges_to_check = [(t, k) for t in range(len(triangles)) for k in range(3) if neighbours[t][k] > t]
+    while edges_to_check:
+        t1, k1 = edges_to_check.pop()
+        t2 = neighbours[t1][k1]
+        if t2 == NO_NEIGHBOUR:
+            continue
+        k2 = neighbour_edges[t1][k1]
+        # the triangles (a,b,c) and (b,a,d) share the edge a-b
+        a, b, c = triangles[t1][k1], triangles[t1][(k1 + 1) % 3], triangles[t1][(k1 + 2) % 3]
+        d = triangles[t2][(k2 + 2) % 3]
+        if not _in_circle(xs, ys, a, b, c, d):
+            continue
+        # the flipped triangles must be valid (degenerate cases with identical coordinates)
+        if _orientation(xs, ys, a, d, c) <= 0 or _orientation(xs, ys, d, b, c) <= 0:
+            continue
+
+        # outer edges and their neighbours: b-c, c-a of t1 and a-d, d-b of t2
+        n_bc = (neighbours[t1][(k1 + 1) % 3], neighbour_edges[t1][(k1 + 1) % 3])
+        n_ca = (neighbours[t1][(k1 + 2) % 3], neighbour_edges[t1][(k1 + 2) % 3])
+        n_ad = (neighbours[t2][(k2 + 1) % 3], neighbour_edges[t2][(k2 + 1) % 3])
+        n_db = (neighbours[t2][(k2 + 2) % 3], neighbour_edges[t2][(k2 + 2) % 3])
+        # flip the edge a-b to c-d: t1 = (c,a,d), t2 = (d,b,c)
+        triangles[t1] = [c, a, d]
+        triangles[t2] = [d, b, c]
+        set_neighbour(t1, 0, *n_ca)
+        set_neighbour(t1, 1, *n_ad)
+        set_neighbour(t1, 2, t2, 2)
+        set_neighbour(t2, 0, *n_db)
+        set_neighbour(t2, 1, *n_bc)
+        edges_to_check.extend([(t1, 0), (t1, 1), (t2, 0), (t2, 1)])
+
+
+def find_regions(xs, ys, triangles: List[List[int]], neighbours: List[List[int]]) -> List[int]:
+    """ labels the connected regions of the free space covered by the triangles
+
+    triangles sharing an edge, a vertex (coordinates) or touching in a vertex lying on a polygon edge
+    belong to the same region: paths are allowed to pass through points where polygons touch
+
+    :return: the index of the region of every triangle
+    """
+    # union find
+    parents = list(range(len(triangles)))
+
+    def find(t):
+        while parents[t] != t:
+            parents[t] = parents[parents[t]]
+            t = parents[t]
+        return t
+
+    def union(t1, t2):
+        r1, r2 = find(t1), find(t2)
+        if r1 != r2:
+            parents[max(r1, r2)] = min(r1, r2)
+
+    vertex2triangle: Dict[Tuple[float, float], int] = {}
+    for t, (triangle, triangle_neighbours) in enumerate(zip(triangles, neighbours)):
+        for t2 in triangle_neighbours:
+            if t2 != NO_NEIGHBOUR:
+                union(t, t2)
+        for i in triangle:
+            union(t, vertex2triangle.setdefault((xs[i], ys[i]), t))
+
+    # vertices lying within polygon edges (not on their ends)
+    points = np.array(list(vertex2triangle.keys()), dtype=float).reshape(-1, 2)
+    point_triangles = list(vertex2triangle.values())
+    for t, (triangle, triangle_neighbours) in enumerate(zip(triangles, neighbours)):
+        for k in range(3):
+            if triangle_neighbours[k] != NO_NEIGHBOUR:
+                continue
+            i, j = triangle[k], triangle[(k + 1) % 3]
+            dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+            px, py = points[:, 0] - xs[i], points[:, 1] - ys[i]
+            projections = px * dx + py * dy
+            on_edge = (px * dy - py * dx == 0.0) & (projections > 0.0) & (projections < dx * dx + dy * dy)
+            for p in np.nonzero(on_edge)[0]:
+                union(t, point_triangles[p])
+
+    # consecutive region indices
+    region_indices: Dict[int, int] = {}
+    return [region_indices.setdefault(find(t), len(region_indices)) for t in range(len(triangles))]
+
+
+def _polygon_area(coordinates: np.ndarray) -> float:
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    return abs(0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def _polygon_perimeter(coordinates: np.ndarray) -> float:
+    return float(np.linalg.norm(coordinates - np.roll(coordinates, -1, axis=0), axis=1).sum())
+
+
+class Triangulation(object):
+    """ a constrained (Delaunay) triangulation of the free space for computing the visibility of query points """
+    __slots__ = ['vertices', 'xs', 'ys', 'triangles', 'neighbours', 'neighbour_edges', 'nodes', 'corners', 'regions']
+
+    def __init__(self, boundary_polygon: Polygon, holes: List[Polygon], nodes: Dict[tuple, Vertex]):
+        """
+        :param boundary_polygon: the boundary polygon of the environment
+        :param holes: the holes of the environment
+        :param nodes: a mapping of the coordinates to the nodes of the visibility graph
+
+        :raises ValueError: when the triangulation failed
+        """
+        self.vertices: List[PolygonVertex] = []
+        polygon_indices = []
+        for polygon in [boundary_polygon] + holes:
+            polygon_indices.append(list(range(len(self.vertices), len(self.vertices) + len(polygon.vertices))))
+            self.vertices.extend(polygon.vertices)
+        coordinates = np.array([v.coordinates for v in self.vertices], dtype=float)
+        self.xs: List[float] = coordinates[:, 0].tolist()
+        self.ys: List[float] = coordinates[:, 1].tolist()
+
+        self.triangles: List[List[int]] = [list(t) for t in
+                                           ear_clipping(self.xs, self.ys, polygon_indices[0], polygon_indices[1:])]
+        self.neighbours, self.neighbour_edges = find_neighbours(self.triangles)
+        self.validate(boundary_polygon, holes)
+        make_delaunay(self.xs, self.ys, self.triangles, self.neighbours, self.neighbour_edges)
+
+        # the graph node with the coordinates of every vertex (None: the vertex is not an extremity)
+        self.nodes: List[Optional[Vertex]] = [nodes.get(tuple(c)) for c in coordinates.tolist()]
+        # the corner coordinates of all triangles for the vectorised point location
+        triangles = np.array(self.triangles, dtype=int)
+        self.corners: np.ndarray = coordinates[triangles]  # shape: (nr triangles, 3 corners, 2)
+        # the connected region of the free space every triangle belongs to
+        self.regions: List[int] = find_regions(self.xs, self.ys, self.triangles, self.neighbours)
+
+    def validate(self, boundary_polygon: Polygon, holes: List[Polygon]):
+        """ the triangles must cover exactly the free space and neighbouring triangles must share their edges
+
+        then the edges without neighbouring triangle are exactly the polygon edges
+
+        :raises ValueError: when the triangulation is invalid
+        """
+        xs, ys = self.xs, self.ys
+        area = 0.0
+        border_length = 0.0
+        for triangle, neighbours in zip(self.triangles, self.neighbours):
+            triangle_area = _orientation(xs, ys, *triangle)
+            if triangle_area <= 0.0:
+                raise ValueError('invalid triangulation: triangle {} is not counter clockwise'.format(triangle))
+            area += 0.5 * triangle_area
+            for k in range(3):
+                if neighbours[k] == NO_NEIGHBOUR:
+                    i, j = triangle[k], triangle[(k + 1) % 3]
+                    border_length += hypot(xs[j] - xs[i], ys[j] - ys[i])
+
+        polygons = [boundary_polygon] + holes
+        free_area = _polygon_area(boundary_polygon.coordinates) - sum(_polygon_area(h.coordinates) for h in holes)
+        if abs(area - free_area) > AREA_TOLERANCE * max(free_area, 1.0):
+            raise ValueError('invalid triangulation: covered area {} does not match the free space {}'.format(
+                area, free_area))
+        perimeter = sum(_polygon_perimeter(p.coordinates) for p in polygons)
+        if abs(border_length - perimeter) > AREA_TOLERANCE * max(perimeter, 1.0):
+            raise ValueError('invalid triangulation: length of the unshared triangle edges {} does not match '
+                             'the length of the polygon edges {}'.format(border_length, perimeter))
+
+    def locate(self, coordinates) -> Optional[Tuple[int, ...]]:
+        """ finds the triangle containing the given point
+
+        :param coordinates: the (x,y) coordinates of the point
+        :return: the index of the triangle containing the point, the indices of both triangles
+            when the point lies on their common edge or None in all other (degenerate) cases:
+            the point lies outside of the free space, on a polygon edge or on a vertex
+        """
+        x, y = coordinates
+        a, b, c = self.corners[:, 0], self.corners[:, 1], self.corners[:, 2]
+        # orientation of the point relative to all triangle edges (>= 0: on the inner side)
+        o_ab = (b[:, 0] - a[:, 0]) * (y - a[:, 1]) - (b[:, 1] - a[:, 1]) * (x - a[:, 0])
+        o_bc = (c[:, 0] - b[:, 0]) * (y - b[:, 1]) - (c[:, 1] - b[:, 1]) * (x - b[:, 0])
+        o_ca = (a[:, 0] - c[:, 0]) * (y - c[:, 1]) - (a[:, 1] - c[:, 1]) * (x - c[:, 0])
+        orientations = np.column_stack((o_ab, o_bc, o_ca))
+        containing = np.nonzero((orientations >= 0.0).all(axis=1))[0]
+        if len(containing) == 1:
+            t = int(containing[0])
+            if (orientations[t] > 0.0).all():
+                return t,
+            return None
+        if len(containing) == 2:
+            t1, t2 = int(containing[0]), int(containing[1])
+            on_edge = np.nonzero(orientations[t1] == 0.0)[0]
+            if len(on_edge) == 1 and self.neighbours[t1][on_edge[0]] == t2:
+                return t1, t2
+        return None
+
+    def same_region(self, triangle1: int, triangle2: int) -> bool:
+        """ :return: whether the two triangles lie in a connected region of the free space """
+        return self.regions[triangle1] == self.regions[triangle2]
+
+    def find_visible(self, query_coordinates, query_triangles: Tuple[int, ...], other_vertex: Optional[Vertex] = None,
+                     other_triangles: Tuple[int, ...] = (),
+                     statistics: Optional[Statistics] = None) -> Set[Tuple[Vertex, float]]:
+        """ finds all graph nodes visible from the query point by triangular expansion
+
+        :param query_coordinates: the (x,y) coordinates of the query point
+        :param query_triangles: the located triangles of the query point (refer to ``locate()``)
+        :param other_vertex: another (query) vertex to check the visibility of
+        :param other_triangles: the located triangles of the other vertex
+        :param statistics: the statistics to record the amount of expanded triangles in
+        :return: a set of tuples of all visible graph nodes (and the other vertex) and their distance
+        """
+        qx, qy = map(float, query_coordinates)
+        xs, ys = self.xs, self.ys
+        triangles, neighbours, neighbour_edges = self.triangles, self.neighbours, self.neighbour_edges
+        visible_vertices: Set[int] = set()
+        other_visible = False
+        if other_vertex is not None:
+            ox, oy = other_vertex.coordinates
+            ox, oy = float(ox) - qx, float(oy) - qy
+            # convex triangles: every point of a triangle containing the query point is visible
+            other_visible = len(set(query_triangles) & set(other_triangles)) > 0
+
+        # the lines of sight leaving through the triangle edges: (triangle, edge in triangle, right and left border)
+        stack = []
+        for t in query_triangles:
+            triangle = triangles[t]
+            visible_vertices.update(triangle)
+            for k in range(3):
+                t2 = neighbours[t][k]
+                if t2 == NO_NEIGHBOUR or t2 in query_triangles:
+                    continue
+                # counter clockwise triangle: the query point lies on the left of the edge
+                i, j = triangle[k], triangle[(k + 1) % 3]
+                stack.append((t2, neighbour_edges[t][k], xs[i] - qx, ys[i] - qy, xs[j] - qx, ys[j] - qy))
+
+        nr_expanded = 0
+        while stack:
+            t, k, rx, ry, lx, ly = stack.pop()
+            nr_expanded += 1
+            triangle = triangles[t]
+            # the vertex opposite of the entry edge
+            c = triangle[(k + 2) % 3]
+            cx, cy = xs[c] - qx, ys[c] - qy
+            # strictly within the cone of sight
+            # NOTE: vertices on the borders lie behind the vertex defining the border and are not visible
+            if _cross(rx, ry, cx, cy) > 0.0 and _cross(cx, cy, lx, ly) > 0.0:
+                visible_vertices.add(c)
+            if not other_visible and t in other_triangles and _cross(rx, ry, ox, oy) > 0.0 and _cross(
+                    ox, oy, lx, ly) > 0.0:
+                other_visible = True
+
+            for k_exit in ((k + 1) % 3, (k + 2) % 3):
+                t2 = neighbours[t][k_exit]
+                if t2 == NO_NEIGHBOUR:
+                    # polygon edge: blocks the sight
+                    continue
+                i, j = triangle[k_exit], triangle[(k_exit + 1) % 3]
+                ix, iy, jx, jy = xs[i] - qx, ys[i] - qy, xs[j] - qx, ys[j] - qy
+                orientation = _cross(ix, iy, jx, jy)
+                if orientation == 0.0:
+                    # the edge is being seen edge on
+                    continue
+                if orientation < 0.0:
+                    ix, iy, jx, jy = jx, jy, ix, iy
+                # narrow down the cone to the edge
+                rx2, ry2 = (ix, iy) if _cross(rx, ry, ix, iy) > 0.0 else (rx, ry)
+                lx2, ly2 = (jx, jy) if _cross(lx, ly, jx, jy) < 0.0 else (lx, ly)
+                if _cross(rx2, ry2, lx2, ly2) > 0.0:
+                    stack.append((t2, neighbour_edges[t][k_exit], rx2, ry2, lx2, ly2))
+
+        if statistics is not None:
+            statistics.triangles_expanded += nr_expanded
+
+        visibles_n_distances = set()
+        for i in visible_vertices:
+            node = self.nodes[i]
+            if node is not None:
+                visibles_n_distances.add((node, hypot(xs[i] - qx, ys[i] - qy)))
+        if other_visible:
+            visibles_n_distances.add((other_vertex, hypot(ox, oy)))
+        return visibles_n_distances
@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from extremitypathfinder.command_line import QueryServer, main
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from test_main import POLY_ENV_PARAMS
+
+QUERIES = [((1, 1), (8, 8)), ((9, 4), (9, 6)), ((1, 1), (1, 1)), ((0.5, 9.5), (9.5, 0.5))]
+# inside the hole
+INVALID_QUERY = ((4, 7), (9, 6))
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.environment = PolygonEnvironment()
+        self.environment.store(*POLY_ENV_PARAMS)
+        self.environment.prepare()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    def check_results(self, result_path, queries):
+        with open(result_path) as f:
+            results = [json.loads(line) for line in f]
+        self.check_result_list(results, queries)
+
+    def check_result_list(self, results, queries):
+        assert len(results) == len(queries)
+        for (start, goal), result in zip(queries, results):
+            assert result['start'] == list(start) and result['goal'] == list(goal)
+            if (start, goal) == INVALID_QUERY:
+                assert 'error' in result
+                continue
+            expected_path, expected_length = self.environment.find_shortest_path(start, goal)
+            assert result['path'] == [list(c) for c in expected_path]
+            assert result['length'] == pytest.approx(expected_length)
+
+    def test_prepare(self):
+        boundary, holes = POLY_ENV_PARAMS
+        with open(self.path('map.json'), 'w') as f:
+            json.dump({'boundary': boundary, 'holes': holes}, f)
+        with open(self.path('map.ndjson'), 'w') as f:
+            f.write(json.dumps({'boundary': boundary}) + '\n')
+            for hole in holes:
+                f.write(json.dumps({'hole': hole}) + '\n')
+
+        for map_file in ['map.json', 'map.ndjson']:
+            assert main(['prepare', self.path(map_file), '--output', self.path('env.pickle'), '--triangulate']) == 0
+            with open(self.path('queries.ndjson'), 'w') as f:
+                f.write(json.dumps({'start': [1, 1], 'goal': [8, 8]}) + '\n')
+            assert main(['query', self.path('env.pickle'), self.path('queries.ndjson'),
+                         '--output', self.path('results.ndjson'), '--processes', '1']) == 0
+            self.check_results(self.path('results.ndjson'), [((1, 1), (8, 8))])
+
+    def test_query(self):
+        self.environment.export_pickle(self.path('env.pickle'))
+        queries = QUERIES * 3 + [INVALID_QUERY] + QUERIES
+        with open(self.path('queries.ndjson'), 'w') as f:
+            for start, goal in queries:
+                f.write(json.dumps({'start': start, 'goal': goal}) + '\n')
+        with open(self.path('queries.csv'), 'w') as f:
+            f.write('start_x,start_y,goal_x,goal_y\n')
+            for start, goal in queries:
+                f.write(','.join(map(str, start + goal)) + '\n')
+
+        for query_file in ['queries.ndjson', 'queries.csv']:
+            for nr_processes in [1, 2]:
+                assert main(['query', self.path('env.pickle'), self.path(query_file),
+                             '--output', self.path('results.ndjson'), '--processes', str(nr_processes),
+                             '--chunk-size', '3']) == 0
+                self.check_results(self.path('results.ndjson'), queries)
+
+    def test_serve(self):
+        self.environment.export_pickle(self.path('env.pickle'))
+        server = QueryServer({'poly': self.path('env.pickle')}, ('127.0.0.1', 0), nr_processes=2, chunk_size=3)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+        def request(path, body=None):
+            data = None if body is None else json.dumps(body).encode()
+            with urlopen(url + path, data=data) as response:
+                return json.loads(response.read())
+
+        try:
+            assert request('/environments') == {'environments': ['poly']}
+            queries = QUERIES * 3 + [INVALID_QUERY]
+            response = request('/query', {'environment': 'poly',
+                                          'queries': [{'start': start, 'goal': goal} for start, goal in queries]})
+            self.check_result_list(response['results'], queries)
+            # single query, the environment is optional with a single environment
+            start, goal = QUERIES[0]
+            self.check_result_list([request('/query', {'start': start, 'goal': goal})], [QUERIES[0]])
+
+            for path, body, status in [('/query', {'environment': 'unknown', 'start': start, 'goal': goal}, 400),
+                                       ('/query', {'start': start}, 400),
+                                       ('/query', {'start': [1, 2, 3], 'goal': goal}, 400),
+                                       ('/unknown', None, 404)]:
+                with pytest.raises(HTTPError) as error:
+                    request(path, body)
+                assert error.value.code == status
+                assert 'error' in json.loads(error.value.read())
+                error.value.close()
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
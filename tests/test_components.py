@@ -0,0 +1,97 @@
+import unittest
+
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.helper_classes import DirectedHeuristicGraph, Vertex
+from extremitypathfinder.triangulation import find_neighbours, find_regions
+from test_main import GRID_ENV_PARAMS, POLY_ENV_PARAMS
+from test_triangulation import random_points, store_functions
+
+NR_RANDOM_QUERIES = 20
+
+
+class ComponentsTest(unittest.TestCase):
+
+    def test_graph_components(self):
+        graph = DirectedHeuristicGraph()
+        v1, v2, v3, v4, v5 = [Vertex((float(i), 0.0)) for i in range(5)]
+        graph.add_undirected_edge(v1, v2, 1.0)
+        # a single direction connects the nodes as well
+        graph.add_directed_edge(v3, v2, 1.0)
+        graph.add_undirected_edge(v4, v5, 1.0)
+        components = graph.find_components()
+        assert components == {v1: 0, v2: 0, v3: 0, v4: 1, v5: 1}
+
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        components = environment.node_components
+        assert set(components.keys()) == environment.graph.get_all_nodes()
+        for node1, node2 in environment.graph.distances.keys():
+            assert components[node1] == components[node2]
+        # a lazy graph does not know its edges
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare(lazy=True)
+        assert environment.node_components is None
+
+    def test_regions(self):
+        # two separate triangles, one triangle touching the second in a vertex,
+        # one triangle touching the second with a vertex on its edge
+        xs = [0.0, 1.0, 0.0, 5.0, 7.0, 5.0, 7.0, 8.0, 8.0, 6.0, 5.0, 6.0]
+        ys = [0.0, 0.0, 1.0, 0.0, 0.0, 2.0, 0.0, 0.0, 1.0, 1.0, 3.0, 3.0]
+        triangles = [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9, 11, 10]]
+        neighbours, _ = find_neighbours(triangles)
+        assert find_regions(xs, ys, triangles, neighbours) == [0, 1, 1, 1]
+        # neighbouring triangles
+        triangles = [[0, 1, 2], [3, 4, 5], [5, 4, 11]]
+        neighbours, _ = find_neighbours(triangles)
+        assert find_regions(xs, ys, triangles, neighbours) == [0, 1, 1]
+
+    def test_queries(self):
+        # the results have to be identical with the labels and without
+        for store_fct in store_functions():
+            environment = PolygonEnvironment()
+            store_fct(environment)
+            environment.prepare(triangulate=True)
+            assert set(environment.triangulation.regions) == {0}
+            points = random_points(environment, 2 * NR_RANDOM_QUERIES)
+            for start, goal in zip(points[::2], points[1::2]):
+                path, length = environment.find_shortest_path(start, goal)
+                environment.node_components = None
+                environment.triangulation.regions = [0] * len(environment.triangulation.triangles)
+                path2, length2 = environment.find_shortest_path(start, goal)
+                assert path2 == path
+                assert length2 == pytest.approx(length)
+                environment.node_components = environment.graph.find_components()
+                environment.triangulation.regions = find_regions(environment.triangulation.xs,
+                                                                 environment.triangulation.ys,
+                                                                 environment.triangulation.triangles,
+                                                                 environment.triangulation.neighbours)
+
+    def test_unreachable(self):
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare(triangulate=True)
+        start, goal = (1.0, 1.0), (8.0, 8.0)
+        assert environment.find_shortest_path(start, goal)[0] != []
+        # split the free space artificially
+        triangulation = environment.triangulation
+        start_triangle = triangulation.locate(start)[0]
+        triangulation.regions = [int(t == start_triangle) for t in range(len(triangulation.triangles))]
+        path, length, statistics = environment.find_shortest_path(start, goal, return_statistics=True)
+        assert path == [] and length is None
+        # no visibility computations
+        assert 'goal_visibility' not in statistics.timings
+
+        environment = PolygonEnvironment()
+        environment.store_grid_world(*GRID_ENV_PARAMS, simplify=False)
+        environment.prepare()
+        start, goal = (0.5, 0.5), (0.5, 5.5)
+        assert environment.find_shortest_path(start, goal)[0] != []
+        # every node in a separate component: there is no path through the graph
+        environment.node_components = {n: i for i, n in enumerate(environment.graph.get_all_nodes())}
+        path, length, statistics = environment.find_shortest_path(start, goal, return_statistics=True)
+        assert path == [] and length is None
+        assert 'search' not in statistics.timings and 'graph_copy' not in statistics.timings
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from test_main import POLY_ENV_PARAMS, TEST_DATA_POLY_ENV
+from test_triangulation import random_points, store_functions
+
+pytest.importorskip('scipy')
+from extremitypathfinder.csgraph import CSGraphEnvironment, graph_to_csr  # noqa: E402
+
+NR_RANDOM_QUERIES = 10
+
+
+def path_length(path):
+    return float(np.linalg.norm(np.diff(np.array(path, dtype=float), axis=0), axis=1).sum())
+
+
+class CSGraphTest(unittest.TestCase):
+
+    def test_export(self):
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        graph = environment.graph
+        matrix, nodes = graph_to_csr(graph)
+        assert matrix.shape == (len(nodes), len(nodes)) and matrix.nnz == len(graph.distances)
+        assert set(nodes) == graph.get_all_nodes()
+        # stable order
+        assert [tuple(n.coordinates) for n in nodes] == sorted(tuple(n.coordinates) for n in nodes)
+        for (node1, node2), distance in graph.distances.items():
+            assert matrix[nodes.index(node1), nodes.index(node2)] == distance
+
+        backend = CSGraphEnvironment(environment)
+        distances = backend.graph_distances()
+        for node in nodes:
+            expected = graph.dijkstra(node)
+            for node2 in nodes:
+                distance = distances[backend.node_indices[node], backend.node_indices[node2]]
+                if node2 in expected:
+                    assert distance == pytest.approx(expected[node2])
+                else:
+                    assert np.isinf(distance)
+
+        with pytest.raises(ValueError):
+            environment = PolygonEnvironment()
+            environment.store(*POLY_ENV_PARAMS)
+            environment.prepare(lazy=True)
+            CSGraphEnvironment(environment)
+
+    def test_queries(self):
+        # the results have to be identical to the graph search
+        for i, store_fct in enumerate(store_functions()):
+            environment = PolygonEnvironment()
+            store_fct(environment)
+            environment.prepare(triangulate=i % 2 == 1)
+            backend = CSGraphEnvironment(environment)
+            points = random_points(environment, 2 * NR_RANDOM_QUERIES)
+            starts, goals = points[::2], points[1::2]
+            # repeated starts and identical start and goal
+            queries = list(zip(starts, goals)) + [(starts[0], goals[1]), (starts[2], starts[2])]
+            results = backend.find_shortest_paths(queries)
+            lengths = backend.many_to_many(starts, goals + [starts[0]])
+            assert lengths.shape == (len(starts), len(goals) + 1)
+            for (start, goal), (path, length) in zip(queries, results):
+                expected_length = environment.find_shortest_path(start, goal)[1]
+                if expected_length is None:
+                    assert path == [] and length is None
+                    continue
+                assert length == pytest.approx(expected_length)
+                assert path[0] == start and path[-1] == goal
+                assert path_length(path) == pytest.approx(length)
+            for row, start in enumerate(starts):
+                for column, goal in enumerate(goals + [starts[0]]):
+                    expected_length = environment.find_shortest_path(start, goal)[1]
+                    if expected_length is None:
+                        assert np.isinf(lengths[row, column])
+                    else:
+                        assert lengths[row, column] == pytest.approx(expected_length)
+
+        # also the degenerate cases (query points on polygon edges and vertices)
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        backend = CSGraphEnvironment(environment)
+        queries = [query for (start, goal), _ in TEST_DATA_POLY_ENV for query in [(start, goal), (goal, start)]]
+        for (start, goal), (_, length) in zip(queries, backend.find_shortest_paths(queries)):
+            assert length == pytest.approx(environment.find_shortest_path(start, goal)[1])
+
+        assert backend.find_shortest_paths([]) == []
+        with pytest.raises(ValueError):
+            # inside the hole
+            backend.find_shortest_paths([((4, 7), (9, 6))])
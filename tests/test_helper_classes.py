@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 import pytest
 
-from extremitypathfinder.helper_classes import AngleRepresentation
+from extremitypathfinder.helper_classes import AngleRepresentation, SkipList
 from helpers import proto_test_case
 
 
@@ -73,6 +73,25 @@ class HelperClassesTest(unittest.TestCase):
 
         proto_test_case(data, value_test_fct)
 
+    def test_skip_list(self):
+        rng = np.random.RandomState(0)
+        skip_list = SkipList()
+        items = []
+        for value in rng.permutation(200).tolist():
+            skip_list.insert(value, lambda other: other < value)
+            items.append(value)
+            if rng.rand() < 0.3:
+                removed = items.pop(rng.randint(len(items)))
+                skip_list.remove(removed)
+        items.sort()
+        assert len(skip_list) == len(items)
+        for i, item in enumerate(items):
+            below = items[i - 1] if i > 0 else None
+            above = items[i + 1] if i + 1 < len(items) else None
+            assert skip_list.neighbours(item) == (below, above)
+            assert skip_list.first_after(lambda other: other < item) == item
+        assert skip_list.first_after(lambda other: True) is None
+
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(HelperClassesTest)
@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 
 from extremitypathfinder.helper_classes import AngleRepresentation
-from extremitypathfinder.helper_fcts import has_clockwise_numbering, inside_polygon
+from extremitypathfinder.helper_fcts import find_intersecting_edges, has_clockwise_numbering, inside_polygon
 from helpers import proto_test_case
 
 
@@ -86,6 +86,32 @@ class HelperFctsTest(unittest.TestCase):
         ]
         proto_test_case(data, clockwise_test_fct)
 
+    def test_find_intersecting_edges(self):
+        def intersection_test_fct(input):
+            return find_intersecting_edges([np.array(coords) for coords in input])
+
+        boundary = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+        data = [
+            # valid polygons
+            ([boundary], None),
+            ([boundary, [(3.0, 7.0), (5.0, 9.0), (4.6, 7.0), (5.0, 4.0)]], None),
+            # touching polygons (identical vertices) are allowed
+            ([boundary, [(2.0, 2.0), (2.0, 4.0), (4.0, 4.0), (4.0, 2.0)], [(4.0, 4.0), (4.0, 6.0), (6.0, 6.0)]], None),
+            # vertex lying on an edge of another polygon is allowed
+            ([boundary, [(0.0, 5.0), (2.0, 6.0), (2.0, 4.0)]], None),
+
+            # self intersection ("bow tie")
+            ([[(0.0, 0.0), (2.0, 2.0), (2.0, 0.0), (0.0, 2.0)]], ((0, 0), (0, 2))),
+            # intersection with a vertical edge
+            ([[(0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (1.0, 4.0), (1.0, -1.0), (0.0, -1.0)]], ((0, 0), (0, 3))),
+            # hole intersecting the boundary
+            ([boundary, [(8.0, 2.0), (8.0, 4.0), (12.0, 4.0), (12.0, 2.0)]], ((0, 1), (1, 3))),
+            # two holes intersecting each other
+            ([boundary, [(2.0, 2.0), (2.0, 4.0), (4.0, 4.0), (4.0, 2.0)], [(3.0, 3.0), (3.0, 5.0), (5.0, 5.0)]],
+             ((1, 1), (2, 0))),
+        ]
+        proto_test_case(data, intersection_test_fct)
+
 
 # TODO test if relation is really bidirectional (y in find_visible(x,y) <=> x in find_visible(y,x))
 
@@ -0,0 +1,62 @@
+import unittest
+from math import sqrt
+
+import pytest
+
+from extremitypathfinder.hierarchical import HierarchicalEnvironment
+
+# two rooms connected by a door (x=10, 4 <= y <= 6). the left room contains an obstacle
+LEFT_ROOM = ([(0, 0), (10, 0), (10, 4), (10, 6), (10, 10), (0, 10)], [[(4, 2), (4, 8), (6, 8), (6, 2)]])
+RIGHT_ROOM = ([(10, 0), (20, 0), (20, 10), (10, 10), (10, 6), (10, 4)], [])
+DOOR = (10, 5)
+# a separate room without connection
+ISOLATED_ROOM = ([(30, 0), (40, 0), (40, 10), (30, 10)], [])
+
+
+def path_length(path):
+    return sum(sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2) for (x1, y1), (x2, y2) in zip(path[:-1], path[1:]))
+
+
+class HierarchicalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.environment = HierarchicalEnvironment()
+        self.environment.add_region(*LEFT_ROOM, validate=True)
+        self.environment.add_region(*RIGHT_ROOM, validate=True)
+        self.environment.add_region(*ISOLATED_ROOM, validate=True)
+        portal_idx = self.environment.add_portal(DOOR)
+        assert self.environment.portal_regions[portal_idx] == [0, 1]
+        self.environment.prepare()
+
+    def test_find_shortest_path(self):
+        # ((start,goal), length)
+        test_data = [
+            # within a single region
+            (((1, 5), (3, 5)), 2.0),
+            (((11, 1), (19, 9)), sqrt(8 ** 2 + 8 ** 2)),
+            # through the portal
+            (((8, 5), (19, 5)), 11.0),
+            (((8, 1), (19, 9)), sqrt(2 ** 2 + 4 ** 2) + sqrt(9 ** 2 + 4 ** 2)),
+            # through the portal and around the obstacle
+            (((1, 5), (19, 5)), sqrt(3 ** 2 + 3 ** 2) + 2 + sqrt(4 ** 2 + 3 ** 2) + 9),
+        ]
+        for (start, goal), expected_length in test_data:
+            for start, goal in [(start, goal), (goal, start)]:
+                path, length = self.environment.find_shortest_path(start, goal)
+                assert length == pytest.approx(expected_length)
+                assert path[0] == start and path[-1] == goal
+                assert path_length(path) == pytest.approx(length)
+
+        path, _ = self.environment.find_shortest_path((8, 5), (19, 5))
+        assert tuple(path[1]) == DOOR
+
+    def test_special_cases(self):
+        assert self.environment.find_shortest_path((1, 1), (1, 1)) == ([(1, 1), (1, 1)], 0.0)
+        # no connection to the region
+        assert self.environment.find_shortest_path((1, 1), (35, 5)) == ([], None)
+        with pytest.raises(ValueError):
+            self.environment.find_shortest_path((1, 1), (25, 5))
+        with pytest.raises(ValueError):
+            self.environment.add_portal((25, 5))
+        with pytest.raises(ValueError):
+            self.environment.prepare()
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import unittest
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# must not be imported unless being used
+HEAVY_MODULES = ['matplotlib', 'scipy', 'multiprocessing', 'http.server', 'extremitypathfinder.plotting',
+                 'extremitypathfinder.csgraph', 'extremitypathfinder.triangulation', 'extremitypathfinder.oracle']
+
+
+def imported_modules(code):
+    """ :return: the heavy modules being imported after running the code in a fresh interpreter """
+    check = code + '\nimport sys\nprint(",".join(m for m in {!r} if m in sys.modules))'.format(HEAVY_MODULES)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([PACKAGE_DIRECTORY, os.environ.get('PYTHONPATH', '')]))
+    output = subprocess.check_output([sys.executable, '-c', check], env=environment, cwd=PACKAGE_DIRECTORY)
+    return set(filter(None, output.decode().strip().split(',')))
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_minimal_import(self):
+        assert imported_modules('import extremitypathfinder') == set()
+        # also not when using the environment without the optional features
+        code = '''
+from extremitypathfinder import PolygonEnvironment
+environment = PolygonEnvironment()
+environment.store([(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)], [[(4.0, 4.0), (4.0, 6.0), (6.0, 6.0)]])
+environment.prepare()
+environment.find_shortest_path((1.0, 1.0), (9.0, 9.0))
+'''
+        assert imported_modules(code) == set()
+
+    def test_lazy_submodules(self):
+        assert imported_modules('import extremitypathfinder\nextremitypathfinder.loaders') == set()
+        modules = imported_modules('import extremitypathfinder\nextremitypathfinder.triangulation')
+        assert modules == {'extremitypathfinder.triangulation'}
+
+        import extremitypathfinder
+        from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+        assert extremitypathfinder.PolygonEnvironment is PolygonEnvironment
+        assert 'plotting' in dir(extremitypathfinder)
+        with self.assertRaises(AttributeError):
+            extremitypathfinder.unknown_attribute
@@ -0,0 +1,55 @@
+import unittest
+
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from test_main import POLY_ENV_PARAMS
+from test_triangulation import random_points, store_functions
+
+NR_LANDMARKS = 8
+NR_RANDOM_QUERIES = 20
+
+
+class LandmarksTest(unittest.TestCase):
+
+    def test_landmark_distances(self):
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare(landmarks=NR_LANDMARKS)
+        graph = environment.graph
+        nr_nodes = len(graph.all_nodes)
+        # at most one landmark per node
+        assert len(graph.landmarks) == min(NR_LANDMARKS, nr_nodes)
+        assert len(set(graph.landmarks)) == len(graph.landmarks)
+        assert graph.landmark_distances.shape == (len(graph.landmarks), nr_nodes)
+        for landmark, distances in zip(graph.landmarks, graph.landmark_distances):
+            assert distances[graph.node_indices[landmark]] == 0.0
+            for node, distance in graph.dijkstra(landmark).items():
+                assert distances[graph.node_indices[node]] == pytest.approx(distance)
+
+        with pytest.raises(ValueError):
+            environment = PolygonEnvironment()
+            environment.store(*POLY_ENV_PARAMS)
+            environment.prepare(lazy=True, landmarks=NR_LANDMARKS)
+
+    def test_queries(self):
+        # the results have to be identical to the default heuristic
+        nr_expanded = nr_expanded_landmarks = 0
+        for store_fct in store_functions():
+            environment = PolygonEnvironment()
+            store_fct(environment)
+            environment.prepare()
+            landmark_environment = PolygonEnvironment()
+            store_fct(landmark_environment)
+            landmark_environment.prepare(landmarks=NR_LANDMARKS)
+            points = random_points(environment, 2 * NR_RANDOM_QUERIES)
+            for start, goal in zip(points[::2], points[1::2]):
+                _, length, statistics = environment.find_shortest_path(start, goal, return_statistics=True)
+                path, length2, statistics2 = landmark_environment.find_shortest_path(start, goal,
+                                                                                     return_statistics=True)
+                assert length2 == pytest.approx(length)
+                assert path[0] == start and path[-1] == goal
+                nr_expanded += statistics.nodes_expanded
+                nr_expanded_landmarks += statistics2.nodes_expanded
+        # the heuristic is at least as tight as the euclidean distance
+        assert nr_expanded_landmarks <= nr_expanded
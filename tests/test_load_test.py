@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import load_test
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from test_main import POLY_ENV_PARAMS
+
+QUERIES = [((1, 1), (8, 8)), ((9, 4), (9, 6)), ((1, 1), (1, 1)), ((0.5, 9.5), (9.5, 0.5))]
+
+
+class LoadTestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.environment_path = os.path.join(self.directory, 'env.pickle')
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        environment.export_pickle(self.environment_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_warmup(self):
+        # the warmup queries must run in every process serving the queries (after loading the environment)
+        for concurrency in [1, 2]:
+            for nr_warmup_queries in [0, 2]:
+                report = load_test.run_load_test(self.environment_path, QUERIES * 2, concurrency, chunk_size=2,
+                                                 warmup_queries=QUERIES[:nr_warmup_queries])
+                assert report['nr_queries'] == len(QUERIES) * 2
+                assert report['warmup_queries'] == nr_warmup_queries
+
+
+if __name__ == '__main__':
+    unittest.main()
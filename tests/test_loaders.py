@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.loaders import from_geojson, from_wkb, iter_queries
+from test_main import POLY_ENV_PARAMS
+
+
+def closed_ring(coords, reverse=False):
+    coords = [list(c) for c in coords]
+    if reverse:
+        coords = coords[::-1]
+    return coords + [coords[0]]
+
+
+def polygon_wkb(rings, byte_order='<', geometry_type=3, srid=None):
+    """ :param rings: the rings with coordinates of any dimension """
+    data = struct.pack('B', int(byte_order == '<')) + struct.pack(byte_order + 'I', geometry_type)
+    if srid is not None:
+        data += struct.pack(byte_order + 'I', srid)
+    data += struct.pack(byte_order + 'I', len(rings))
+    for ring in rings:
+        data += struct.pack(byte_order + 'I', len(ring))
+        for coords in ring:
+            data += struct.pack(byte_order + '{}d'.format(len(coords)), *coords)
+    return data
+
+
+def assert_same_ring(coords, expected_coords):
+    """ the numbering may start at another vertex """
+    expected_coords = np.array(expected_coords, dtype=float)
+    start = np.flatnonzero(np.all(coords == expected_coords[0], axis=1))[0]
+    np.testing.assert_array_equal(np.roll(coords, -start, axis=0), expected_coords)
+
+
+class LoadersTest(unittest.TestCase):
+
+    def check_map(self, loaded_map):
+        boundary, holes = POLY_ENV_PARAMS
+        boundary_coordinates, list_of_hole_coordinates = loaded_map
+        assert_same_ring(boundary_coordinates, boundary)
+        assert len(list_of_hole_coordinates) == len(holes)
+        for hole_coordinates, hole in zip(list_of_hole_coordinates, holes):
+            assert_same_ring(hole_coordinates, hole)
+
+        environment = PolygonEnvironment()
+        environment.store(*loaded_map, validate=True)
+        environment.prepare()
+        reference = PolygonEnvironment()
+        reference.store(*POLY_ENV_PARAMS)
+        reference.prepare()
+        assert environment.find_shortest_path((1, 1), (8, 8)) == reference.find_shortest_path((1, 1), (8, 8))
+
+    def test_geojson(self):
+        boundary, holes = POLY_ENV_PARAMS
+        # closed rings in the wrong orientation (GeoJSON: exterior ring counter clockwise)
+        for reverse in [False, True]:
+            rings = [closed_ring(boundary, reverse)] + [closed_ring(hole, not reverse) for hole in holes]
+            geometry = {'type': 'Polygon', 'coordinates': rings}
+            feature = {'type': 'Feature', 'properties': {}, 'geometry': geometry}
+            collection = {'type': 'FeatureCollection', 'features': [feature]}
+            for geojson in [geometry, feature, collection, json.dumps(collection)]:
+                self.check_map(from_geojson(geojson))
+
+        # consequent duplicate vertices
+        rings = [[boundary[0]] + closed_ring(boundary)] + [closed_ring(hole) for hole in holes]
+        geometry = {'type': 'Polygon', 'coordinates': rings}
+        self.check_map(from_geojson(geometry))
+
+        for invalid in [{'type': 'Point', 'coordinates': [0, 0]},
+                        {'type': 'FeatureCollection', 'features': []},
+                        {'type': 'Polygon', 'coordinates': [[[0, 0], [1, 1], [0, 0]]]},
+                        {'type': 'Polygon', 'coordinates': []}]:
+            with pytest.raises(ValueError):
+                from_geojson(invalid)
+
+    def test_wkb(self):
+        boundary, holes = POLY_ENV_PARAMS
+        rings = [closed_ring(boundary, reverse=True)] + [closed_ring(hole) for hole in holes]
+        for byte_order in ['<', '>']:
+            wkb = polygon_wkb(rings, byte_order)
+            self.check_map(from_wkb(wkb))
+            self.check_map(from_wkb(wkb.hex()))
+            # z coordinates (ISO and extended WKB with SRID)
+            rings_z = [[c + [1.0] for c in ring] for ring in rings]
+            self.check_map(from_wkb(polygon_wkb(rings_z, byte_order, 1003)))
+            self.check_map(from_wkb(polygon_wkb(rings_z, byte_order, 0x80000000 | 0x20000000 | 3, srid=4326)))
+
+        with pytest.raises(ValueError):
+            # point
+            from_wkb(struct.pack('<BI2d', 1, 1, 0.0, 0.0))
+
+    def test_iter_queries(self):
+        queries = [((1.0, 1.0), (8.0, 8.0)), ((9.0, 4.0), (9.0, 6.0))]
+        directory = tempfile.mkdtemp()
+        try:
+            def write(file_name, lines):
+                path = os.path.join(directory, file_name)
+                with open(path, 'w') as f:
+                    f.write('\n'.join(lines) + '\n')
+                return path
+
+            csv_lines = ['{},{},{},{}'.format(*start, *goal) for start, goal in queries]
+            ndjson_lines = [json.dumps({'start': start, 'goal': goal}) for start, goal in queries]
+            header = 'start_x,start_y,goal_x,goal_y'
+            for path in [write('queries.csv', csv_lines), write('header.csv', [header] + csv_lines),
+                         write('queries.ndjson', ndjson_lines)]:
+                assert list(iter_queries(path)) == queries
+
+            # malformed data rows must not be skipped silently
+            path = write('broken.csv', [header, csv_lines[0], '1,x,8,8', csv_lines[1]])
+            with pytest.raises(ValueError, match='line 3'):
+                list(iter_queries(path))
+            with pytest.raises(ValueError, match='line 2'):
+                list(iter_queries(write('broken.csv', csv_lines[:1] + ['1,1,8'])))
+        finally:
+            shutil.rmtree(directory)
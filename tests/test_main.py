@@ -1,9 +1,11 @@
 import unittest
 from math import sqrt
 
+import numpy as np
 import pytest
 
 from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.map_generation import maze_grid_world
 from extremitypathfinder.plotting import PlottingEnvironment
 
 # TODO
@@ -271,6 +273,186 @@ class MainTest(unittest.TestCase):
         # test if property 1 is being properly exploited
         # (extremities lying in front of each other need not be connected)
 
+    def test_lazy(self):
+        grid_env = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+        grid_env.store_grid_world(*GRID_ENV_PARAMS, simplify=False, validate=False)
+        grid_env.prepare(lazy=True)
+        assert len(grid_env.graph.all_nodes) == 16, 'identical nodes should get joined in the graph!'
+        assert len(grid_env.graph.distances) == 0, 'no edges should be computed in advance'
+        try_test_cases(grid_env, TEST_DATA_GRID_ENV)
+        # the computed edges are being kept for later queries
+        assert len(grid_env.graph.distances) > 0
+        assert len(grid_env.graph.unexpanded) < len(grid_env.graph.all_nodes)
+        assert len(grid_env.graph.all_nodes) == 16, 'the graph should not contain the query vertices!'
+
+        poly_env = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+        poly_env.store(*POLY_ENV_PARAMS, validate=True)
+        poly_env.prepare(lazy=True)
+        try_test_cases(poly_env, TEST_DATA_POLY_ENV)
+
+        # no lazy graph data must be kept after storing a new map
+        grid_env.store(*POLY_ENV_PARAMS)
+        assert grid_env.identical_extremities is None
+        grid_env.prepare()
+        assert grid_env.identical_extremities is None
+        assert grid_env.memory_report()['identical_extremities'] == 0
+        try_test_cases(grid_env, TEST_DATA_POLY_ENV)
+
+    def test_bidirectional(self):
+        # the results have to be identical to the unidirectional search
+        for store_fct, test_data in [
+            (lambda env: env.store_grid_world(*GRID_ENV_PARAMS, simplify=False), TEST_DATA_GRID_ENV),
+            (lambda env: env.store(*POLY_ENV_PARAMS), TEST_DATA_POLY_ENV),
+            # long winding paths
+            (lambda env: env.store_grid_world(*maze_grid_world(5, 5), simplify=False),
+             [(((0.5, 0.5), (8.5, 8.5)), None), (((8.5, 0.5), (0.5, 8.5)), None)]),
+        ]:
+            for lazy in [False, True]:
+                environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+                store_fct(environment)
+                environment.prepare(lazy=lazy)
+                for (start, goal), _ in test_data:
+                    for start, goal in [(start, goal), (goal, start)]:
+                        _, length = environment.find_shortest_path(start, goal)
+                        path, length2 = environment.find_shortest_path(start, goal, bidirectional=True)
+                        assert length2 == pytest.approx(length)
+                        assert path[0] == start and path[-1] == goal
+                        path_length = sum(sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+                                          for (x1, y1), (x2, y2) in zip(path[:-1], path[1:]))
+                        assert path_length == pytest.approx(length2)
+
+    def test_max_distance(self):
+        # shortest_distance() and the distance bound have to agree with the unbounded search
+        environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+        environment.store_grid_world(*maze_grid_world(5, 5), simplify=False)
+        environment.prepare()
+        for start, goal in [((0.5, 0.5), (8.5, 8.5)), ((8.5, 0.5), (0.5, 8.5)), ((0.5, 0.5), (2.5, 0.5))]:
+            _, length = environment.find_shortest_path(start, goal)
+            for bidirectional in [False, True]:
+                assert environment.shortest_distance(start, goal, bidirectional=bidirectional) == pytest.approx(length)
+                path, length2 = environment.find_shortest_path(start, goal, bidirectional=bidirectional,
+                                                               max_distance=length + 1e-6)
+                assert length2 == pytest.approx(length)
+                assert path[0] == start and path[-1] == goal
+                assert environment.find_shortest_path(start, goal, bidirectional=bidirectional,
+                                                      max_distance=0.99 * length) == ([], None)
+                assert environment.shortest_distance(start, goal, bidirectional=bidirectional,
+                                                     max_distance=0.99 * length) is None
+
+        # terminating early expands fewer nodes
+        start, goal = (0.5, 0.5), (8.5, 8.5)
+        _, statistics = environment.shortest_distance(start, goal, return_statistics=True)
+        _, statistics_bounded = environment.shortest_distance(start, goal, max_distance=20.0, return_statistics=True)
+        assert statistics_bounded.nodes_expanded < statistics.nodes_expanded
+
+    def test_reachable_within(self):
+        # the lengths have to be identical to the ones of the single queries
+        max_distance = 6.0
+        for store_fct in [lambda env: env.store_grid_world(*GRID_ENV_PARAMS, simplify=False),
+                          lambda env: env.store_grid_world(*maze_grid_world(5, 5), simplify=False)]:
+            for prepare_kwargs in [{}, {'lazy': True}, {'triangulate': True}]:
+                environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+                store_fct(environment)
+                environment.prepare(**prepare_kwargs)
+                origin = (0.5, 0.5)
+                reachable = environment.reachable_within(origin, max_distance)
+                assert len(reachable) > 0
+                for coordinates, length in reachable.items():
+                    assert length <= max_distance
+                    assert environment.shortest_distance(origin, coordinates, verify=False) == pytest.approx(length)
+
+                points = [(x + 0.5, y + 0.5) for x in range(10) for y in range(10)]
+                lengths = environment.reachable_points_within(origin, max_distance, points)
+                for point, length in zip(points, lengths):
+                    if not environment.within_map(point):
+                        assert length == np.inf
+                        continue
+                    expected = environment.shortest_distance(origin, point, max_distance=max_distance)
+                    if expected is None:
+                        assert length == np.inf
+                    else:
+                        assert length == pytest.approx(expected)
+
+    def test_find_nearest(self):
+        # the nearest target has to be the one with the shortest of all single query paths
+        for store_fct in [lambda env: env.store_grid_world(*GRID_ENV_PARAMS, simplify=False),
+                          lambda env: env.store_grid_world(*maze_grid_world(5, 5), simplify=False)]:
+            for prepare_kwargs in [{}, {'lazy': True}, {'triangulate': True}]:
+                environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+                store_fct(environment)
+                environment.prepare(**prepare_kwargs)
+                start = (0.5, 0.5)
+                targets = [(x + 0.5, y + 0.5) for x in range(2, 10, 3) for y in range(1, 10, 2)]
+                targets = [t for t in targets if environment.within_map(t)]
+                index, path, length = environment.find_nearest(start, targets)
+                lengths = [environment.find_shortest_path(start, t)[1] for t in targets]
+                assert length == pytest.approx(min(lengths))
+                assert lengths[index] == pytest.approx(length)
+                assert path[0] == start and path[-1] == targets[index]
+
+                assert environment.find_nearest(start, targets + [start])[2] == 0.0
+                # the start given as list
+                assert environment.find_nearest(list(start), targets + [start]) == (len(targets), [start, start], 0.0)
+                assert environment.find_nearest(start, []) == (None, [], None)
+
+    def test_iter_shortest_paths(self):
+        # the results have to be identical to the single queries (in the same order)
+        for prepare_kwargs in [{}, {'triangulate': True}]:
+            environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+            environment.store_grid_world(*GRID_ENV_PARAMS, simplify=False)
+            environment.prepare(**prepare_kwargs)
+            queries = [query for query, _ in TEST_DATA_GRID_ENV]
+            # repeated start points
+            queries += [((0.5, 6.0), goal) for _, goal in queries]
+            results = list(environment.iter_shortest_paths(iter(queries), chunk_size=7))
+            assert len(results) == len(queries)
+            for (start, goal), (path, length) in zip(queries, results):
+                path2, length2 = environment.find_shortest_path(start, goal)
+                assert path == path2
+                assert length == pytest.approx(length2)
+
+        def endless_queries():
+            while True:
+                yield (0.5, 6.0), (18.5, 0.5)
+
+        # the queries are being consumed lazily
+        results = environment.iter_shortest_paths(endless_queries(), chunk_size=3)
+        for _ in range(5):
+            assert next(results)[1] == pytest.approx(23.18783787537749)
+
+        for query in INVALID_DESTINATION_DATA:
+            # the first invalid query is being reported (also in later chunks)
+            for chunk_size in [1, 2, 7]:
+                with pytest.raises(ValueError, match='query 2'):
+                    list(environment.iter_shortest_paths([((0.5, 6.0), (18.5, 0.5))] * 2 + [query] * 2,
+                                                         chunk_size=chunk_size))
+
+    def test_statistics(self):
+        environment = ENVIRONMENT_CLASS(**CONSTRUCTION_KWARGS)
+        environment.store(*POLY_ENV_PARAMS, validate=True)
+        statistics = environment.prepare(return_statistics=True)
+        assert statistics.edges_checked > 0
+        assert statistics.timings['total'] >= statistics.timings['visibility'] > 0.0
+
+        path, length, statistics = environment.find_shortest_path((9, 4), (9, 6), return_statistics=True)
+        assert (path, length) == environment.find_shortest_path((9, 4), (9, 6))
+        assert statistics.nodes_expanded > 0
+        assert statistics.heap_pushes >= statistics.nodes_expanded
+        for phase in ['goal_visibility', 'graph_copy', 'start_visibility', 'edge_filtering', 'search']:
+            assert phase in statistics.timings
+
+        reported = []
+        environment.statistics_callback = lambda method_name, stats: reported.append((method_name, stats.as_dict()))
+        environment.find_shortest_path((9, 4), (9, 6))
+        assert len(reported) == 1 and reported[0][0] == 'find_shortest_path'
+        assert reported[0][1]['nodes_expanded'] == statistics.nodes_expanded
+
+        # the streamed queries are being reported individually
+        reported.clear()
+        list(environment.iter_shortest_paths([((9, 4), (9, 6))] * 2))
+        assert [method_name for method_name, _ in reported] == ['iter_shortest_paths'] * 2
+        assert all(stats['nodes_expanded'] == statistics.nodes_expanded for _, stats in reported)
+
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(MainTest)
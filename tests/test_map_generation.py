@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.helper_fcts import check_data_requirements, convert_gridworld
+from extremitypathfinder.map_generation import (
+    count_vertices, maze_grid_world, random_grid_world, random_polygon_environment, warehouse_environment,
+)
+
+POLYGON_GENERATORS = [
+    random_polygon_environment,
+    lambda nr_vertices, seed: random_polygon_environment(nr_vertices, seed, concave=False, vertices_per_hole=5),
+    warehouse_environment,
+]
+
+
+class MapGenerationTest(unittest.TestCase):
+
+    def test_polygon_environments(self):
+        for generator in POLYGON_GENERATORS:
+            for nr_vertices in [10, 100, 1000]:
+                boundary, holes = generator(nr_vertices, 1)
+                # requirements: orientation, no intersections...
+                check_data_requirements(boundary, holes)
+                assert count_vertices(boundary, holes) == pytest.approx(nr_vertices, rel=0.2, abs=5)
+
+    def test_seeded(self):
+        for generator in POLYGON_GENERATORS:
+            boundary1, holes1 = generator(100, 7)
+            boundary2, holes2 = generator(100, 7)
+            assert np.array_equal(boundary1, boundary2)
+            assert all(np.array_equal(h1, h2) for h1, h2 in zip(holes1, holes2))
+            _, holes3 = generator(100, 8)
+            assert not all(np.array_equal(h1, h3) for h1, h3 in zip(holes1, holes3))
+
+        assert random_grid_world(10, 10, seed=3) == random_grid_world(10, 10, seed=3)
+        assert maze_grid_world(5, 5, seed=3) == maze_grid_world(5, 5, seed=3)
+
+    def test_grid_worlds(self):
+        for seed in range(5):
+            for grid_world in [random_grid_world(15, 10, obstacle_density=0.3, seed=seed),
+                               maze_grid_world(6, 4, seed=seed)]:
+                boundary, holes = convert_gridworld(*grid_world, simplify=False)
+                check_data_requirements(np.array(boundary), holes)
+
+    def test_path_finding(self):
+        boundary, holes = random_polygon_environment(60, seed=2)
+        environment = PolygonEnvironment()
+        environment.store(boundary, holes, validate=True)
+        environment.prepare()
+        size_x, size_y = boundary.max(axis=0)
+        path, length = environment.find_shortest_path((0.5, 0.5), (size_x - 0.5, size_y - 0.5))
+        assert length >= np.linalg.norm((size_x - 1.0, size_y - 1.0))
+
+        # in a perfect maze all cells are reachable
+        environment.store_grid_world(*maze_grid_world(4, 4, seed=2), simplify=False, validate=True)
+        environment.prepare()
+        path, length = environment.find_shortest_path((0.5, 0.5), (6.5, 6.5))
+        assert len(path) > 2
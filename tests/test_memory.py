@@ -0,0 +1,80 @@
+import gc
+import tracemalloc
+import unittest
+
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.map_generation import random_polygon_environment
+from test_main import POLY_ENV_PARAMS
+
+PARTS = ['polygon_coordinates', 'vertices', 'angle_representations', 'edges', 'polygons', 'graph_neighbours',
+         'graph_distances', 'graph_other', 'triangulation', 'oracle', 'identical_extremities']
+
+
+class MemoryTest(unittest.TestCase):
+
+    def test_parts(self):
+        environment = PolygonEnvironment()
+        report = environment.memory_report()
+        assert report['total'] == 0 and report['nr_vertices'] == 0 and report['bytes_per_vertex'] == 0.0
+
+        environment.store(*POLY_ENV_PARAMS)
+        report = environment.memory_report()
+        nr_vertices = len(list(environment.all_vertices))
+        assert report['nr_vertices'] == nr_vertices
+        assert report['polygon_coordinates'] > 0 and report['vertices'] > 0 and report['edges'] > 0
+        assert report['graph_distances'] == report['temp_graph'] == report['nr_graph_edges'] == 0
+        assert report['total'] == sum(report[part] for part in PARTS)
+
+        environment.prepare(triangulate=True)
+        report = environment.memory_report()
+        assert report['nr_graph_edges'] == len(environment.graph.distances)
+        for part in ['angle_representations', 'graph_neighbours', 'graph_distances', 'graph_other', 'triangulation',
+                     'temp_graph']:
+            assert report[part] > 0
+        assert report['oracle'] == 0
+        assert report['total'] == sum(report[part] for part in PARTS)
+        assert report['bytes_per_graph_edge'] == pytest.approx(
+            (report['graph_neighbours'] + report['graph_distances']) / report['nr_graph_edges'])
+
+        environment.build_distance_oracle(nr_processes=1)
+        assert environment.memory_report()['oracle'] > 0
+
+        # the retained graph copy of a query (additionally containing the start and goal edges)
+        temp_graph_size = report['temp_graph']
+        environment.find_shortest_path((1, 1), (8, 8), free_space_after=False)
+        assert environment.memory_report()['temp_graph'] >= temp_graph_size
+
+    def test_store_again(self):
+        # no data of a previously stored map must be kept (and measured)
+        environment = PolygonEnvironment()
+        environment.store(*random_polygon_environment(50, seed=0))
+        environment.prepare(lazy=True)
+        assert environment.memory_report()['identical_extremities'] > 0
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        reference = PolygonEnvironment()
+        reference.store(*POLY_ENV_PARAMS)
+        reference.prepare()
+        report, reference_report = environment.memory_report(), reference.memory_report()
+        assert report['identical_extremities'] == 0
+        assert report['total'] == pytest.approx(reference_report['total'], rel=0.1)
+
+    def test_estimate(self):
+        # the estimate has to match the actually allocated memory roughly
+        boundary_coordinates, list_of_hole_coordinates = random_polygon_environment(200, seed=0)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            environment = PolygonEnvironment()
+            environment.store(boundary_coordinates, list_of_hole_coordinates)
+            environment.prepare()
+            environment.find_shortest_path(tuple(boundary_coordinates[0] * 0.9), tuple(boundary_coordinates[2] * 0.9),
+                                           verify=False)
+            gc.collect()
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        total = environment.memory_report()['total']
+        assert 0.5 * allocated < total < 1.5 * allocated
@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.oracle import NO_NEXT_HOP
+from test_main import POLY_ENV_PARAMS, TEST_DATA_POLY_ENV
+from test_triangulation import random_points, store_functions
+
+NR_RANDOM_QUERIES = 20
+
+
+class OracleTest(unittest.TestCase):
+
+    def test_tables(self):
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        environment.build_distance_oracle(nr_processes=1)
+        oracle = environment.oracle
+        graph = environment.graph
+        nr_nodes = len(graph.all_nodes)
+        assert oracle.distances.shape == oracle.next_hops.shape == (nr_nodes, nr_nodes)
+        assert oracle.distances.dtype == np.float32 and oracle.next_hops.dtype == np.int32
+        assert np.all(np.diag(oracle.distances) == 0.0)
+        assert np.all(np.diag(oracle.next_hops) == NO_NEXT_HOP)
+        for node1 in graph.all_nodes:
+            distances = graph.dijkstra(node1)
+            for node2 in graph.all_nodes:
+                path = oracle.get_path(node1, node2)
+                if node2 not in distances:
+                    assert path == []
+                    assert np.isinf(oracle.distances[oracle.node_indices[node1], oracle.node_indices[node2]])
+                    continue
+                assert path[0] == node1 and path[-1] == node2
+                length = sum(graph.get_distance(n1, n2) for n1, n2 in zip(path[:-1], path[1:]))
+                assert length == pytest.approx(distances[node2])
+                assert oracle.distances[oracle.node_indices[node1], oracle.node_indices[node2]] == \
+                    pytest.approx(distances[node2])
+
+        with pytest.raises(ValueError):
+            environment = PolygonEnvironment()
+            environment.store(*POLY_ENV_PARAMS)
+            environment.prepare(lazy=True)
+            environment.build_distance_oracle()
+
+    def test_queries(self):
+        # the results have to be identical to the graph search
+        for i, store_fct in enumerate(store_functions()):
+            environment = PolygonEnvironment()
+            store_fct(environment)
+            environment.prepare()
+            oracle_environment = PolygonEnvironment()
+            store_fct(oracle_environment)
+            oracle_environment.prepare()
+            # also in parallel
+            oracle_environment.build_distance_oracle(nr_processes=1 + i % 2)
+            points = random_points(environment, 2 * NR_RANDOM_QUERIES)
+            for start, goal in zip(points[::2], points[1::2]):
+                _, length = environment.find_shortest_path(start, goal)
+                path, length2 = oracle_environment.find_shortest_path(start, goal)
+                assert length2 == pytest.approx(length)
+                assert path[0] == start and path[-1] == goal
+
+        # also the degenerate cases (query points on polygon edges and vertices)
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        oracle_environment = PolygonEnvironment()
+        oracle_environment.store(*POLY_ENV_PARAMS)
+        oracle_environment.prepare()
+        oracle_environment.build_distance_oracle(nr_processes=1)
+        for (start, goal), _ in TEST_DATA_POLY_ENV:
+            for start, goal in [(start, goal), (goal, start)]:
+                _, length = environment.find_shortest_path(start, goal)
+                _, length2 = oracle_environment.find_shortest_path(start, goal)
+                assert length2 == pytest.approx(length)
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import matplotlib
+import numpy as np
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from extremitypathfinder import plotting  # noqa: E402
+from extremitypathfinder.plotting import PlottingEnvironment, decimate, get_graph_segments  # noqa: E402
+from test_main import POLY_ENV_PARAMS  # noqa: E402
+
+
+class PlottingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        plt.close('all')
+
+    def test_plots(self):
+        environment = PlottingEnvironment(plotting_dir=self.directory)
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        path, length = environment.find_shortest_path((1, 1), (8, 8))
+        assert len(path) > 2
+        plot_names = {file_name.rsplit('_', 1)[0] for file_name in os.listdir(self.directory)}
+        assert plot_names == {'map_plot', 'prepared_map_plot', 'graph_plot', 'graph_path_plot', 'path_plot'}
+
+    def test_collections(self):
+        environment = PlottingEnvironment(plotting_dir=self.directory)
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare()
+        graph = environment.graph
+        segments = get_graph_segments(graph)
+        # every undirected edge once
+        assert len(segments) == len(graph.distances) // 2
+        assert {tuple(sorted(map(tuple, s.tolist()))) for s in segments} == \
+            {tuple(sorted((tuple(n1.coordinates), tuple(n2.coordinates)))) for n1, n2 in graph.distances.keys()}
+
+        # the whole graph is a single artist
+        fig, ax = plt.subplots()
+        plotting.draw_internal_graph(environment, ax)
+        assert len(ax.collections) == 1 and len(ax.lines) == 0
+        assert len(ax.collections[0].get_segments()) == len(segments)
+
+        # decimation
+        segments = np.arange(40.0).reshape(10, 2, 2)
+        assert decimate(segments, None) is segments
+        decimated = decimate(segments, 4)
+        assert len(decimated) == 4
+        np.testing.assert_array_equal(decimated[[0, -1]], segments[[0, -1]])
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.hierarchical import HierarchicalEnvironment
+from extremitypathfinder.tiled import TiledEnvironment, load_tiled_environment
+from test_hierarchical import DOOR, ISOLATED_ROOM, LEFT_ROOM, RIGHT_ROOM, path_length
+
+QUERIES = [((1, 5), (3, 5)), ((8, 1), (19, 9)), ((1, 5), (19, 5)), ((19, 5), (1, 5)), ((1, 1), (35, 5))]
+
+
+def add_tiles(environment, **prepare_kwargs):
+    for boundary, holes in [LEFT_ROOM, RIGHT_ROOM, ISOLATED_ROOM]:
+        tile = PolygonEnvironment()
+        tile.store(boundary, holes, validate=True)
+        environment.add_environment(tile, **prepare_kwargs)
+    environment.add_portal(DOOR)
+    environment.prepare()
+
+
+class TiledTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tile_dir = tempfile.mkdtemp()
+        self.hierarchical_environment = HierarchicalEnvironment()
+        add_tiles(self.hierarchical_environment)
+
+    def tearDown(self):
+        shutil.rmtree(self.tile_dir)
+
+    def check_queries(self, environment):
+        for start, goal in QUERIES:
+            path, length = environment.find_shortest_path(start, goal)
+            expected_path, expected_length = self.hierarchical_environment.find_shortest_path(start, goal)
+            if expected_length is None:
+                assert (path, length) == ([], None)
+                continue
+            assert length == pytest.approx(expected_length)
+            assert path[0] == start and path[-1] == goal
+            assert path_length(path) == pytest.approx(length)
+
+    def test_find_shortest_path(self):
+        environment = TiledEnvironment(self.tile_dir)
+        add_tiles(environment)
+        self.check_queries(environment)
+        assert len(environment.resident_tiles) == 3
+
+    def test_memory_budget(self):
+        # only a single tile fits into the budget
+        environment = TiledEnvironment(self.tile_dir, memory_budget=max_tile_size(self.tile_dir))
+        add_tiles(environment)
+        self.check_queries(environment)
+        assert len(environment.resident_tiles) == 1
+        assert environment.resident_size <= environment.memory_budget
+        nr_tile_loads = environment.nr_tile_loads
+        # resident tiles do not have to be loaded again
+        environment.find_shortest_path((11, 1), (19, 9))
+        environment.find_shortest_path((12, 1), (19, 8))
+        assert environment.nr_tile_loads <= nr_tile_loads + 1
+
+    def test_prepare_kwargs(self):
+        # the tiles are being prepared with the given arguments
+        environment = TiledEnvironment(self.tile_dir)
+        add_tiles(environment, triangulate=True)
+        assert all(environment.get_region(i).triangulation is not None for i in range(environment.nr_regions))
+        self.check_queries(environment)
+
+    def test_load(self):
+        add_tiles(TiledEnvironment(self.tile_dir))
+        environment = load_tiled_environment(self.tile_dir, memory_budget=0)
+        assert environment.prepared
+        assert environment.nr_tile_loads == 0
+        self.check_queries(environment)
+        # the tile being used last is always kept
+        assert len(environment.resident_tiles) == 1
+
+
+def max_tile_size(tile_dir):
+    environment = TiledEnvironment(tile_dir)
+    add_tiles(environment)
+    return max(environment.tile_sizes)
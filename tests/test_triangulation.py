@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from extremitypathfinder.extremitypathfinder import PolygonEnvironment
+from extremitypathfinder.map_generation import (
+    maze_grid_world, random_grid_world, random_polygon_environment, warehouse_environment,
+)
+from extremitypathfinder.triangulation import NO_NEIGHBOUR, Triangulation
+from test_main import GRID_ENV_PARAMS, POLY_ENV_PARAMS, TEST_DATA_GRID_ENV, TEST_DATA_POLY_ENV
+
+NR_RANDOM_QUERIES = 20
+
+
+def store_functions():
+    yield lambda env: env.store_grid_world(*GRID_ENV_PARAMS, simplify=False)
+    yield lambda env: env.store(*POLY_ENV_PARAMS)
+    for seed in range(3):
+        yield lambda env, seed=seed: env.store(*random_polygon_environment(80, seed))
+        yield lambda env, seed=seed: env.store(*warehouse_environment(80, seed))
+        yield lambda env, seed=seed: env.store_grid_world(*random_grid_world(10, 8, 0.3, seed), simplify=False)
+        yield lambda env, seed=seed: env.store_grid_world(*maze_grid_world(4, 4, seed), simplify=False)
+
+
+def prepare_environments(store_fct):
+    """ :return: the same environment prepared with and without triangulation """
+    environment = PolygonEnvironment()
+    store_fct(environment)
+    environment.prepare()
+    triangulated_environment = PolygonEnvironment()
+    store_fct(triangulated_environment)
+    triangulated_environment.prepare(triangulate=True)
+    return environment, triangulated_environment
+
+
+def random_points(environment, nr_points, seed=0):
+    rng = np.random.RandomState(seed)
+    coords = environment.boundary_polygon.coordinates
+    lower, upper = coords.min(axis=0), coords.max(axis=0)
+    points = []
+    while len(points) < nr_points:
+        point = tuple(rng.uniform(lower, upper).tolist())
+        if environment.within_map(point):
+            points.append(point)
+    return points
+
+
+class TriangulationTest(unittest.TestCase):
+
+    def test_triangulation(self):
+        for store_fct in store_functions():
+            environment = PolygonEnvironment()
+            store_fct(environment)
+            # is being validated at construction
+            triangulation = Triangulation(environment.boundary_polygon, environment.holes, {})
+            nr_vertices = len(list(environment.all_vertices))
+            nr_holes = len(environment.holes)
+            # (without collinear vertices) n + 2h - 2 triangles
+            assert len(triangulation.triangles) <= nr_vertices + 2 * nr_holes - 2
+            for t, (neighbours, neighbour_edges) in enumerate(zip(triangulation.neighbours,
+                                                                  triangulation.neighbour_edges)):
+                for t2, k2 in zip(neighbours, neighbour_edges):
+                    if t2 != NO_NEIGHBOUR:
+                        assert triangulation.neighbours[t2][k2] == t, 'the neighbourhood must be symmetric'
+
+    def test_locate(self):
+        environment = PolygonEnvironment()
+        environment.store(*POLY_ENV_PARAMS)
+        environment.prepare(triangulate=True)
+        triangulation = environment.triangulation
+        assert len(triangulation.locate((1.0, 1.5))) == 1
+        # degenerate cases: on a polygon edge, on a vertex, outside of the free space
+        for coordinates in [(1.0, 0.0), (9.5, 2.5), (3.0, 7.0), (10.0, 10.0), (4.0, 6.0), (-1.0, 5.0)]:
+            assert triangulation.locate(coordinates) is None
+
+    def test_queries(self):
+        # the results have to be identical to the default mode
+        for store_fct in store_functions():
+            environment, triangulated_environment = prepare_environments(store_fct)
+            points = random_points(environment, 2 * NR_RANDOM_QUERIES)
+            for start, goal in zip(points[::2], points[1::2]):
+                path, length = environment.find_shortest_path(start, goal)
+                path2, length2 = triangulated_environment.find_shortest_path(start, goal)
+                assert length2 == pytest.approx(length)
+                assert path2[0] == start and path2[-1] == goal
+
+        # also the degenerate cases (query points on polygon edges and vertices)
+        for store_fct, test_data in [(lambda env: env.store_grid_world(*GRID_ENV_PARAMS, simplify=False),
+                                      TEST_DATA_GRID_ENV),
+                                     (lambda env: env.store(*POLY_ENV_PARAMS), TEST_DATA_POLY_ENV)]:
+            environment, triangulated_environment = prepare_environments(store_fct)
+            for (start, goal), _ in test_data:
+                for start, goal in [(start, goal), (goal, start)]:
+                    _, length = environment.find_shortest_path(start, goal)
+                    _, length2 = triangulated_environment.find_shortest_path(start, goal)
+                    assert length2 == pytest.approx(length)
+
+    def test_statistics(self):
+        _, triangulated_environment = prepare_environments(lambda env: env.store(*POLY_ENV_PARAMS))
+        *_, statistics = triangulated_environment.find_shortest_path((1.0, 1.5), (8.0, 9.0), return_statistics=True)
+        assert statistics.triangles_expanded > 0
+        assert statistics.edges_checked == 0, 'the polygon edges should not be checked'